@@ -1,5 +1,21 @@
 const MCP_BASE_URL = import.meta.env.VITE_MCP_BASE_URL || "";
 
+// Scopes server-side prefetch work to this page; cancelled on pagehide.
+// randomUUID() only exists in secure contexts (not plain http on a LAN IP).
+function newSessionId() {
+  const c = globalThis.crypto;
+  if (c?.randomUUID) return c.randomUUID().replace(/-/g, "");
+  const bytes = new Uint8Array(16);
+  if (c?.getRandomValues) {
+    c.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i++) bytes[i] = Math.floor(Math.random() * 256);
+  }
+  return Array.from(bytes, (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+const SESSION_ID = newSessionId();
+
 // ─── Individual Agent Endpoints (direct calls) ─────────────────────
 
 /**
@@ -57,6 +73,7 @@ export async function uploadBookPDF(file, title = "") {
 
   const res = await fetch(`${MCP_BASE_URL}/upload-book`, {
     method: "POST",
+    headers: { "X-Session-Id": SESSION_ID },
     body: formData,
   });
   if (!res.ok) throw new Error(`PDF upload error: ${res.status}`);
@@ -71,13 +88,27 @@ export async function uploadBookPDF(file, title = "") {
 export async function fetchLocationsFromTitle(title, author = "", year = "") {
   const res = await fetch(`${MCP_BASE_URL}/extract-from-title`, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: { "Content-Type": "application/json", "X-Session-Id": SESSION_ID },
     body: JSON.stringify({ title, author, year }),
   });
   if (!res.ok) throw new Error(`Title extraction error: ${res.status}`);
   return res.json();
 }
 
+/**
+ * Drop any archivist prefetch still queued for this page.
+ */
+export function cancelPrefetch() {
+  fetch(`${MCP_BASE_URL}/prefetch/${SESSION_ID}`, {
+    method: "DELETE",
+    keepalive: true,
+  }).catch(() => {});
+}
+
+if (typeof window !== "undefined") {
+  window.addEventListener("pagehide", cancelPrefetch);
+}
+
 // ─── Conductor Endpoint (orchestrated parallel call) ────────────────
 
 /**
@@ -117,3 +148,32 @@ export async function fetchChatAboutPlace(question, context = {}) {
   if (!res.ok) throw new Error(`Chat error: ${res.status}`);
   return res.json();
 }
+
+/**
+ * Server-side marker clusters for the current viewport.
+ * bbox = [west, south, east, north]
+ * Returns a GeoJSON FeatureCollection; cluster features carry
+ * { cluster, cluster_id, point_count, expansion_zoom, top_landmark }.
+ */
+export async function fetchClusters(zoom, bbox) {
+  const params = new URLSearchParams({
+    zoom: String(Math.floor(zoom)),
+    bbox: bbox.join(","),
+  });
+  const res = await fetch(`${MCP_BASE_URL}/clusters?${params}`);
+  if (!res.ok) throw new Error(`Clusters error: ${res.status}`);
+  return res.json();
+}
+
+/**
+ * Mapbox vector source for the full landmark catalog.
+ * Add a circle layer with `"source-layer": "landmarks"` — StylistAgent
+ * paint_overrides apply to it directly.
+ */
+export function landmarkVectorSource() {
+  return {
+    type: "vector",
+    tiles: [`${MCP_BASE_URL || window.location.origin}/tiles/{z}/{x}/{y}.mvt`],
+    maxzoom: 16,
+  };
+}
@@ -2,7 +2,8 @@
 ArchivistAgent — In-memory knowledge base.
 
 Mirrors the frontend GeoJSON.  Each entry contains the quote,
-historical context, and dialect note for a literary landmark.
+historical context, dialect note and [lng, lat] coordinates for a
+literary landmark.
 """
 
 KNOWLEDGE_BASE: dict[str, dict] = {
@@ -25,6 +26,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1949,
         "book": "The Joy Luck Club",
         "era": "1940s",
+        "coordinates": [-122.4194, 37.7749],
     },
     "jlc-chinatown": {
         "quote": "We are not those kind of people—we are better.",
@@ -42,6 +44,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1949,
         "book": "The Joy Luck Club",
         "era": "1940s",
+        "coordinates": [-122.4058, 37.7941],
     },
     "hr-harlem": {
         "quote": "I, too, sing America. I am the darker brother.",
@@ -60,6 +63,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1925,
         "book": "Harlem Renaissance Anthology",
         "era": "1920s",
+        "coordinates": [-73.9396, 40.8183],
     },
     "hr-apollo": {
         "quote": (
@@ -79,6 +83,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1934,
         "book": "Harlem Renaissance Anthology",
         "era": "1920s",
+        "coordinates": [-73.9499, 40.8100],
     },
     "hr-cathedral": {
         "quote": (
@@ -99,6 +104,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1925,
         "book": "Harlem Renaissance Anthology",
         "era": "1920s",
+        "coordinates": [-73.9619, 40.8038],
     },
     "cr-montgomery": {
         "quote": (
@@ -120,6 +126,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1955,
         "book": "Civil Rights Landmarks",
         "era": "1960s",
+        "coordinates": [-86.3094, 32.3776],
     },
     "cr-birmingham": {
         "quote": "Injustice anywhere is a threat to justice everywhere.",
@@ -137,6 +144,7 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1963,
         "book": "Civil Rights Landmarks",
         "era": "1960s",
+        "coordinates": [-86.8147, 33.5166],
     },
     "cr-lincoln-memorial": {
         "quote": (
@@ -158,5 +166,6 @@ KNOWLEDGE_BASE: dict[str, dict] = {
         "year": 1963,
         "book": "Civil Rights Landmarks",
         "era": "1960s",
+        "coordinates": [-77.0502, 38.8893],
     },
 }
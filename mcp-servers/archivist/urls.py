@@ -1,6 +1,7 @@
 from django.urls import path
-from archivist.views import lookup
+from archivist.views import lookup, lookup_enrichment
 
 urlpatterns = [
     path("lookup", lookup, name="archivist-lookup"),
+    path("lookup/enrichment", lookup_enrichment, name="archivist-lookup-enrichment"),
 ]
@@ -12,10 +12,12 @@ import json
 
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_http_methods
 
 from archivist.knowledge_base import KNOWLEDGE_BASE
-from core.dedalus_client import dedalus_chat
+from core.dedalus_client import cached_dedalus_chat, is_fallback
+from core.deferred import defer_field, parse_defer
+from core.http_cache import curated_response, data_version, enrichment_response
 
 
 ARCHIVIST_SYSTEM_PROMPT = (
@@ -25,28 +27,19 @@ ARCHIVIST_SYSTEM_PROMPT = (
     "museum visitor would find fascinating.  Be concise and vivid."
 )
 
+KNOWLEDGE_BASE_VERSION = data_version(KNOWLEDGE_BASE)
 
-def _archivist_lookup(landmark_id: str, feature_data: dict = None) -> dict:
+
+def _archivist_curated(landmark_id: str, feature_data: dict = None) -> dict:
     """
-    Internal function — callable by the Conductor for parallel orchestration.
-    Returns a plain dict (not an HttpResponse).
+    The deterministic part of a lookup — everything except ai_insight.
 
-    If the landmark_id is in the knowledge base, use the curated entry.
-    Otherwise, fall back to feature_data (from uploaded PDFs) and still
-    call Dedalus for an AI deep-dive.
+    Curated landmarks come from the knowledge base; anything else falls
+    back to feature_data (from uploaded PDFs).
     """
     entry = KNOWLEDGE_BASE.get(landmark_id)
 
     if entry is not None:
-        # Curated landmark — use knowledge base
-        user_msg = (
-            f"Book: {entry['book']} ({entry['era']})\n"
-            f"Quote: \"{entry['quote']}\"\n"
-            f"Base context: {entry['historical_context']}\n\n"
-            "Give me an enriched 2–3 sentence deep-dive insight."
-        )
-        ai_insight = dedalus_chat(ARCHIVIST_SYSTEM_PROMPT, user_msg)
-
         return {
             "landmark_id": landmark_id,
             "quote": entry["quote"],
@@ -54,45 +47,82 @@ def _archivist_lookup(landmark_id: str, feature_data: dict = None) -> dict:
             "dialect_note": entry.get("dialect_note"),
             "year": entry["year"],
             "book": entry["book"],
-            "ai_insight": ai_insight,
+            "era": entry["era"],
         }
 
     # Dynamic landmark — use feature_data from the uploaded PDF
     if feature_data is None:
         raise ValueError(f"Unknown landmark: {landmark_id}")
 
-    book = feature_data.get("book", "Unknown")
-    quote = feature_data.get("quote", "")
-    context = feature_data.get("historical_context", "")
-    year = feature_data.get("year", 2000)
-    era = feature_data.get("era", "2000s")
-
-    user_msg = (
-        f"Book: {book} ({era})\n"
-        f"Quote: \"{quote}\"\n"
-        f"Base context: {context}\n\n"
-        "Give me an enriched 2–3 sentence deep-dive insight."
-    )
-    ai_insight = dedalus_chat(ARCHIVIST_SYSTEM_PROMPT, user_msg)
-
     return {
         "landmark_id": landmark_id,
-        "quote": quote,
-        "historical_context": context,
+        "quote": feature_data.get("quote", ""),
+        "historical_context": feature_data.get("historical_context", ""),
         "dialect_note": None,
-        "year": year,
-        "book": book,
-        "ai_insight": ai_insight,
+        "year": feature_data.get("year", 2000),
+        "book": feature_data.get("book", "Unknown"),
+        "era": feature_data.get("era", "2000s"),
     }
 
 
+def _insight_prompt(curated: dict) -> str:
+    return (
+        f"Book: {curated['book']} ({curated['era']})\n"
+        f"Quote: \"{curated['quote']}\"\n"
+        f"Base context: {curated['historical_context']}\n\n"
+        "Give me an enriched 2–3 sentence deep-dive insight."
+    )
+
+
+def _archivist_insight(curated: dict) -> str:
+    """LLM deep-dive for a curated payload, served from cache when possible."""
+    return cached_dedalus_chat(ARCHIVIST_SYSTEM_PROMPT, _insight_prompt(curated), task="archivist_insight")
+
+
+def _archivist_lookup(landmark_id: str, feature_data: dict = None,
+                      defer: frozenset[str] | None = None) -> dict:
+    """
+    Internal function — callable by the Conductor for parallel orchestration.
+    Returns a plain dict (not an HttpResponse).
+
+    If the landmark_id is in the knowledge base, use the curated entry.
+    Otherwise, fall back to feature_data (from uploaded PDFs) and still
+    call Dedalus for an AI deep-dive.  If "ai_insight" is in defer, it is
+    only taken from cache and otherwise returned as a handle.
+    """
+    curated = _archivist_curated(landmark_id, feature_data)
+
+    result = {k: v for k, v in curated.items() if k != "era"}
+    if defer and "ai_insight" in defer:
+        defer_field(result, "ai_insight", ARCHIVIST_SYSTEM_PROMPT, _insight_prompt(curated),
+                    task="archivist_insight")
+    else:
+        result["ai_insight"] = _archivist_insight(curated)
+    return result
+
+
 @csrf_exempt
-@require_POST
+@require_http_methods(["GET", "POST"])
 def lookup(request):
     """
+    GET  /tools/archivist/lookup?landmark_id=jlc-san-francisco
+         Curated fields only — cacheable (ETag + Cache-Control).
     POST /tools/archivist/lookup
-    Body: { "landmark_id": "jlc-san-francisco" }
+    Body: { "landmark_id": "jlc-san-francisco", "defer": ["ai_insight"] }
+         Curated fields plus ai_insight; deferred fields come back as
+         handles (see core/deferred.py).
     """
+    if request.method == "GET":
+        landmark_id = request.GET.get("landmark_id")
+        if not landmark_id:
+            return JsonResponse({"error": "landmark_id is required"}, status=400)
+        if landmark_id not in KNOWLEDGE_BASE:
+            return JsonResponse({"error": f"Unknown landmark: {landmark_id}"}, status=404)
+        return curated_response(
+            request, KNOWLEDGE_BASE_VERSION, landmark_id,
+            lambda: _archivist_curated(landmark_id),
+        )
+
     try:
         body = json.loads(request.body)
     except json.JSONDecodeError:
@@ -103,8 +133,36 @@ def lookup(request):
         return JsonResponse({"error": "landmark_id is required"}, status=400)
 
     try:
-        result = _archivist_lookup(landmark_id)
+        defer = parse_defer(body)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    try:
+        result = _archivist_lookup(landmark_id, defer=defer)
     except ValueError as e:
         return JsonResponse({"error": str(e)}, status=404)
 
     return JsonResponse(result)
+
+
+@require_GET
+def lookup_enrichment(request):
+    """
+    GET /tools/archivist/lookup/enrichment?landmark_id=jlc-san-francisco
+
+    Returns just the LLM field: { "landmark_id": "...", "ai_insight": "..." }
+    """
+    landmark_id = request.GET.get("landmark_id")
+    if not landmark_id:
+        return JsonResponse({"error": "landmark_id is required"}, status=400)
+
+    try:
+        curated = _archivist_curated(landmark_id)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=404)
+
+    insight = _archivist_insight(curated)
+    return enrichment_response(request, {
+        "landmark_id": landmark_id,
+        "ai_insight": insight,
+    }, fallback=is_fallback(insight))
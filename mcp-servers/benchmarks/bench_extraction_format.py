@@ -0,0 +1,93 @@
+"""
+Extraction format benchmark — JSON objects vs compact lines.
+
+Runs extract_locations_from_title() against the in-process fake Dedalus
+(benchmarks/fake_llm.py) in each reply format of core/location_format.py
+and reports, per format and number of locations in the reply, wall time,
+completions, completion tokens (total and per location) and how many
+locations were parsed.  With enough locations a reply hits
+max_tokens=4096 and is cut off; the extra completions are the
+continuation requests that recover the rest.
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_extraction_format [--counts 5,10,40,80] [--runs 3]
+        [--base-ms 300] [--per-token-ms 15] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django  # noqa: E402
+
+django.setup()
+
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+from core.location_format import FORMATS  # noqa: E402
+from core.title_extractor import extract_locations_from_title  # noqa: E402
+
+
+def run(counts: list[int], runs: int, base_ms: float, per_token_ms: float) -> list[dict]:
+    rows = []
+    for count in counts:
+        with FakeLLM(base_ms=base_ms, per_token_ms=per_token_ms, locations=count) as llm:
+            for fmt in FORMATS:
+                times, calls, tokens, parsed = [], [], [], []
+                for _ in range(runs):
+                    llm.reset()
+                    t0 = time.perf_counter()
+                    locations = extract_locations_from_title("Synthetic Book", fmt=fmt)
+                    times.append((time.perf_counter() - t0) * 1000)
+                    calls.append(llm.stats()["calls"])
+                    tokens.append(llm.stats()["completion_tokens"])
+                    parsed.append(len(locations))
+
+                completion = statistics.mean(tokens)
+                found = statistics.mean(parsed)
+                rows.append({
+                    "locations": count,
+                    "format": fmt,
+                    "runs": runs,
+                    "median_ms": round(statistics.median(times), 1),
+                    "calls": statistics.mean(calls),
+                    "completion_tokens": completion,
+                    "tokens_per_location": round(completion / found, 1) if found else None,
+                    "parsed": found,
+                })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", default="5,10,40,80")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--base-ms", type=float, default=300.0)
+    parser.add_argument("--per-token-ms", type=float, default=15.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    counts = [int(c) for c in args.counts.split(",")]
+    rows = run(counts, args.runs, args.base_ms, args.per_token_ms)
+
+    header = f"{'locations':>9} {'format':<8} {'median ms':>10} {'calls':>6} {'compl tok':>10} {'tok/loc':>8} {'parsed':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        per_loc = "-" if r["tokens_per_location"] is None else f"{r['tokens_per_location']:.1f}"
+        print(
+            f"{r['locations']:>9} {r['format']:<8} {r['median_ms']:>10.1f} {r['calls']:>6.1f} "
+            f"{r['completion_tokens']:>10.0f} {per_loc:>8} {r['parsed']:>7.0f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"base_ms": args.base_ms, "per_token_ms": args.per_token_ms, "results": rows}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
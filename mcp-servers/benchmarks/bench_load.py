@@ -0,0 +1,369 @@
+"""
+Load benchmark — drive every endpoint of a running app at concurrency.
+
+Starts the fake Dedalus server (benchmarks/fake_dedalus.py) and an Open
+Library stub in-process, then the Django app itself (gunicorn if it is
+installed, else `manage.py runserver`) pointed at both through
+DEDALUS_BASE_URL and OPEN_LIBRARY_BASE_URL.  Worker threads then send a
+weighted mix of requests for --duration seconds and the run reports,
+per endpoint and overall, throughput, error count and p50/p95/p99
+latency, plus a count of each status code (0 = connection error).
+
+Endpoints (names for --mix):
+  orchestrate        POST /orchestrate (landmark + era)
+  search             POST /search
+  chat               POST /chat
+  extract_title      POST /extract-from-title
+  upload             POST /upload-book (a 3-page synthetic PDF)
+  tools_archivist    POST /tools/archivist/lookup
+  tools_linguist     POST /tools/linguist/dialect
+  tools_stylist      POST /tools/stylist/style
+  tools_librarian    POST /tools/librarian/search
+
+--json writes the results (with the git revision and settings) for
+later runs to compare against: --baseline FILE exits 1 if throughput
+drops, or any endpoint's p95 rises, by more than --tolerance.
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_load [--concurrency 16] [--duration 30]
+        [--mix orchestrate=30,search=10,...] [--latency lognormal:400,0.5]
+        [--per-token-ms 5] [--workers 2] [--json out.json]
+        [--baseline old.json --tolerance 0.2]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+from archivist.knowledge_base import KNOWLEDGE_BASE
+from benchmarks.fake_dedalus import FakeDedalus, serve
+from benchmarks.synthetic_pdf import make_book
+
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = (
+    "orchestrate=30,tools_archivist=10,tools_linguist=10,tools_stylist=10,"
+    "tools_librarian=5,search=10,chat=10,extract_title=5,upload=2"
+)
+
+VIBES = [
+    "somewhere that feels like a lonely rainy Sunday",
+    "jazz, smoke and big dreams",
+    "a family secret in a foggy city",
+    "the hum of a summer night in the city",
+]
+BOOK_TITLES = ["The Great Gatsby", "Invisible Man", "The Joy Luck Club", "Beloved", "Ulysses"]
+
+
+# ── Stub Open Library ───────────────────────────────────────────────
+class _OpenLibraryStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_ms = 150.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency_ms / 1000)
+        docs = [
+            {
+                "key": f"/works/OL{i}W",
+                "title": f"Synthetic Book {i}",
+                "author_name": ["A. Writer"],
+                "first_publish_year": 1920 + i,
+                "cover_edition_key": f"OL{i}M",
+                "edition_count": i + 1,
+                "isbn": [f"97800000000{i:02d}"],
+                "subject": ["Fiction", "Cities"],
+                "language": ["eng"],
+                "publisher": ["Synthetic Press"],
+            }
+            for i in range(10)
+        ]
+        data = json.dumps({"numFound": len(docs), "docs": docs}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+# ── Requests ────────────────────────────────────────────────────────
+def _request_builders(pdf: bytes) -> dict:
+    landmarks = list(KNOWLEDGE_BASE.items())
+    eras = sorted({entry["era"] for _, entry in landmarks})
+
+    def orchestrate(rng):
+        landmark_id, entry = rng.choice(landmarks)
+        return "POST", "/orchestrate", {"json": {"landmark_id": landmark_id, "era": entry["era"]}}
+
+    def search(rng):
+        return "POST", "/search", {"json": {"query": rng.choice(VIBES)}}
+
+    def chat(rng):
+        landmark_id, entry = rng.choice(landmarks)
+        return "POST", "/chat", {"json": {
+            "question": "What was daily life like here?",
+            "context": {"title": landmark_id, "book": entry["book"], "era": entry["era"]},
+        }}
+
+    def extract_title(rng):
+        return "POST", "/extract-from-title", {"json": {"title": rng.choice(BOOK_TITLES)}}
+
+    def upload(rng):
+        return "POST", "/upload-book", {
+            "files": {"file": ("synthetic-book.pdf", pdf, "application/pdf")},
+            "data": {"title": "Synthetic Book"},
+        }
+
+    def tools_archivist(rng):
+        return "POST", "/tools/archivist/lookup", {"json": {"landmark_id": rng.choice(landmarks)[0]}}
+
+    def tools_linguist(rng):
+        return "POST", "/tools/linguist/dialect", {"json": {"era": rng.choice(eras)}}
+
+    def tools_stylist(rng):
+        return "POST", "/tools/stylist/style", {"json": {"era": rng.choice(eras)}}
+
+    def tools_librarian(rng):
+        return "POST", "/tools/librarian/search", {"json": {"query": rng.choice(BOOK_TITLES)}}
+
+    return {fn.__name__: fn for fn in (
+        orchestrate, search, chat, extract_title, upload,
+        tools_archivist, tools_linguist, tools_stylist, tools_librarian,
+    )}
+
+
+def parse_mix(spec: str, known) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in known:
+            raise ValueError(f"Unknown endpoint in mix: {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ── Running the app ─────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_in_thread(server) -> None:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def start_app(port: int, env: dict, workers: int, threads: int) -> subprocess.Popen:
+    if importlib.util.find_spec("gunicorn"):
+        cmd = [
+            sys.executable, "-m", "gunicorn", "core.wsgi:application",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+            "--threads", str(threads), "--timeout", "120",
+        ]
+    else:
+        cmd = [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--noreload"]
+    proc = subprocess.Popen(
+        cmd, cwd=APP_DIR, env={**os.environ, **env},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"App exited with status {proc.returncode}: {' '.join(cmd)}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("App did not start within 60 s")
+
+
+# ── Load ────────────────────────────────────────────────────────────
+def _percentile(ordered: list[float], p: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+
+def drive(base_url: str, builders: dict, mix: dict[str, float], concurrency: int,
+          duration: float, seed: int) -> dict:
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    samples: dict[str, list[tuple[float, int]]] = {n: [] for n in names}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        with httpx.Client(base_url=base_url, timeout=180) as client:
+            while time.monotonic() < stop_at:
+                name = rng.choices(names, weights)[0]
+                method, path, kwargs = builders[name](rng)
+                t0 = time.perf_counter()
+                try:
+                    status = client.request(method, path, **kwargs).status_code
+                except httpx.HTTPError:
+                    status = 0
+                elapsed = (time.perf_counter() - t0) * 1000
+                with lock:
+                    samples[name].append((elapsed, status))
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    def summary(rows: list[tuple[float, int]]) -> dict:
+        ordered = sorted(ms for ms, _ in rows)
+        statuses = Counter(str(status) for _, status in rows)
+        return {
+            "requests": len(rows),
+            "errors": sum(not 200 <= status < 400 for _, status in rows),
+            "statuses": dict(sorted(statuses.items())),
+            "throughput_rps": round(len(rows) / wall, 2),
+            "mean_ms": round(sum(ordered) / len(ordered), 1) if ordered else None,
+            "p50_ms": _percentile(ordered, 0.50),
+            "p95_ms": _percentile(ordered, 0.95),
+            "p99_ms": _percentile(ordered, 0.99),
+            "max_ms": round(ordered[-1], 1) if ordered else None,
+        }
+
+    return {
+        "wall_s": round(wall, 2),
+        "overall": summary([row for rows in samples.values() for row in rows]),
+        "endpoints": {name: summary(rows) for name, rows in samples.items()},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of results against baseline, as messages."""
+    problems = []
+    old, new = baseline["overall"]["throughput_rps"], results["overall"]["throughput_rps"]
+    if old and new < old * (1 - tolerance):
+        problems.append(f"throughput {old} -> {new} rps")
+    for name, stats in results["endpoints"].items():
+        before = baseline["endpoints"].get(name, {}).get("p95_ms")
+        after = stats["p95_ms"]
+        if before and after and after > before * (1 + tolerance):
+            problems.append(f"{name} p95 {before} -> {after} ms")
+    return problems
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of unmeasured load first")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--latency", default="lognormal:400,0.5", help="Fake Dedalus first-token latency")
+    parser.add_argument("--per-token-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--openlibrary-ms", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    builders = _request_builders(make_book(pages=3, place_density=0.1))
+    try:
+        mix = parse_mix(args.mix, builders)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    fake = FakeDedalus(latency=args.latency, per_token_ms=args.per_token_ms, error_rate=args.error_rate)
+    dedalus = serve(fake, port=0)
+    _OpenLibraryStub.latency_ms = args.openlibrary_ms
+    openlibrary = ThreadingHTTPServer(("127.0.0.1", 0), _OpenLibraryStub)
+    openlibrary.daemon_threads = True
+    _start_in_thread(dedalus)
+    _start_in_thread(openlibrary)
+
+    port = _free_port()
+    scratch = tempfile.mkdtemp(prefix="bench-load-")
+    app = start_app(port, {
+        "DEDALUS_BASE_URL": f"http://127.0.0.1:{dedalus.server_port}",
+        "DEDALUS_API_KEY": "fake-key",
+        "OPEN_LIBRARY_BASE_URL": f"http://127.0.0.1:{openlibrary.server_port}",
+        "DEBUG": "false",
+        "ERA_REGISTRY_PATH": os.path.join(scratch, "era_registry.json"),
+        "TILE_CACHE_DIR": os.path.join(scratch, "tiles"),
+    }, args.workers, args.threads)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if args.warmup:
+            drive(base_url, builders, mix, args.concurrency, args.warmup, args.seed + 1000)
+        results = drive(base_url, builders, mix, args.concurrency, args.duration, args.seed)
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+        dedalus.shutdown()
+        openlibrary.shutdown()
+
+    header = f"{'endpoint':<16} {'reqs':>6} {'errors':>6} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, s in [*results["endpoints"].items(), ("overall", results["overall"])]:
+        if not s["requests"]:
+            continue
+        print(
+            f"{name:<16} {s['requests']:>6} {s['errors']:>6} {s['throughput_rps']:>7.2f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+
+    report = {
+        "git_revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+        **results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            problems = compare(results, json.load(fh), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
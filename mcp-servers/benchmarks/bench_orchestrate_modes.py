@@ -0,0 +1,105 @@
+"""
+/orchestrate benchmark — fan-out vs fused mode.
+
+Runs cold-cache /orchestrate clicks against the in-process fake Dedalus
+(benchmarks/fake_llm.py) and reports, per mode and scenario, wall time
+plus the number of completions and estimated prompt/completion tokens.
+
+Scenarios:
+  - curated     landmark + curated era ("1920s")
+  - uncurated   landmark + an era with no dialect profile (a fresh one
+                per run, so the era registry is always cold too)
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_orchestrate_modes [--runs 5] [--base-ms 300]
+        [--per-token-ms 15] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from benchmarks.fake_llm import FakeLLM  # noqa: E402
+
+
+LANDMARK_ID = "hr-harlem"
+MODES = ("fanout", "fused")
+
+
+def run(runs: int, base_ms: float, per_token_ms: float) -> list[dict]:
+    settings.ALLOWED_HOSTS = ["*"]
+    settings.ERA_REGISTRY_PATH = os.path.join(tempfile.mkdtemp(), "era_registry.json")
+    client = Client()
+    fresh_eras = (f"{year}s" for year in range(1890, 1000, -10))
+    rows = []
+
+    with FakeLLM(base_ms=base_ms, per_token_ms=per_token_ms) as llm:
+        for scenario in ("curated", "uncurated"):
+            for mode in MODES:
+                times, stats = [], []
+                for _ in range(runs):
+                    cache.clear()
+                    llm.reset()
+                    era = "1920s" if scenario == "curated" else next(fresh_eras)
+                    t0 = time.perf_counter()
+                    resp = client.post(
+                        "/orchestrate",
+                        data=json.dumps({"landmark_id": LANDMARK_ID, "era": era, "mode": mode}),
+                        content_type="application/json",
+                    )
+                    times.append((time.perf_counter() - t0) * 1000)
+                    assert resp.status_code == 200, resp.content
+                    stats.append(llm.stats())
+
+                rows.append({
+                    "scenario": scenario,
+                    "mode": mode,
+                    "runs": runs,
+                    "median_ms": round(statistics.median(times), 1),
+                    "calls": statistics.mean(s["calls"] for s in stats),
+                    "prompt_tokens": statistics.mean(s["prompt_tokens"] for s in stats),
+                    "completion_tokens": statistics.mean(s["completion_tokens"] for s in stats),
+                })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--base-ms", type=float, default=300.0)
+    parser.add_argument("--per-token-ms", type=float, default=15.0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    rows = run(args.runs, args.base_ms, args.per_token_ms)
+
+    header = f"{'scenario':<10} {'mode':<7} {'median ms':>10} {'calls':>6} {'prompt tok':>11} {'compl tok':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['scenario']:<10} {r['mode']:<7} {r['median_ms']:>10.1f} {r['calls']:>6.1f} "
+            f"{r['prompt_tokens']:>11.0f} {r['completion_tokens']:>10.0f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"base_ms": args.base_ms, "per_token_ms": args.per_token_ms, "results": rows}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
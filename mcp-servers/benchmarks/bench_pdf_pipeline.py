@@ -0,0 +1,140 @@
+"""
+PDF pipeline micro-benchmarks — per-stage time and peak memory.
+
+Generates synthetic books (benchmarks/synthetic_pdf.py) in a few size
+classes and times each local stage of the /upload-book pipeline on them:
+
+  extract_text      pdf_processor.extract_text_from_pdf()
+  truncate          pdf_processor._truncate()
+  parse_json        location_format.parse_locations() on a JSON reply cut
+                    off mid-object (the _extract_complete_objects path)
+  parse_compact     location_format.parse_locations() on a compact reply
+  to_geojson        pdf_processor.locations_to_geojson()
+
+Each stage reports the median of --repeat timed runs, then one more run
+under tracemalloc for its peak Python allocation.  tracemalloc does not
+see PyMuPDF's C allocations, so extract_text's figure is the Python side
+only (the extracted strings).  extract_text_from_pdf() reads at most 100
+pages, so "large" shows that cap rather than 400 pages of work.
+
+Size classes (pages / locations in the reply):
+  small     10 / 10
+  medium    100 / 50
+  large     400 / 500
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_pdf_pipeline [--classes small,medium,large]
+        [--layout single] [--place-density 0.03] [--repeat 5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django  # noqa: E402
+
+django.setup()
+
+from benchmarks.canned import compact_lines, synthetic_location  # noqa: E402
+from benchmarks.synthetic_pdf import LAYOUTS, make_book  # noqa: E402
+from core.location_format import parse_locations  # noqa: E402
+from core.pdf_processor import _truncate, extract_text_from_pdf, locations_to_geojson  # noqa: E402
+
+
+SIZE_CLASSES = {
+    "small": (10, 10),
+    "medium": (100, 50),
+    "large": (400, 500),
+}
+
+
+def _measure(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run(classes: list[str], layout: str, place_density: float, repeat: int) -> list[dict]:
+    rows = []
+    for name in classes:
+        pages, n_locations = SIZE_CLASSES[name]
+        pdf = make_book(pages, layout, place_density=place_density)
+        text = extract_text_from_pdf(pdf)
+        locations = [synthetic_location(i) for i in range(n_locations)]
+        json_reply = json.dumps(locations, indent=2)
+        json_reply = json_reply[:int(len(json_reply) * 0.95)]  # cut off mid-object
+        compact_reply = compact_lines(locations)
+
+        stages = {
+            "extract_text": lambda: extract_text_from_pdf(pdf),
+            "truncate": lambda: _truncate(text),
+            "parse_json": lambda: parse_locations(json_reply, "json", book="Synthetic Book"),
+            "parse_compact": lambda: parse_locations(compact_reply, "compact", book="Synthetic Book"),
+            "to_geojson": lambda: locations_to_geojson(locations),
+        }
+        for stage, fn in stages.items():
+            rows.append({
+                "class": name,
+                "pages": pages,
+                "pdf_kib": round(len(pdf) / 1024, 1),
+                "text_chars": len(text),
+                "locations": n_locations,
+                "stage": stage,
+                **_measure(fn, repeat),
+            })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--classes", default="small,medium,large")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="single")
+    parser.add_argument("--place-density", type=float, default=0.03)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    classes = [c.strip() for c in args.classes.split(",")]
+    unknown = [c for c in classes if c not in SIZE_CLASSES]
+    if unknown:
+        parser.error(f"Unknown size class: {', '.join(unknown)}")
+
+    rows = run(classes, args.layout, args.place_density, args.repeat)
+
+    header = f"{'class':<7} {'stage':<14} {'median ms':>10} {'min ms':>9} {'peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['class']:<7} {r['stage']:<14} {r['median_ms']:>10.2f} {r['min_ms']:>9.2f} {r['peak_kib']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({
+                "layout": args.layout,
+                "place_density": args.place_density,
+                "repeat": args.repeat,
+                "results": rows,
+            }, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Start-up benchmark — import time per module and time to first request.
+
+Two measurements, each repeated --runs times (medians reported):
+
+  imports   a fresh interpreter loads core.wsgi (Django setup plus the
+            preload in core/startup.py) under `python -X importtime`.
+            Reports the wall time, the --top slowest imports by
+            cumulative time, the app's own modules, and whether the
+            lazily imported dependencies (PyMuPDF, httpx) stayed out.
+
+  serving   starts the app (gunicorn if installed, with --preload unless
+            --no-preload; else `manage.py runserver`) and polls GET /
+            every 10 ms.  Reports spawn-to-first-response time, then the
+            first and second response times of a few endpoints — the
+            first /upload-book pays for importing PyMuPDF.
+
+Dedalus is left unconfigured (agents answer from curated data), so no
+network calls are made.
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_startup [--runs 5] [--top 15] [--workers 2]
+        [--no-preload] [--json out.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from archivist.knowledge_base import KNOWLEDGE_BASE
+from benchmarks.synthetic_pdf import make_book
+
+
+APP_DIR = Path(__file__).resolve().parent.parent
+APP_PACKAGES = ("core", "archivist", "librarian", "linguist", "stylist")
+LAZY_MODULES = ("fitz", "pymupdf", "httpx")
+
+_LOAD_APP = (
+    "import os, sys, json; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings'); "
+    "import core.wsgi; "
+    f"print(json.dumps({{m: m in sys.modules for m in {LAZY_MODULES!r}}}))"
+)
+
+
+def _app_env(scratch: str) -> dict:
+    return {
+        **os.environ,
+        "PYTHONPATH": str(APP_DIR),
+        "DEBUG": "false",
+        "DEDALUS_API_KEY": "",
+        "CACHE_WARMER_ON_STARTUP": "false",
+        "ERA_REGISTRY_PATH": os.path.join(scratch, "era_registry.json"),
+        "TILE_CACHE_DIR": os.path.join(scratch, "tiles"),
+    }
+
+
+# ── Imports ─────────────────────────────────────────────────────────
+def parse_importtime(stderr: str) -> list[dict]:
+    """Rows of `-X importtime` output: module, depth, self and cumulative ms."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "| imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return rows
+
+
+def measure_imports(env: dict, runs: int, top: int) -> dict:
+    walls, per_module, lazy = [], {}, None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _LOAD_APP],
+            cwd=APP_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        walls.append((time.perf_counter() - t0) * 1000)
+        lazy = json.loads(proc.stdout.strip().splitlines()[-1])
+        for row in parse_importtime(proc.stderr):
+            per_module.setdefault(row["module"], []).append(row)
+
+    def median_row(rows: list[dict]) -> dict:
+        return {
+            "module": rows[0]["module"],
+            "depth": rows[0]["depth"],
+            "cumulative_ms": round(statistics.median(r["cumulative_ms"] for r in rows), 1),
+            "self_ms": round(statistics.median(r["self_ms"] for r in rows), 1),
+        }
+
+    modules = [median_row(rows) for rows in per_module.values()]
+    slowest = sorted(modules, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+    app = sorted(
+        (r for r in modules if r["module"].split(".")[0] in APP_PACKAGES),
+        key=lambda r: r["cumulative_ms"], reverse=True,
+    )
+    return {
+        "wall_ms": round(statistics.median(walls), 1),
+        "slowest": slowest,
+        "app_modules": app,
+        "lazy_loaded_at_start": lazy,
+    }
+
+
+# ── Serving ─────────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_command(port: int, workers: int, preload: bool) -> tuple[str, list[str]]:
+    if importlib.util.find_spec("gunicorn"):
+        cmd = [
+            sys.executable, "-m", "gunicorn", "core.wsgi:application",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--timeout", "120",
+        ]
+        return ("gunicorn --preload" if preload else "gunicorn"), cmd + (["--preload"] if preload else [])
+    return "runserver", [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--noreload"]
+
+
+def _request(url: str, body: bytes | None = None, content_type: str | None = None,
+             timeout: float = 30) -> int:
+    req = urllib.request.Request(url, data=body, method="POST" if body is not None else "GET")
+    if content_type:
+        req.add_header("Content-Type", content_type)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+def _multipart(pdf: bytes) -> tuple[bytes, str]:
+    boundary = "bench-startup-boundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="book.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + pdf + (
+        f"\r\n--{boundary}\r\n"
+        'Content-Disposition: form-data; name="title"\r\n\r\nSynthetic Book\r\n'
+        f"--{boundary}--\r\n"
+    ).encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _first_requests() -> dict:
+    upload, upload_type = _multipart(make_book(pages=3, place_density=0.1))
+    landmark_id, entry = next(iter(KNOWLEDGE_BASE.items()))
+    orchestrate = json.dumps({"landmark_id": landmark_id, "era": entry["era"]}).encode()
+    return {
+        "clusters": ("/clusters?zoom=3", None, None),
+        "orchestrate": ("/orchestrate", orchestrate, "application/json"),
+        "upload": ("/upload-book", upload, upload_type),
+    }
+
+
+def measure_serving(env: dict, runs: int, workers: int, preload: bool) -> dict:
+    requests = _first_requests()
+    ready, first, second = [], {name: [] for name in requests}, {name: [] for name in requests}
+    server = None
+    for _ in range(runs):
+        port = _free_port()
+        server, cmd = _server_command(port, workers, preload)
+        base = f"http://127.0.0.1:{port}"
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=APP_DIR, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"App exited with status {proc.returncode}: {' '.join(cmd)}")
+                if time.monotonic() > deadline:
+                    raise RuntimeError("App did not start within 60 s")
+                try:
+                    if _request(base + "/", timeout=1) == 200:
+                        break
+                except OSError:
+                    pass
+                time.sleep(0.01)
+            ready.append((time.perf_counter() - t0) * 1000)
+
+            for samples in (first, second):
+                for name, (path, body, content_type) in requests.items():
+                    t1 = time.perf_counter()
+                    status = _request(base + path, body, content_type)
+                    if status >= 500:
+                        raise RuntimeError(f"{path} returned {status}")
+                    samples[name].append((time.perf_counter() - t1) * 1000)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    def med(values: list[float]) -> float:
+        return round(statistics.median(values), 1)
+
+    return {
+        "server": server,
+        "workers": workers if server != "runserver" else 1,
+        "ready_ms": med(ready),
+        "endpoints": {
+            name: {"first_ms": med(first[name]), "second_ms": med(second[name])}
+            for name in requests
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--no-preload", action="store_true", help="Start gunicorn without --preload")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args(argv)
+
+    env = _app_env(tempfile.mkdtemp(prefix="bench-startup-"))
+    imports = measure_imports(env, args.runs, args.top)
+    serving = measure_serving(env, args.runs, args.workers, not args.no_preload)
+
+    print(f"Loading core.wsgi in a fresh interpreter: {imports['wall_ms']:.0f} ms (median of {args.runs})")
+    lazy = ", ".join(f"{m} {'LOADED' if loaded else 'not loaded'}" for m, loaded in imports["lazy_loaded_at_start"].items())
+    print(f"Lazy dependencies at start-up: {lazy}\n")
+    header = f"{'slowest imports':<44} {'cumulative ms':>14} {'self ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in imports["slowest"]:
+        name = "  " * row["depth"] + row["module"]
+        print(f"{name[:44]:<44} {row['cumulative_ms']:>14.1f} {row['self_ms']:>8.1f}")
+    print()
+    header = f"{'app modules':<44} {'cumulative ms':>14} {'self ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in imports["app_modules"]:
+        print(f"{row['module'][:44]:<44} {row['cumulative_ms']:>14.1f} {row['self_ms']:>8.1f}")
+
+    print(f"\n{serving['server']} ({serving['workers']} worker(s)): "
+          f"first response {serving['ready_ms']:.0f} ms after spawn")
+    header = f"{'endpoint':<14} {'first ms':>9} {'second ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, row in serving["endpoints"].items():
+        print(f"{name:<14} {row['first_ms']:>9.1f} {row['second_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"runs": args.runs, "imports": imports, "serving": serving}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Wire-format benchmark — plain GeoJSON vs the columnar format.
+
+Builds synthetic FeatureCollections through locations_to_geojson() and,
+for each size, measures serialisation time and payload size of:
+
+  - geojson/stdlib   what JsonResponse sends today
+  - geojson/fast     same structure through fast_dumps()
+  - columnar/fast    to_columnar() + fast_dumps()
+
+plus gzip and (if installed) brotli sizes of each body.
+
+Run from mcp-servers/:
+    python -m benchmarks.bench_wire_format [--sizes 10,1000,100000] [--json out.json]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+
+from core.geojson_wire import fast_dumps, orjson, to_columnar  # noqa: E402
+from core.middleware import brotli  # noqa: E402
+from core.pdf_processor import locations_to_geojson  # noqa: E402
+
+
+BOOKS = [f"Synthetic Book {i}" for i in range(20)]
+ERAS = ["1920s", "1940s", "1960s", "1980s", "2000s"]
+MOODS = ["melancholy,rain", "bright,jazz", "tense,noir", "hopeful,crowded"]
+
+
+def make_locations(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"loc-{i}",
+            "title": f"Place {i} — Scene {rng.randint(1, 40)}",
+            "book": rng.choice(BOOKS),
+            "era": rng.choice(ERAS),
+            "year": rng.randint(1900, 2020),
+            "coordinates": [rng.uniform(-180, 180), rng.uniform(-60, 70)],
+            "quote": "It was a bright cold day and the clocks were striking thirteen.",
+            "historical_context": "Synthetic context sentence for benchmarking purposes.",
+            "mood": rng.choice(MOODS),
+            "relevance": rng.randint(1, 10),
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeat: int) -> tuple[float, bytes]:
+    best, out = float("inf"), b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, out
+
+
+def bench(n: int) -> list[dict]:
+    geojson = locations_to_geojson(make_locations(n))
+    repeat = 5 if n <= 10_000 else 2
+
+    variants = {
+        "geojson/stdlib": lambda: json.dumps(geojson, cls=DjangoJSONEncoder).encode(),
+        "geojson/fast": lambda: fast_dumps(geojson),
+        "columnar/fast": lambda: fast_dumps(to_columnar(geojson)),
+    }
+
+    rows = []
+    for name, fn in variants.items():
+        ms, body = _time(fn, repeat)
+        rows.append({
+            "features": n,
+            "format": name,
+            "serialise_ms": round(ms, 3),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+            "br_bytes": len(brotli.compress(body, quality=4)) if brotli else None,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,1000,100000")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    print(f"orjson: {'yes' if orjson else 'no'}   brotli: {'yes' if brotli else 'no'}")
+    print(f"{'features':>9} {'format':<15} {'ms':>9} {'bytes':>11} {'gzip':>10} {'br':>10}")
+    results = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        for row in bench(n):
+            results.append(row)
+            print(f"{row['features']:>9} {row['format']:<15} {row['serialise_ms']:>9.2f} "
+                  f"{row['bytes']:>11} {row['gzip_bytes']:>10} {row['br_bytes'] or '-':>10}")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Canned Dedalus replies shared by the in-process fake (fake_llm.py) and
+the fake Dedalus server (fake_dedalus.py).
+
+completion_for() answers each of the app's prompts with text shaped like
+what it asks for: fused-mode JSON for "REQUESTED fields:" prompts,
+extracted locations (JSON or compact lines, minus any a continuation
+says were already found) for the extraction prompts, the top landmark
+ids for vibe search, a dialect profile for other JSON prompts, and a
+sentence for everything else.  No Django here, so the server runs
+without the app.
+"""
+
+import json
+import re
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+SENTENCE = (
+    "Under the streetlamps the city hummed with talk that would outlive the "
+    "decade, and every corner carried the rhythm of its own quiet history."
+)
+
+FIELD_VALUES = {
+    "archivist_insight": SENTENCE,
+    "dialect_blurb": "Did you know? " + SENTENCE,
+    "style_suggestion": "Add a slow grain overlay and a warm vignette that pulses with the accent colour.",
+    "synthesis": SENTENCE + " " + SENTENCE,
+    "dialect_profile": {
+        "era_label": "Synthetic Era",
+        "slang": [{"term": f"term{i}", "meaning": "a synthetic meaning"} for i in range(4)],
+        "dialect_notes": "Synthetic dialect notes for benchmarking.",
+    },
+}
+
+
+def synthetic_location(i: int) -> dict:
+    return {
+        "id": f"synthetic-place-{i}",
+        "title": f"Synthetic Place {i} — Corner Where the Story Turns",
+        "book": "Synthetic Book",
+        "era": "1920s",
+        "year": 1925,
+        "coordinates": [round(-73.9 + i * 0.0131, 4), round(40.7 + i * 0.0079, 4)],
+        "quote": "The lamps came on one by one along the avenue, and for a moment "
+                 "the whole street seemed to hold its breath.",
+        "historical_context": "The neighbourhood was changing fast in these years, "
+                              "and the book uses it to mark the narrator's own "
+                              "uneasy arrival in the city.",
+        "mood": "restless,glittering,uneasy",
+        "relevance": 10 - i % 10,
+    }
+
+
+def compact_lines(locations: list[dict]) -> str:
+    """Locations in the compact reply format of core/location_format.py."""
+    return "\n".join(
+        "|".join(str(v) for v in (
+            loc["id"], loc["title"], loc["era"], loc["year"], *loc["coordinates"],
+            loc["mood"], loc["quote"], loc["historical_context"], loc["relevance"],
+        ))
+        for loc in locations
+    )
+
+
+def _locations_for(system_prompt: str, user_message: str, count: int) -> str:
+    # Continuation requests list the ids already extracted.
+    done = re.search(r"do NOT repeat: (.*)$", user_message, re.MULTILINE)
+    skip = {i.strip() for i in done.group(1).split(",")} if done else set()
+    locations = [loc for loc in map(synthetic_location, range(count)) if loc["id"] not in skip]
+    if "ONE LINE per location" in system_prompt:
+        return compact_lines(locations)
+    return json.dumps(locations, indent=2, ensure_ascii=False)
+
+
+def completion_for(system_prompt: str, user_message: str, locations: int = 8) -> str:
+    if "literary geographer" in system_prompt:
+        return _locations_for(system_prompt, user_message, locations)
+    if "semantic search engine" in system_prompt:
+        ids = re.findall(r"^- ([\w-]+):", user_message, re.MULTILINE)[:3]
+        return json.dumps([
+            {"id": lid, "reason": "Synthetic match for benchmarking.", "vibe_score": round(0.9 - i * 0.1, 2)}
+            for i, lid in enumerate(ids)
+        ])
+    requested = re.search(r"REQUESTED fields: (.+)$", user_message, re.MULTILINE)
+    if requested:
+        fields = [f.strip() for f in requested.group(1).split(",")]
+        return json.dumps({f: FIELD_VALUES[f] for f in fields if f in FIELD_VALUES})
+    if "JSON" in system_prompt:
+        profile = dict(FIELD_VALUES["dialect_profile"], ai_blurb=FIELD_VALUES["dialect_blurb"])
+        return json.dumps(profile)
+    return SENTENCE
@@ -0,0 +1,395 @@
+"""
+Fake Dedalus server — a local OpenAI-compatible stand-in for load tests.
+
+Serves POST /v1/chat/completions with the canned replies of
+benchmarks/canned.py (extraction locations, dialect JSON, vibe-search
+JSON, blurbs and sentences), so the whole app can be driven at load
+without touching the real endpoint.  Point the app at it with
+
+    DEDALUS_BASE_URL=http://127.0.0.1:8765 DEDALUS_API_KEY=fake python manage.py runserver
+
+Behaviour, all set on the command line or changed mid-run by POSTing the
+same keys as JSON to /_fake/config:
+
+  latency        time to first token: fixed:MS, uniform:LO,HI,
+                 normal:MEAN,SD or lognormal:MEDIAN,SIGMA
+  per_token_ms   generation time per completion token
+  error_rate     fraction of requests answered with error_status
+  error_status   500, 429, 503, ...
+  truncate_rate  fraction of replies cut off early (finish_reason "length");
+                 replies longer than max_tokens are always cut there
+  locations      locations per extraction reply
+
+Requests with "stream": true get server-sent events, one chunk per ~4
+tokens, paced by per_token_ms.
+
+Cassettes (JSONL) record and replay real replies:
+
+  --record FILE   forward each request to --upstream with the caller's
+                  Authorization header and append the reply to FILE
+                  (no simulated latency is added)
+  --replay FILE   answer from FILE, keyed on model, max_tokens and the
+                  prompts; misses fall back to canned replies, or 404
+                  with --strict
+
+GET /_fake/stats reports request, error, truncation and cassette counts.
+
+Run from mcp-servers/:
+    python -m benchmarks.fake_dedalus [--port 8765] [--latency lognormal:400,0.5]
+        [--per-token-ms 15] [--error-rate 0.02] [--truncate-rate 0.05]
+        [--record FILE --upstream https://api.dedaluslabs.ai | --replay FILE [--strict]]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.canned import completion_for, estimate_tokens
+
+
+def parse_latency(spec: str):
+    """A function returning one latency sample in ms, from a spec like "uniform:100,500"."""
+    kind, _, raw = spec.partition(":")
+    try:
+        args = [float(a) for a in raw.split(",")] if raw else []
+    except ValueError:
+        raise ValueError(f"Bad latency spec: {spec!r}") from None
+    if kind == "fixed" and len(args) == 1:
+        return lambda: args[0]
+    if kind == "uniform" and len(args) == 2:
+        return lambda: random.uniform(*args)
+    if kind == "normal" and len(args) == 2:
+        return lambda: max(0.0, random.gauss(*args))
+    if kind == "lognormal" and len(args) == 2:
+        median, sigma = args
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Bad latency spec: {spec!r}")
+
+
+def cassette_key(model: str, max_tokens: int, system_prompt: str, user_message: str) -> str:
+    return hashlib.sha1(
+        "\x1f".join((model, str(max_tokens), system_prompt, user_message)).encode("utf-8")
+    ).hexdigest()
+
+
+class FakeDedalus:
+    def __init__(self, latency: str = "fixed:300", per_token_ms: float = 15.0,
+                 error_rate: float = 0.0, error_status: int = 500, truncate_rate: float = 0.0,
+                 locations: int = 8, record: str | None = None, upstream: str | None = None,
+                 replay: str | None = None, strict: bool = False):
+        self._lock = threading.Lock()
+        self.config = {}
+        self.configure({
+            "latency": latency, "per_token_ms": per_token_ms, "error_rate": error_rate,
+            "error_status": error_status, "truncate_rate": truncate_rate, "locations": locations,
+        })
+        self.record_path = record
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.replaying = bool(replay)
+        self.strict = strict
+        self.cassette: dict[str, dict] = {}
+        if replay:
+            with open(replay, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.cassette[entry["key"]] = entry["response"]
+        self.stats = {
+            "requests": 0, "streamed": 0, "errors": 0, "truncated": 0,
+            "replayed": 0, "recorded": 0, "replay_misses": 0,
+            "prompt_tokens": 0, "completion_tokens": 0,
+        }
+
+    def configure(self, changes: dict) -> dict:
+        """Apply config changes (validated); returns the new config."""
+        allowed = {"latency", "per_token_ms", "error_rate", "error_status", "truncate_rate", "locations"}
+        unknown = set(changes) - allowed
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        sampler = parse_latency(changes["latency"]) if "latency" in changes else None
+        with self._lock:
+            self.config.update(changes)
+            if sampler is not None:
+                self._sample_latency = sampler
+            return dict(self.config)
+
+    def count(self, **deltas) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self.stats[name] += delta
+
+    # ── Producing a reply ───────────────────────────────────────────
+    def reply(self, body: dict, authorization: str | None) -> tuple[int, dict]:
+        """(status, {"content", "finish_reason", "usage"} or an error body)."""
+        messages = body.get("messages") or [{}]
+        system = messages[0].get("content", "")
+        user = messages[-1].get("content", "")
+        model = body.get("model", "")
+        max_tokens = int(body.get("max_tokens") or 512)
+        key = cassette_key(model, max_tokens, system, user)
+
+        if self.replaying:
+            if key in self.cassette:
+                self.count(replayed=1)
+                return 200, self.cassette[key]
+            self.count(replay_misses=1)
+            if self.strict:
+                return 404, {"error": {"message": "No cassette entry for this request", "type": "not_found"}}
+
+        if self.record_path:
+            return self._forward(body, authorization, key, model, max_tokens, system, user)
+
+        text = completion_for(system, user, self.config["locations"])
+        finish_reason = "stop"
+        if estimate_tokens(text) > max_tokens:
+            text, finish_reason = text[:max_tokens * 4], "length"
+        elif random.random() < self.config["truncate_rate"]:
+            text, finish_reason = text[:int(len(text) * random.uniform(0.2, 0.9))], "length"
+        prompt_tokens = estimate_tokens(system) + estimate_tokens(user)
+        completion_tokens = estimate_tokens(text)
+        return 200, {
+            "content": text,
+            "finish_reason": finish_reason,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _forward(self, body, authorization, key, model, max_tokens, system, user) -> tuple[int, dict]:
+        request = urllib.request.Request(
+            f"{self.upstream}/v1/chat/completions",
+            data=json.dumps({**body, "stream": False}).encode("utf-8"),
+            headers={"Content-Type": "application/json", "Authorization": authorization or ""},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=120) as resp:
+                data = json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, {"error": {"message": exc.read().decode("utf-8", "replace"), "type": "upstream"}}
+        except (urllib.error.URLError, TimeoutError) as exc:
+            return 502, {"error": {"message": str(exc), "type": "upstream"}}
+
+        choice = data["choices"][0]
+        response = {
+            "content": choice["message"]["content"],
+            "finish_reason": choice.get("finish_reason"),
+            "usage": data.get("usage") or {},
+        }
+        entry = {
+            "key": key,
+            "request": {"model": model, "max_tokens": max_tokens, "system": system, "user": user},
+            "response": response,
+        }
+        with self._lock:
+            with open(self.record_path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.stats["recorded"] += 1
+        return 200, response
+
+    def first_token_ms(self) -> float:
+        with self._lock:
+            return self._sample_latency()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeDedalus/1.0"
+    protocol_version = "HTTP/1.1"
+    fake: FakeDedalus
+    verbose = False
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict | None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def do_GET(self):
+        if self.path == "/_fake/stats":
+            with self.fake._lock:
+                self._send_json(200, {"config": dict(self.fake.config), "stats": dict(self.fake.stats)})
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        body = self._read_json()
+        if body is None:
+            self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+            return
+        if self.path == "/_fake/config":
+            try:
+                self._send_json(200, self.fake.configure(body))
+            except (ValueError, TypeError) as exc:
+                self._send_json(400, {"error": {"message": str(exc)}})
+            return
+        if self.path != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        self._chat(body)
+
+    def _chat(self, body: dict) -> None:
+        fake = self.fake
+        config = fake.config
+        fake.count(requests=1)
+        # When recording, the upstream's own latency is the latency.
+        simulate = not fake.record_path
+        if simulate:
+            time.sleep(fake.first_token_ms() / 1000)
+
+        if random.random() < config["error_rate"]:
+            fake.count(errors=1)
+            self._send_json(config["error_status"], {
+                "error": {"message": "Injected failure", "type": "server_error"},
+            })
+            return
+
+        status, result = fake.reply(body, self.headers.get("Authorization"))
+        if status != 200:
+            fake.count(errors=1)
+            self._send_json(status, result)
+            return
+
+        usage = result.get("usage") or {}
+        fake.count(
+            truncated=result["finish_reason"] == "length",
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "")
+        text = result["content"]
+
+        if body.get("stream"):
+            fake.count(streamed=1)
+            self._stream(completion_id, model, text, result["finish_reason"],
+                         config["per_token_ms"] if simulate else 0)
+            return
+
+        if simulate:
+            time.sleep(estimate_tokens(text) * config["per_token_ms"] / 1000)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": result["finish_reason"],
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, completion_id: str, model: str, text: str, finish_reason: str,
+                per_token_ms: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: dict, finish: str | None = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            event({"role": "assistant"})
+            step = 16  # ~4 tokens per chunk
+            for i in range(0, len(text), step):
+                piece = text[i:i + step]
+                time.sleep(estimate_tokens(piece) * per_token_ms / 1000)
+                event({"content": piece})
+            event({}, finish_reason)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(fake: FakeDedalus, host: str = "127.0.0.1", port: int = 8765,
+          verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but don't start) a server for fake; call serve_forever() on it."""
+    handler = type("Handler", (_Handler,), {"fake": fake, "verbose": verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:300")
+    parser.add_argument("--per-token-ms", type=float, default=15.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--locations", type=int, default=8)
+    parser.add_argument("--record", metavar="FILE")
+    parser.add_argument("--upstream", default="https://api.dedaluslabs.ai")
+    parser.add_argument("--replay", metavar="FILE")
+    parser.add_argument("--strict", action="store_true", help="404 on replay misses")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.record and args.replay:
+        parser.error("--record and --replay are mutually exclusive")
+    try:
+        fake = FakeDedalus(
+            latency=args.latency, per_token_ms=args.per_token_ms, error_rate=args.error_rate,
+            error_status=args.error_status, truncate_rate=args.truncate_rate,
+            locations=args.locations, record=args.record,
+            upstream=args.upstream if args.record else None,
+            replay=args.replay, strict=args.strict,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    server = serve(fake, args.host, args.port, args.verbose)
+    print(f"Fake Dedalus listening on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
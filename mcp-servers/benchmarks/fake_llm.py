@@ -0,0 +1,98 @@
+"""
+In-process fake Dedalus for benchmarks.
+
+Replaces httpx.post as seen by core.dedalus_client with a stub that
+sleeps for a latency model of a real chat completion
+
+    latency = base_ms + completion_tokens * per_token_ms
+
+and returns canned text or JSON shaped like what each prompt asks for —
+including `locations` extracted locations, in whichever format
+(core/location_format.py) the extraction prompt requests, minus any a
+continuation request says were already extracted.  Replies
+longer than the request's max_tokens are cut off there with
+finish_reason "length", like the real API.  Token counts are estimated
+at ~4 characters per token, which is close enough to compare modes
+against each other.
+
+Usage:
+    from benchmarks.fake_llm import FakeLLM
+    with FakeLLM(base_ms=300, per_token_ms=15) as llm:
+        ...
+    llm.stats()  # {"calls": ..., "prompt_tokens": ..., "completion_tokens": ...}
+"""
+
+import threading
+import time
+
+import httpx
+from django.conf import settings
+
+from benchmarks.canned import completion_for, estimate_tokens
+
+
+class _Response:
+    def __init__(self, payload: dict):
+        self._payload = payload
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeLLM:
+    def __init__(self, base_ms: float = 300.0, per_token_ms: float = 15.0, locations: int = 8):
+        self.base_ms = base_ms
+        self.per_token_ms = per_token_ms
+        self.locations = locations
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+        self._saved = None
+
+    def post(self, url, headers=None, json=None, timeout=None, **kwargs):
+        messages = json["messages"]
+        system, user = messages[0]["content"], messages[-1]["content"]
+        text = completion_for(system, user, self.locations)
+        finish_reason = "stop"
+        if estimate_tokens(text) > json["max_tokens"]:
+            text, finish_reason = text[:json["max_tokens"] * 4], "length"
+        prompt_tokens = estimate_tokens(system) + estimate_tokens(user)
+        completion_tokens = estimate_tokens(text)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        time.sleep((self.base_ms + completion_tokens * self.per_token_ms) / 1000)
+        return _Response({
+            "choices": [{"message": {"content": text}, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+    def reset(self):
+        self.calls = self.prompt_tokens = self.completion_tokens = 0
+
+    def __enter__(self):
+        self._saved = (httpx.post, settings.DEDALUS_API_KEY)
+        httpx.post = self.post
+        settings.DEDALUS_API_KEY = settings.DEDALUS_API_KEY or "fake-key"
+        return self
+
+    def __exit__(self, *exc):
+        httpx.post, settings.DEDALUS_API_KEY = self._saved
+        return False
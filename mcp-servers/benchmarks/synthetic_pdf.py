@@ -0,0 +1,141 @@
+"""
+Synthetic book generator — reproducible PDFs for the upload pipeline.
+
+make_book() writes a PyMuPDF document of generated prose with a given
+page count, layout, optional running header/footer and a density of
+real place names (so the text looks like something worth extracting
+locations from).  The same arguments and seed always give the same
+text.
+
+Layouts:
+  single      one column of 11 pt text
+  two_column  two narrower columns per page
+  dense       one column of 8 pt text (about twice the words per page)
+
+Run from mcp-servers/ to write files:
+    python -m benchmarks.synthetic_pdf out.pdf [--pages 100] [--layout single]
+        [--place-density 0.03] [--no-header] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+import textwrap
+
+
+PLACES = [
+    "Lenox Avenue", "the Savoy Ballroom", "the Apollo Theater", "Coney Island",
+    "Washington Square", "the Brooklyn Bridge", "Grand Central", "Union Square",
+    "Chinatown", "Nob Hill", "the Embarcadero", "Golden Gate Park",
+    "the Left Bank", "Montmartre", "the Pont Neuf", "the Jardin du Luxembourg",
+    "Soho", "Whitechapel", "the Strand", "Hampstead Heath",
+    "the French Quarter", "Bourbon Street", "Beale Street", "the Mississippi levee",
+]
+
+WORDS = (
+    "the of and a to in was he she it that with for as his her on at by had "
+    "from they we you not but which were all this when there one would their "
+    "been if more no out so said what up its about into than them can only "
+    "other time new some could these two may first then do any like my now "
+    "over such our man me even most made after also did many before must "
+    "through back years where much your way well down should because each "
+    "just those people how too little state good very make world still own "
+    "see men work long get here between both life being under never day same "
+    "another know while last might us great old year off come since against "
+    "go came right used take three street evening window light rain river "
+    "city night music voice door morning winter letter train corner house"
+).split()
+
+LAYOUTS = {
+    # columns, font size, line height
+    "single": (1, 11, 14),
+    "two_column": (2, 10, 12.5),
+    "dense": (1, 8, 9.5),
+}
+
+PAGE_W, PAGE_H, MARGIN = 612, 792, 54
+
+
+def _sentence(rng: random.Random, place_density: float) -> str:
+    words = []
+    for _ in range(rng.randint(8, 22)):
+        if rng.random() < place_density:
+            words.append(rng.choice(PLACES))
+        else:
+            words.append(rng.choice(WORDS))
+    words[0] = words[0][0].upper() + words[0][1:]
+    return " ".join(words) + rng.choice([".", ".", ".", "?", "!"])
+
+
+def _paragraphs(rng: random.Random, place_density: float):
+    while True:
+        yield " ".join(_sentence(rng, place_density) for _ in range(rng.randint(3, 7)))
+
+
+def make_book(pages: int = 100, layout: str = "single", running_header: bool = True,
+              place_density: float = 0.03, title: str = "A Synthetic Novel",
+              seed: int = 0) -> bytes:
+    """Generate a book as PDF bytes."""
+    import fitz  # PyMuPDF
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; choose from {', '.join(LAYOUTS)}")
+    columns, fontsize, line_height = LAYOUTS[layout]
+    rng = random.Random(seed)
+    paragraphs = _paragraphs(rng, place_density)
+
+    gutter = 18
+    col_w = (PAGE_W - 2 * MARGIN - gutter * (columns - 1)) / columns
+    top = MARGIN + (24 if running_header else 0)
+    bottom = PAGE_H - MARGIN - (18 if running_header else 0)
+    # Helvetica averages about half an em per character.
+    chars_per_line = int(col_w / (fontsize * 0.55))
+    lines_per_col = int((bottom - top) / line_height) - 1
+    pending: list[str] = []
+
+    def column_lines() -> list[str]:
+        while len(pending) < lines_per_col:
+            pending.extend(textwrap.wrap(next(paragraphs), chars_per_line))
+            pending.append("")
+        lines = pending[:lines_per_col]
+        del pending[:lines_per_col]
+        return lines
+
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page(width=PAGE_W, height=PAGE_H)
+        if running_header:
+            page.insert_text((MARGIN, MARGIN), title.upper(), fontsize=8)
+            page.insert_text((PAGE_W - MARGIN - 24, PAGE_H - MARGIN), str(number), fontsize=8)
+        for col in range(columns):
+            x0 = MARGIN + col * (col_w + gutter)
+            page.insert_text(
+                (x0, top + fontsize), "\n".join(column_lines()),
+                fontsize=fontsize, lineheight=line_height / fontsize,
+            )
+    doc.set_metadata({"title": title, "producer": "benchmarks.synthetic_pdf"})
+    data = doc.tobytes(garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    return data
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="single")
+    parser.add_argument("--place-density", type=float, default=0.03,
+                        help="Chance that each word is a place name")
+    parser.add_argument("--no-header", action="store_true", help="Omit running header and page numbers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data = make_book(args.pages, args.layout, not args.no_header, args.place_density, seed=args.seed)
+    with open(args.output, "wb") as fh:
+        fh.write(data)
+    print(f"Wrote {args.output}: {args.pages} pages, {len(data) / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import os
+import sys
+
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self):
+        # Gunicorn workers start their services from gunicorn.conf.py
+        # after the fork; threads started here, in a --preload master,
+        # would not survive it.
+        if "gunicorn" in sys.modules:
+            return
+        # Only in serving processes — not in e.g. `manage.py warm_cache`
+        # or the runserver autoreloader's parent process.
+        if os.path.basename(sys.argv[0]) == "manage.py":
+            if sys.argv[1:2] != ["runserver"] or os.environ.get("RUN_MAIN") != "true":
+                return
+
+        from core.startup import start_worker_services
+
+        start_worker_services()
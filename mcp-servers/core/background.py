@@ -0,0 +1,81 @@
+"""
+Background enrichment — fire-and-forget work that fills the cache.
+
+Used for out-of-band LLM enrichment: a request returns immediately with
+whatever is cached, and the missing field is generated here so the next
+request finds it.  Submissions are de-duplicated by key, so a burst of
+identical requests triggers one upstream call.
+
+Work runs in named pools so speculative work can't crowd out enrichment
+a user is waiting for: "enrich" (BACKGROUND_WORKERS threads) for
+deferred fields, and the smaller "prefetch" pool (PREFETCH_WORKERS) for
+low-priority prefetching.
+
+Each pool holds at most BACKGROUND_QUEUE_MAX queued or running tasks;
+past that new work is dropped (it is only ever cache filling, and a
+later request will ask for it again) rather than queued without bound.
+"""
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+_in_flight: set[str] = set()
+_pending: dict[str, int] = {}
+
+
+def _pool_size(pool: str) -> int:
+    return {
+        "enrich": settings.BACKGROUND_WORKERS,
+        "prefetch": settings.PREFETCH_WORKERS,
+    }[pool]
+
+
+def _get_executor(pool: str) -> ThreadPoolExecutor:
+    executor = _executors.get(pool)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(pool)
+            if executor is None:
+                executor = _executors[pool] = ThreadPoolExecutor(
+                    max_workers=_pool_size(pool),
+                    thread_name_prefix=pool,
+                )
+    return executor
+
+
+def submit(key: str, fn, *args, pool: str = "enrich") -> bool:
+    """
+    Run fn(*args) in the background pool unless work for key is already
+    queued or the pool is full.  Returns True if the work was submitted.
+    """
+    with _lock:
+        if key in _in_flight:
+            return False
+        if _pending.get(pool, 0) >= settings.BACKGROUND_QUEUE_MAX:
+            logger.warning("Background pool %s is full; dropping %s", pool, key)
+            return False
+        _in_flight.add(key)
+        _pending[pool] = _pending.get(pool, 0) + 1
+
+    def _run():
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception("Background task %s failed", key)
+        finally:
+            with _lock:
+                _in_flight.discard(key)
+                _pending[pool] -= 1
+
+    # Carry the caller's context (e.g. its LLM priority class) into the worker.
+    _get_executor(pool).submit(contextvars.copy_context().run, _run)
+    return True
@@ -11,6 +11,7 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from core import metrics
 from core.dedalus_client import dedalus_chat
 
 
@@ -71,17 +72,19 @@ def chat_about_place(request):
     user_prompt = "\n".join(parts)
 
     try:
-        answer = dedalus_chat(CHAT_SYSTEM_PROMPT, user_prompt)
+        answer = dedalus_chat(CHAT_SYSTEM_PROMPT, user_prompt, task="chat")
         elapsed = round((time.perf_counter() - t_start) * 1000)
+        timeline = [{
+            "agent": "ConductorAgent",
+            "tool": "chat_about_place",
+            "status": "success",
+            "elapsed_ms": elapsed,
+        }]
+        metrics.observe_timeline(timeline)
         return JsonResponse({
             "answer": answer,
             "elapsed_ms": elapsed,
-            "timeline": [{
-                "agent": "ConductorAgent",
-                "tool": "chat_about_place",
-                "status": "success",
-                "elapsed_ms": elapsed,
-            }],
+            "timeline": timeline,
         })
     except Exception as exc:
         elapsed = round((time.perf_counter() - t_start) * 1000)
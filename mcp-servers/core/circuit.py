@@ -0,0 +1,164 @@
+"""
+Circuit breakers for upstream services (Dedalus, Open Library).
+
+Each upstream keeps a rolling window of recent calls — outcome and
+latency.  When, over at least min_calls calls in the last window_s
+seconds, the share of failures or of calls slower than slow_call_ms
+crosses its threshold, the circuit opens: callers skip the upstream
+entirely and serve curated or cached data instead of waiting out a
+30 s timeout.
+
+After open_s seconds the circuit goes half-open and lets a single
+probe call through.  If it succeeds the circuit closes and normal
+traffic resumes; if it fails the circuit opens for another open_s.
+allow() hands the probe a PROBE permit, and only a record() carrying it
+decides the half-open state: calls admitted before the circuit opened
+can still finish meanwhile (DEDALUS_TIMEOUT is as long as open_s) and
+must not close or re-trip it.
+
+Thresholds per upstream come from settings.CIRCUIT_BREAKERS.  Every
+outcome, and every call an open circuit turns away, is counted in
+core/metrics.py.
+"""
+
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from core import metrics
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# allow() permits, passed back to record().
+CALL = "call"
+PROBE = "probe"
+
+
+class CircuitOpen(Exception):
+    """Raised by callers that have no fallback when a circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, window_s: float = 60.0, min_calls: int = 5,
+                 failure_ratio: float = 0.5, slow_call_ms: float = 10000.0,
+                 slow_ratio: float = 0.5, open_s: float = 30.0):
+        self.name = name
+        self.window_s = window_s
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_ms = slow_call_ms
+        self.slow_ratio = slow_ratio
+        self.open_s = open_s
+
+        self._lock = threading.Lock()
+        self._calls: deque[tuple[float, bool, float]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_s:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> str | None:
+        """A permit (CALL, or PROBE for the half-open trial call) if a call
+        may go to the upstream now, else None.  Callers that get a permit
+        must report the outcome with record(ok, latency_ms, permit)."""
+        with self._lock:
+            permit = self._allow()
+        if permit is None:
+            metrics.record_upstream(self.name, "rejected")
+        return permit
+
+    def _allow(self) -> str | None:
+        if self._state == CLOSED:
+            return CALL
+        if self._state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_s:
+                return None
+            self._state = HALF_OPEN
+        if self._probe_in_flight:
+            return None
+        self._probe_in_flight = True
+        return PROBE
+
+    def record(self, ok: bool, latency_ms: float, permit: str = CALL) -> None:
+        metrics.record_upstream(self.name, "ok" if ok else "error", latency_ms)
+        now = time.monotonic()
+        with self._lock:
+            if permit == PROBE:
+                self._probe_in_flight = False
+                if ok and latency_ms < self.slow_call_ms:
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip(now)
+                return
+            if self._state == HALF_OPEN:
+                # A call admitted before the circuit opened; only the probe counts.
+                return
+
+            self._calls.append((now, ok, latency_ms))
+            while self._calls and now - self._calls[0][0] > self.window_s:
+                self._calls.popleft()
+
+            if self._state == CLOSED and len(self._calls) >= self.min_calls:
+                n = len(self._calls)
+                failures = sum(1 for _, ok_, _ in self._calls if not ok_)
+                slow = sum(1 for _, _, ms in self._calls if ms >= self.slow_call_ms)
+                if failures / n >= self.failure_ratio or slow / n >= self.slow_ratio:
+                    self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self.times_opened += 1
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            latencies = sorted(ms for _, _, ms in self._calls)
+            n = len(self._calls)
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+        return {
+            "state": state,
+            "calls": n,
+            "failure_rate": round(failures / n, 3) if n else 0.0,
+            "p50_ms": round(latencies[n // 2]) if n else None,
+            "p95_ms": round(latencies[min(n - 1, int(n * 0.95))]) if n else None,
+            "times_opened": self.times_opened,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_lock = threading.Lock()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for an upstream, created on first use."""
+    br = _breakers.get(name)
+    if br is None:
+        with _lock:
+            br = _breakers.get(name)
+            if br is None:
+                br = _breakers[name] = CircuitBreaker(name, **settings.CIRCUIT_BREAKERS.get(name, {}))
+    return br
+
+
+def degraded() -> dict[str, str]:
+    """Upstreams whose circuit is not closed, with their state."""
+    return {name: br.state for name, br in sorted(_breakers.items()) if br.state != CLOSED}
+
+
+def stats() -> dict:
+    return {name: br.stats() for name, br in sorted(_breakers.items())}
@@ -0,0 +1,358 @@
+"""
+Marker Clustering — server-side hierarchical clustering of map landmarks.
+
+A port of the greedy, zoom-by-zoom approach used by Mapbox's
+supercluster: points are projected to Web Mercator, then every zoom
+level is built by greedily merging the level below it within a fixed
+pixel radius.  The resulting pyramid is precomputed whenever a book is
+added to the landmark store, so serving a viewport is a grid lookup
+rather than a re-cluster.
+
+Each cluster carries its point count, the zoom at which it splits
+apart (expansion_zoom) and its top-ranked landmark, so the frontend can
+draw one labelled marker per cluster instead of thousands of DOM nodes.
+"""
+
+import math
+import threading
+import time
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from core import landmark_store
+from core.geojson_wire import geojson_response
+
+
+MIN_ZOOM = 0
+MAX_ZOOM = 16
+RADIUS_PX = 60
+EXTENT_PX = 512
+
+
+# ── Projection helpers ──────────────────────────────────────────────
+
+def _lng_x(lng: float) -> float:
+    return lng / 360 + 0.5
+
+
+def _lat_y(lat: float) -> float:
+    sin = math.sin(lat * math.pi / 180)
+    if sin >= 1:
+        return 0.0
+    if sin <= -1:
+        return 1.0
+    y = 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+    return min(max(y, 0.0), 1.0)
+
+
+def _x_lng(x: float) -> float:
+    return (x - 0.5) * 360
+
+
+def _y_lat(y: float) -> float:
+    y2 = (180 - y * 360) * math.pi / 180
+    return 360 * math.atan(math.exp(y2)) / math.pi - 90
+
+
+def _outranks(a: dict, b: dict) -> bool:
+    """True if feature properties a should be shown ahead of b."""
+    ra, rb = a.get("relevance", 5), b.get("relevance", 5)
+    if ra != rb:
+        return ra > rb
+    return a.get("rank", 1_000_000) < b.get("rank", 1_000_000)
+
+
+class _Node:
+    """A leaf point or a cluster at one zoom level of the pyramid."""
+
+    __slots__ = ("x", "y", "count", "top", "node_id", "children",
+                 "expansion_zoom", "feature")
+
+    def __init__(self, x, y, count, top, node_id, feature=None):
+        self.x = x
+        self.y = y
+        self.count = count
+        self.top = top              # properties of the top-ranked landmark
+        self.node_id = node_id
+        self.children = ()
+        self.expansion_zoom = None
+        self.feature = feature      # original GeoJSON feature (leaves only)
+
+
+class _Grid:
+    """Uniform grid over the unit square for radius and bbox queries."""
+
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.cells: dict[tuple[int, int], list[_Node]] = {}
+
+    def _key(self, x, y):
+        return int(x / self.cell), int(y / self.cell)
+
+    def insert(self, node: _Node) -> None:
+        self.cells.setdefault(self._key(node.x, node.y), []).append(node)
+
+    def range(self, minx, miny, maxx, maxy):
+        cx0, cy0 = self._key(minx, miny)
+        cx1, cy1 = self._key(maxx, maxy)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            candidates = (n for bucket in self.cells.values() for n in bucket)
+        else:
+            candidates = (
+                n
+                for cx in range(cx0, cx1 + 1)
+                for cy in range(cy0, cy1 + 1)
+                for n in self.cells.get((cx, cy), ())
+            )
+        for n in candidates:
+            if minx <= n.x <= maxx and miny <= n.y <= maxy:
+                yield n
+
+
+class ClusterIndex:
+    """
+    Precomputed cluster pyramid over a set of GeoJSON point features.
+
+    levels[z] holds the nodes visible at zoom z; levels[MAX_ZOOM + 1]
+    holds the raw leaves.
+    """
+
+    def __init__(self, features: list[dict], radius: int = RADIUS_PX,
+                 extent: int = EXTENT_PX, min_zoom: int = MIN_ZOOM,
+                 max_zoom: int = MAX_ZOOM, fingerprint: str = ""):
+        self.fingerprint = fingerprint
+        self.radius = radius
+        self.extent = extent
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.levels: dict[int, _Grid] = {}
+        self.nodes: dict[int, _Node] = {}
+        self._next_id = 0
+
+        t0 = time.perf_counter()
+        leaves = [self._leaf(f) for f in features]
+        self.levels[max_zoom + 1] = self._grid_for(leaves, max_zoom + 1)
+        current = leaves
+        for z in range(max_zoom, min_zoom - 1, -1):
+            current = self._cluster(current, z)
+            self.levels[z] = self._grid_for(current, z)
+        self.point_count = len(leaves)
+        self.build_ms = round((time.perf_counter() - t0) * 1000, 2)
+
+    # ── Build ───────────────────────────────────────────────────────
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _leaf(self, feature: dict) -> _Node:
+        lng, lat = feature["geometry"]["coordinates"][:2]
+        node = _Node(_lng_x(lng), _lat_y(lat), 1, feature.get("properties", {}),
+                     self._new_id(), feature)
+        self.nodes[node.node_id] = node
+        return node
+
+    def _grid_for(self, nodes: list[_Node], zoom: int) -> _Grid:
+        grid = _Grid(self.radius / (self.extent * 2 ** zoom))
+        for n in nodes:
+            grid.insert(n)
+        return grid
+
+    def _cluster(self, nodes: list[_Node], zoom: int) -> list[_Node]:
+        """Greedily merge nodes from zoom + 1 into clusters for zoom."""
+        r = self.radius / (self.extent * 2 ** zoom)
+        r2 = r * r
+        grid = _Grid(r)
+        for n in nodes:
+            grid.insert(n)
+
+        merged: set[int] = set()
+        out = []
+        for n in nodes:
+            if n.node_id in merged:
+                continue
+            merged.add(n.node_id)
+
+            neighbours = [
+                m for m in grid.range(n.x - r, n.y - r, n.x + r, n.y + r)
+                if m.node_id not in merged
+                and (m.x - n.x) ** 2 + (m.y - n.y) ** 2 <= r2
+            ]
+            if not neighbours:
+                out.append(n)
+                continue
+
+            count = n.count
+            wx, wy = n.x * n.count, n.y * n.count
+            top = n.top
+            for m in neighbours:
+                merged.add(m.node_id)
+                count += m.count
+                wx += m.x * m.count
+                wy += m.y * m.count
+                if _outranks(m.top, top):
+                    top = m.top
+
+            cluster = _Node(wx / count, wy / count, count, top, self._new_id())
+            cluster.children = tuple([n] + neighbours)
+            cluster.expansion_zoom = zoom + 1
+            self.nodes[cluster.node_id] = cluster
+            out.append(cluster)
+        return out
+
+    # ── Query ───────────────────────────────────────────────────────
+
+    def get_clusters(self, bbox: tuple[float, float, float, float], zoom: int) -> list[dict]:
+        """Return GeoJSON features (clusters + single points) inside bbox at zoom."""
+        west, south, east, north = bbox
+        if east - west >= 360:
+            west, east = -180, 180
+        elif west > east:
+            # Viewport crosses the antimeridian — query both halves.
+            return (self.get_clusters((west, south, 180, north), zoom)
+                    + self.get_clusters((-180, south, east, north), zoom))
+
+        z = max(self.min_zoom, min(int(zoom), self.max_zoom + 1))
+        grid = self.levels[z]
+        nodes = grid.range(_lng_x(west), _lat_y(north), _lng_x(east), _lat_y(south))
+        return [self._to_feature(n) for n in nodes]
+
+    def get_tile(self, z: int, x: int, y: int, extent: int = 4096,
+                 buffer: int = 64) -> list[tuple[int, int, int, dict]]:
+        """
+        Return (id, px, py, properties) for every node in tile z/x/y, with
+        px/py in tile-local coordinates [0, extent).  Low zooms return
+        clusters, so tile size stays bounded however large the catalog.
+        """
+        level = self.levels[max(self.min_zoom, min(z, self.max_zoom + 1))]
+        z2 = 2 ** z
+        pad = buffer / extent
+        out = []
+        for n in level.range((x - pad) / z2, (y - pad) / z2,
+                             (x + 1 + pad) / z2, (y + 1 + pad) / z2):
+            feature = self._to_feature(n)
+            out.append((
+                n.node_id,
+                round(extent * (n.x * z2 - x)),
+                round(extent * (n.y * z2 - y)),
+                feature["properties"],
+            ))
+        return out
+
+    def _to_feature(self, node: _Node) -> dict:
+        if node.feature is not None:
+            return node.feature
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [round(_x_lng(node.x), 6), round(_y_lat(node.y), 6)],
+            },
+            "properties": {
+                "cluster": True,
+                "cluster_id": node.node_id,
+                "point_count": node.count,
+                "expansion_zoom": node.expansion_zoom,
+                "top_landmark": {
+                    k: node.top.get(k)
+                    for k in ("id", "title", "book", "era", "rank", "relevance")
+                },
+            },
+        }
+
+    def get_leaves(self, cluster_id: int, limit: int = 10) -> list[dict]:
+        """Return up to `limit` original features under a cluster."""
+        node = self.nodes.get(cluster_id)
+        if node is None:
+            raise ValueError(f"Unknown cluster: {cluster_id}")
+        leaves, stack = [], [node]
+        while stack and len(leaves) < limit:
+            n = stack.pop()
+            if n.feature is not None:
+                leaves.append(n.feature)
+            else:
+                stack.extend(reversed(n.children))
+        return leaves
+
+
+# ── Process-wide pyramid over the landmark store ────────────────────
+
+_index_lock = threading.Lock()
+_index: ClusterIndex | None = None
+_index_version = -1
+
+
+def _rebuild(*_args) -> None:
+    """Rebuild the pyramid from the current landmark store snapshot."""
+    global _index, _index_version
+    version = landmark_store.version()
+    index = ClusterIndex(landmark_store.all_features(),
+                         fingerprint=landmark_store.fingerprint())
+    with _index_lock:
+        if version >= _index_version:
+            _index, _index_version = index, version
+
+
+def get_index() -> ClusterIndex:
+    """Return the current pyramid, building it on first use."""
+    if _index is None:
+        _rebuild()
+    return _index
+
+
+landmark_store.subscribe(_rebuild)
+
+
+def _parse_bbox(raw: str | None) -> tuple[float, float, float, float]:
+    if not raw:
+        return (-180.0, -85.0, 180.0, 85.0)
+    parts = [float(p) for p in raw.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be west,south,east,north")
+    return tuple(parts)
+
+
+@require_GET
+def clusters(request):
+    """
+    GET /clusters?zoom=3&bbox=-125,24,-66,50
+    GET /clusters?cluster_id=42&limit=10   (leaves of one cluster)
+
+    Returns a GeoJSON FeatureCollection of clusters and single landmarks
+    for the requested viewport.
+    """
+    t_start = time.perf_counter()
+    index = get_index()
+
+    cluster_id = request.GET.get("cluster_id")
+    if cluster_id:
+        try:
+            cluster_id, limit = int(cluster_id), int(request.GET.get("limit", 10))
+        except ValueError:
+            return JsonResponse({"error": "cluster_id and limit must be integers"}, status=400)
+        try:
+            leaves = index.get_leaves(cluster_id, limit)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=404)
+        return geojson_response(request, {"type": "FeatureCollection", "features": leaves},
+                                geojson_key=None)
+
+    try:
+        zoom = int(request.GET.get("zoom", 0))
+        bbox = _parse_bbox(request.GET.get("bbox"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    features = index.get_clusters(bbox, zoom)
+    total_ms = round((time.perf_counter() - t_start) * 1000, 2)
+
+    return geojson_response(request, {
+        "type": "FeatureCollection",
+        "features": features,
+        "zoom": zoom,
+        "point_count": index.point_count,
+        "version": _index_version,
+        "build_ms": index.build_ms,
+        "total_ms": total_ms,
+    }, geojson_key=None)
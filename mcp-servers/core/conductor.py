@@ -14,9 +14,12 @@ specialist best suited for it, coordinated by a single Conductor.
 """
 
 import json
+import math
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
@@ -26,9 +29,14 @@ from archivist.views import _archivist_lookup
 from librarian.views import _librarian_search
 from linguist.views import _linguist_dialect
 from stylist.views import _stylist_style
-from core.dedalus_client import dedalus_chat
+from core import circuit, executor, metrics, model_router, tracing
+from core.dedalus_client import cached_dedalus_chat
+from core.deferred import LLM_FIELDS, defer_field, parse_defer
 
 
+# Longest accepted deadline_ms; far past any worker timeout anyway.
+MAX_DEADLINE_MS = 10 * 60 * 1000
+
 CONDUCTOR_SYSTEM_PROMPT = (
     "You are the ConductorAgent, an AI orchestrator for a Living Literary Map. "
     "You have just received the combined output of three specialist agents: "
@@ -39,16 +47,59 @@ CONDUCTOR_SYSTEM_PROMPT = (
 )
 
 
+def _synthesis_prompt(results: dict) -> str:
+    """Build the synthesis user message from the specialist results."""
+    parts = []
+    if "archivist" in results:
+        a = results["archivist"]
+        parts.append(f"Location: {a.get('book', '')} — {a.get('historical_context', '')[:200]}")
+    if "linguist" in results:
+        slang_terms = ", ".join(
+            s["term"] for s in results["linguist"].get("slang", [])[:3]
+        )
+        parts.append(f"Language of the era: {slang_terms}")
+    if "stylist" in results:
+        s = results["stylist"]
+        parts.append(f"Visual vibe: {s.get('label', '')} ({s.get('accent_color', '')})")
+
+    return "\n".join(parts) + "\n\nSynthesize into one vivid 2-sentence narrative."
+
+
+AGENT_TOOLS = {
+    "ArchivistAgent": "get_historical_context",
+    "LinguistAgent": "analyze_period_dialect",
+    "StylistAgent": "generate_map_style",
+}
+
+
 def _timed_call(name, fn, *args):
-    """Execute fn(*args) and return (name, result, elapsed_ms)."""
+    """Execute fn(*args) and return (name, result, elapsed_ms, error)."""
     t0 = time.perf_counter()
+    with tracing.span(f"{name}.{AGENT_TOOLS[name]}", agent=name) as span:
+        try:
+            result = fn(*args)
+            elapsed = round((time.perf_counter() - t0) * 1000)
+            return name, result, elapsed, None
+        except Exception as exc:
+            span.fail(exc)
+            elapsed = round((time.perf_counter() - t0) * 1000)
+            return name, None, elapsed, str(exc)
+
+
+def _partial_result(key, landmark_id, era, feature_data):
+    """
+    What an agent that missed the deadline can return without waiting:
+    its curated data, with each LLM field taken from cache or handed out
+    as a deferred handle.  None if even that would need Dedalus.
+    """
     try:
-        result = fn(*args)
-        elapsed = round((time.perf_counter() - t0) * 1000)
-        return name, result, elapsed, None
-    except Exception as exc:
-        elapsed = round((time.perf_counter() - t0) * 1000)
-        return name, None, elapsed, str(exc)
+        if key == "archivist":
+            return _archivist_lookup(landmark_id, feature_data, LLM_FIELDS)
+        if key == "linguist":
+            return _linguist_dialect(era, LLM_FIELDS, generate=False)
+        return _stylist_style(era, LLM_FIELDS)
+    except Exception:
+        return None
 
 
 @csrf_exempt
@@ -61,6 +112,23 @@ def orchestrate(request):
        OR { "landmark_id": "hr-harlem", "era": "1920s" }
        OR { "action": "search", "query": "joy luck club", "limit": 10 }
 
+    Optional "mode": "fanout" (default) runs each agent's LLM call in
+    parallel then synthesises; "fused" asks for everything in a single
+    structured completion (see core/fused.py).
+
+    Optional "defer" / "fields" select which LLM fields (ai_insight,
+    ai_blurb, ai_suggestion, synthesis) to wait for; deferred ones come
+    back as handles under "deferred" (see core/deferred.py).
+
+    Optional "deadline_ms" (default ORCHESTRATE_DEADLINE_MS) is a latency
+    budget.  Agents still running at the deadline are reported with
+    status "timeout" and contribute their curated data, while their
+    LLM calls finish in the background and fill the cache.  Synthesis is
+    skipped (and generated for next time) when less than
+    SYNTHESIS_MIN_BUDGET_MS remains.
+
+    Requests that defer anything or set a deadline use the fan-out path.
+
     Returns a unified response with delegation timeline.
     """
     t_start = time.perf_counter()
@@ -87,31 +155,36 @@ def orchestrate(request):
         try:
             result = _librarian_search(query, limit=limit)
             elapsed = round((time.perf_counter() - t0) * 1000)
+            timeline = [{
+                "agent": "LibrarianAgent",
+                "tool": "search_books",
+                "status": "degraded" if result.get("degraded") else "success",
+                "elapsed_ms": elapsed,
+            }]
+            metrics.observe_timeline(timeline)
             total = round((time.perf_counter() - t_start) * 1000)
             return JsonResponse({
                 "librarian": result,
-                "timeline": [{
-                    "agent": "LibrarianAgent",
-                    "tool": "search_books",
-                    "status": "success",
-                    "elapsed_ms": elapsed,
-                }],
+                "timeline": timeline,
                 "total_ms": total,
             })
         except Exception as exc:
             elapsed = round((time.perf_counter() - t0) * 1000)
+            circuit_open = isinstance(exc, circuit.CircuitOpen)
+            timeline = [{
+                "agent": "LibrarianAgent",
+                "tool": "search_books",
+                "status": "circuit_open" if circuit_open else "error",
+                "elapsed_ms": elapsed,
+                "error": str(exc),
+            }]
+            metrics.observe_timeline(timeline)
             total = round((time.perf_counter() - t_start) * 1000)
             return JsonResponse({
                 "error": str(exc),
-                "timeline": [{
-                    "agent": "LibrarianAgent",
-                    "tool": "search_books",
-                    "status": "error",
-                    "elapsed_ms": elapsed,
-                    "error": str(exc),
-                }],
+                "timeline": timeline,
                 "total_ms": total,
-            }, status=502)
+            }, status=503 if circuit_open else 502)
 
     # If we have a landmark_id, infer the era from the knowledge base
     if landmark_id and not era:
@@ -126,76 +199,180 @@ def orchestrate(request):
             {"error": "Provide at least landmark_id or era"}, status=400
         )
 
+    try:
+        defer = parse_defer(body)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    deadline_ms = body.get("deadline_ms", settings.ORCHESTRATE_DEADLINE_MS)
+    if (not isinstance(deadline_ms, (int, float)) or isinstance(deadline_ms, bool)
+            or not math.isfinite(deadline_ms) or not 0 <= deadline_ms <= MAX_DEADLINE_MS):
+        return JsonResponse(
+            {"error": f"deadline_ms must be a number between 0 and {MAX_DEADLINE_MS}"}, status=400
+        )
+    deadline = t_start + deadline_ms / 1000 if deadline_ms else None
+
+    def _remaining():
+        """Seconds left of the budget, or None if there is no deadline."""
+        return None if deadline is None else max(0.0, deadline - time.perf_counter())
+
+    # ── Fused mode — one structured completion instead of a fan-out ──
+    if not defer and deadline is None and body.get("mode", settings.ORCHESTRATE_MODE) == "fused":
+        from core.fused import fused_orchestrate
+
+        try:
+            with tracing.span("ConductorAgent.fused_orchestrate"):
+                result = executor.bulkhead("synthesis").run(
+                    fused_orchestrate, landmark_id, era, feature_data
+                )
+        except executor.BulkheadFull as e:
+            return JsonResponse({"error": str(e)}, status=503)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=404)
+        degraded = circuit.degraded()
+        if "dedalus" in degraded:
+            for entry in result["timeline"]:
+                entry["degraded"] = True
+            result["degraded"] = degraded
+        metrics.observe_timeline(result["timeline"])
+        result["total_ms"] = round((time.perf_counter() - t_start) * 1000)
+        return JsonResponse(result)
+
     # ── Fan out to specialist agents in parallel ────────────────────
+    # Each agent runs in its own process-wide bulkhead (core/executor.py);
+    # a full bulkhead rejects the call immediately rather than queueing.
     timeline = []
     results = {}
+    calls = []
+    if landmark_id:
+        calls.append(("archivist", "ArchivistAgent", _archivist_lookup, (landmark_id, feature_data, defer)))
+    if era:
+        calls.append(("linguist", "LinguistAgent", _linguist_dialect, (era, defer)))
+        calls.append(("stylist", "StylistAgent", _stylist_style, (era, defer)))
+
     futures = {}
+    llm_calls = {}
+    t_fanout = time.perf_counter()
+    for key, name, fn, args in calls:
+        # The bulkhead runs the call in a copy of this context, so the
+        # agent's Dedalus calls are recorded in llm_calls[key].
+        with model_router.collect() as llm_calls[key]:
+            try:
+                futures[key] = executor.bulkhead(key).submit(_timed_call, name, fn, *args)
+            except executor.BulkheadFull as exc:
+                futures[key] = exc
 
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        if landmark_id:
-            futures["archivist"] = pool.submit(
-                _timed_call, "ArchivistAgent", _archivist_lookup, landmark_id, feature_data
-            )
-        if era:
-            futures["linguist"] = pool.submit(
-                _timed_call, "LinguistAgent", _linguist_dialect, era
-            )
-            futures["stylist"] = pool.submit(
-                _timed_call, "StylistAgent", _stylist_style, era
-            )
-
-        for key, future in futures.items():
-            name, result, elapsed, error = future.result()
+    for key, name, _fn, _args in calls:
+        future = futures[key]
+        if isinstance(future, executor.BulkheadFull):
             timeline.append({
                 "agent": name,
-                "tool": {
-                    "ArchivistAgent": "get_historical_context",
-                    "LinguistAgent": "analyze_period_dialect",
-                    "StylistAgent": "generate_map_style",
-                }.get(name, "unknown"),
+                "tool": AGENT_TOOLS[name],
+                "status": "rejected",
+                "elapsed_ms": 0,
+                "queue_ms": 0,
+                "error": str(future),
+            })
+            continue
+
+        try:
+            name, result, elapsed, error = future.result(timeout=_remaining())
+        except FutureTimeout:
+            # Keeps running in its bulkhead; its LLM output lands in the cache.
+            result = _partial_result(key, landmark_id, era, feature_data)
+            timeline.append({
+                "agent": name,
+                "tool": AGENT_TOOLS[name],
+                "status": "timeout",
+                "elapsed_ms": round((time.perf_counter() - t_fanout) * 1000),
+                "queue_ms": future.timing["queue_ms"],
+                "error": None,
+                "partial": result is not None,
+                "llm": list(llm_calls[key]),
+            })
+        else:
+            timeline.append({
+                "agent": name,
+                "tool": AGENT_TOOLS[name],
                 "status": "success" if error is None else "error",
                 "elapsed_ms": elapsed,
+                "queue_ms": future.timing["queue_ms"],
                 "error": error,
+                "llm": list(llm_calls[key]),
             })
-            if result is not None:
-                results[key] = result
+        if result is not None:
+            results[key] = result
 
     # ── Conductor synthesis — tie it all together ───────────────────
-    synthesis = None
+    response = {
+        "archivist": results.get("archivist"),
+        "linguist": results.get("linguist"),
+        "stylist": results.get("stylist"),
+        "synthesis": None,
+    }
     synth_ms = 0
+    synth_queue_ms = 0
+    synth_error = None
+    synth_status = "skipped"
+    synth_llm = []
     if results:
-        parts = []
-        if "archivist" in results:
-            a = results["archivist"]
-            parts.append(f"Location: {a.get('book', '')} — {a.get('historical_context', '')[:200]}")
-        if "linguist" in results:
-            slang_terms = ", ".join(
-                s["term"] for s in results["linguist"].get("slang", [])[:3]
-            )
-            parts.append(f"Language of the era: {slang_terms}")
-        if "stylist" in results:
-            s = results["stylist"]
-            parts.append(f"Visual vibe: {s.get('label', '')} ({s.get('accent_color', '')})")
-
-        synth_prompt = "\n".join(parts) + "\n\nSynthesize into one vivid 2-sentence narrative."
+        synth_prompt = _synthesis_prompt(results)
+        remaining = _remaining()
         t0 = time.perf_counter()
-        synthesis = dedalus_chat(CONDUCTOR_SYSTEM_PROMPT, synth_prompt)
-        synth_ms = round((time.perf_counter() - t0) * 1000)
+        if defer and "synthesis" in defer:
+            defer_field(response, "synthesis", CONDUCTOR_SYSTEM_PROMPT, synth_prompt, task="synthesis")
+            synth_status = "deferred" if "deferred" in response else "success"
+        elif remaining is not None and remaining * 1000 < settings.SYNTHESIS_MIN_BUDGET_MS:
+            # Not worth starting — serve it from cache or generate it for
+            # next time instead.
+            defer_field(response, "synthesis", CONDUCTOR_SYSTEM_PROMPT, synth_prompt, task="synthesis")
+            if "deferred" in response:
+                synth_error = f"Skipped: {round(remaining * 1000)} ms of budget left"
+            else:
+                synth_status = "success"
+        else:
+            try:
+                with tracing.span("ConductorAgent.synthesize_narrative"):
+                    with model_router.collect() as synth_llm:
+                        future = executor.bulkhead("synthesis").submit(
+                            partial(cached_dedalus_chat, task="synthesis"),
+                            CONDUCTOR_SYSTEM_PROMPT, synth_prompt,
+                        )
+                    response["synthesis"] = future.result(timeout=remaining)
+                synth_status = "success" if response["synthesis"] else "skipped"
+            except executor.BulkheadFull as exc:
+                synth_error = str(exc)
+                synth_status = "rejected"
+            except FutureTimeout:
+                # Coalesces with the still-running call (see cached_dedalus_chat).
+                defer_field(response, "synthesis", CONDUCTOR_SYSTEM_PROMPT, synth_prompt,
+                            task="synthesis")
+                synth_status = "timeout"
+            else:
+                synth_queue_ms = future.timing["queue_ms"]
+        synth_ms = round((time.perf_counter() - t0) * 1000) - synth_queue_ms
 
     timeline.append({
         "agent": "ConductorAgent",
         "tool": "synthesize_narrative",
-        "status": "success" if synthesis else "skipped",
+        "status": synth_status,
         "elapsed_ms": synth_ms,
+        "queue_ms": synth_queue_ms,
+        "error": synth_error,
+        "llm": list(synth_llm),
     })
 
-    total_ms = round((time.perf_counter() - t_start) * 1000)
+    # While Dedalus' circuit is open every LLM field above is a fallback;
+    # flag the entries so the UI can say it is showing curated data only.
+    degraded = circuit.degraded()
+    if "dedalus" in degraded:
+        for entry in timeline:
+            entry["degraded"] = True
+        response["degraded"] = degraded
 
-    return JsonResponse({
-        "archivist": results.get("archivist"),
-        "linguist": results.get("linguist"),
-        "stylist": results.get("stylist"),
-        "synthesis": synthesis,
-        "timeline": timeline,
-        "total_ms": total_ms,
-    })
+    metrics.observe_timeline(timeline)
+    response["timeline"] = timeline
+    if deadline is not None:
+        response["deadline_ms"] = deadline_ms
+    response["total_ms"] = round((time.perf_counter() - t_start) * 1000)
+    return JsonResponse(response)
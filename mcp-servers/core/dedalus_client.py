@@ -4,10 +4,42 @@ Shared Dedalus Labs client used by all three MCP agents.
 Uses the OpenAI-compatible chat completions endpoint with your
 Dedalus API key.  Every agent calls `dedalus_chat()` to enrich
 its response with LLM-generated context.
+
+`cached_dedalus_chat()` wraps it with Django's cache, keyed on the
+exact prompt, so identical enrichment requests are answered locally.
+Concurrent misses for the same prompt are coalesced into one upstream
+call — e.g. an agent that outlived its /orchestrate deadline and the
+background job filling its deferred field.
+
+Each call first takes a slot from the LLM scheduler
+(core/llm_scheduler.py), which shares concurrency and the token budget
+between interactive, background and bulk work.  It then goes through the
+"dedalus" circuit breaker (core/circuit.py): while that is open,
+dedalus_chat() returns a fallback string immediately and agents serve
+their curated or cached data.
+
+Passing task= routes the call through core/model_router.py, which picks
+the model tier, timeout and max_tokens for that task and falls back to a
+faster tier while the preferred model is slow.
+
+Completions, the token counts from Dedalus' `usage` field and cache hits
+are counted in core/metrics.py, and traced as spans (core/tracing.py).
 """
 
-import httpx
+import hashlib
+import threading
+import time
+
 from django.conf import settings
+from django.core.cache import cache
+
+from core import circuit, llm_scheduler, metrics, model_router, tracing
+
+
+FALLBACK_PREFIX = "(Dedalus"
+
+_inflight: dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
 
 
 def dedalus_chat(
@@ -15,37 +47,212 @@ def dedalus_chat(
     user_message: str,
     model: str | None = None,
     max_tokens: int = 512,
+    timeout: float | None = None,
+    task: str | None = None,
 ) -> str:
     """
     Send a chat completion request to Dedalus Labs.
 
     Returns the assistant's response text, or a fallback string
-    if the API key is missing or the call fails.
+    if the API key is missing or the call fails.  timeout defaults to
+    settings.DEDALUS_TIMEOUT seconds.
+
+    With a task, the model router supplies the model and timeout (unless
+    given explicitly) and the task's max_tokens cap, if it has one.
+    """
+    return dedalus_completion(system_prompt, user_message, model, max_tokens, timeout, task)["text"]
+
+
+def dedalus_completion(
+    system_prompt: str,
+    user_message: str,
+    model: str | None = None,
+    max_tokens: int = 512,
+    timeout: float | None = None,
+    task: str | None = None,
+) -> dict:
+    """
+    dedalus_chat(), returning {"text", "finish_reason"}.
+
+    finish_reason is Dedalus' ("stop", "length", ...) — "length" means
+    the reply was cut off at max_tokens — or None with a fallback text.
     """
     api_key = settings.DEDALUS_API_KEY
     if not api_key:
-        return "(Dedalus API key not configured — using static data only)"
+        return {"text": "(Dedalus API key not configured — using static data only)", "finish_reason": None}
 
+    tier = None
+    if task is not None:
+        router = model_router.get_router()
+        tier, tier_config, route_max_tokens = router.route(task)
+        model = model or tier_config["model"]
+        timeout = tier_config["timeout"] if timeout is None else timeout
+        max_tokens = route_max_tokens or max_tokens
     model = model or settings.DEDALUS_MODEL
 
+    with tracing.span("dedalus.completion", task=task, tier=tier, model=model,
+                      max_tokens=max_tokens) as span:
+        scheduler = llm_scheduler.get_scheduler()
+        priority = llm_scheduler.current_priority()
+        with tracing.span("llm_scheduler.acquire", priority=priority):
+            ticket = scheduler.acquire(
+                priority,
+                llm_scheduler.estimate_tokens(system_prompt, user_message, max_tokens=max_tokens),
+            )
+        if ticket is None:
+            span.fail("no scheduler slot")
+            return {"text": "(Dedalus busy — waited too long for a slot, using static data only)",
+                    "finish_reason": None}
+
+        text, finish_reason, usage = None, None, None
+        t0 = time.perf_counter()
+        try:
+            text, finish_reason, usage = _call_dedalus(
+                api_key, model, system_prompt, user_message, max_tokens, timeout
+            )
+            return {"text": text, "finish_reason": finish_reason}
+        finally:
+            scheduler.release(ticket, (usage or {}).get("total_tokens"))
+            ok = not is_fallback(text)
+            metrics.record_completion(task, model, ok, usage)
+            span.set("finish_reason", finish_reason)
+            span.set("prompt_tokens", (usage or {}).get("prompt_tokens"))
+            span.set("completion_tokens", (usage or {}).get("completion_tokens"))
+            if not ok:
+                span.fail(text or "no reply")
+            if tier is not None:
+                latency_ms = (time.perf_counter() - t0) * 1000
+                # Quick failures (open circuit, 4xx) say nothing about the
+                # model's speed; slow ones (timeouts) do.
+                if ok or latency_ms >= tier_config["slow_ms"]:
+                    router.record(model, latency_ms)
+                model_router.note_call(task, tier, model, latency_ms, ok)
+
+
+def _call_dedalus(api_key: str, model: str, system_prompt: str, user_message: str,
+                  max_tokens: int, timeout: float | None) -> tuple[str, str | None, dict | None]:
+    """One completion behind the circuit breaker: (text, finish reason, usage)."""
+    import httpx  # deferred to the first call: it is slow to import
+
+    breaker = circuit.breaker("dedalus")
+    permit = breaker.allow()
+    if permit is None:
+        return "(Dedalus circuit open — using static and cached data only)", None, None
+
+    t0 = time.perf_counter()
+    healthy = False
+    with tracing.span("dedalus.request", "CLIENT", **{"server.address": settings.DEDALUS_BASE_URL}) as span:
+        try:
+            resp = httpx.post(
+                f"{settings.DEDALUS_BASE_URL}/v1/chat/completions",
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}",
+                },
+                json={
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_message},
+                    ],
+                    "max_tokens": max_tokens,
+                },
+                timeout=settings.DEDALUS_TIMEOUT if timeout is None else timeout,
+            )
+            span.set("http.response.status_code", resp.status_code)
+            # Client errors are our fault, not a sign of an unhealthy upstream
+            healthy = resp.status_code < 500 and resp.status_code != 429
+            resp.raise_for_status()
+            data = resp.json()
+            choice = data["choices"][0]
+            return (
+                choice["message"]["content"],
+                choice.get("finish_reason"),
+                data.get("usage"),
+            )
+        except Exception as exc:
+            span.fail(exc)
+            return f"(Dedalus call failed: {exc})", None, None
+        finally:
+            breaker.record(healthy, (time.perf_counter() - t0) * 1000, permit)
+
+
+def is_fallback(text: str | None) -> bool:
+    """True if text is one of dedalus_chat()'s placeholder strings."""
+    return not text or text.startswith(FALLBACK_PREFIX)
+
+
+def get_cached_completion(system_prompt: str, user_message: str, model: str | None = None,
+                          max_tokens: int = 512) -> str | None:
+    """Return a cached completion without calling Dedalus, or None on a miss."""
+    with tracing.span("cache.get", cache="llm") as span:
+        text = cache.get(llm_cache_key(system_prompt, user_message, model, max_tokens))
+        span.set("hit", text is not None)
+    metrics.cache_lookup("llm", text is not None)
+    return text
+
+
+def llm_cache_key(system_prompt: str, user_message: str, model: str | None = None,
+                  max_tokens: int = 512) -> str:
+    """Cache key for one exact completion request."""
+    model = model or settings.DEDALUS_MODEL
+    digest = hashlib.sha1(
+        "\x1f".join((model, str(max_tokens), system_prompt, user_message)).encode("utf-8")
+    ).hexdigest()
+    return f"llm:{digest}"
+
+
+def cached_dedalus_chat(
+    system_prompt: str,
+    user_message: str,
+    model: str | None = None,
+    max_tokens: int = 512,
+    ttl: int | None = None,
+    timeout: float | None = None,
+    task: str | None = None,
+) -> str:
+    """
+    dedalus_chat() behind Django's cache.
+
+    Successful responses are cached for `ttl` seconds (default
+    settings.ENRICHMENT_CACHE_TTL); fallback strings are never cached so
+    a transient failure doesn't stick.  If the same completion is already
+    being fetched in this process, wait for it instead of calling again.
+
+    The cache key uses the caller's model and max_tokens, not the routed
+    ones, so a task's entries stay put when its route changes.
+    """
+    key = llm_cache_key(system_prompt, user_message, model, max_tokens)
+    with tracing.span("cache.get", cache="llm") as span:
+        text = cache.get(key)
+        span.set("hit", text is not None)
+    metrics.cache_lookup("llm", text is not None)
+    if text is not None:
+        return text
+
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = _inflight[key] = threading.Event()
+
+    if not leader:
+        with tracing.span("llm.wait_coalesced"):
+            event.wait(settings.DEDALUS_TIMEOUT if timeout is None else timeout)
+        text = cache.get(key)
+        if text is not None:
+            return text
+        # The first caller failed — try once ourselves.
+        return dedalus_chat(system_prompt, user_message, model=model,
+                            max_tokens=max_tokens, timeout=timeout, task=task)
+
     try:
-        resp = httpx.post(
-            f"{settings.DEDALUS_BASE_URL}/v1/chat/completions",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-            },
-            json={
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                "max_tokens": max_tokens,
-            },
-            timeout=30.0,
-        )
-        resp.raise_for_status()
-        return resp.json()["choices"][0]["message"]["content"]
-    except Exception as exc:
-        return f"(Dedalus call failed: {exc})"
+        text = dedalus_chat(system_prompt, user_message, model=model,
+                            max_tokens=max_tokens, timeout=timeout, task=task)
+        if not is_fallback(text):
+            cache.set(key, text, settings.ENRICHMENT_CACHE_TTL if ttl is None else ttl)
+        return text
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        event.set()
@@ -0,0 +1,134 @@
+"""
+Deferred LLM fields — let a click return before its enrichment does.
+
+/orchestrate and the tool endpoints accept either
+
+    "defer":  ["ai_insight", "synthesis"]   (or true / "all")
+    "fields": ["ai_blurb"]                  (LLM fields to wait for)
+
+A deferred field that is already cached is returned inline.  Otherwise
+it comes back as null with a handle under the result's "deferred" map,
+
+    "ai_insight": null,
+    "deferred": {"ai_insight": "/enrichment/<handle>"}
+
+and the completion is generated in the background (core/background.py).
+The client polls GET /enrichment/<handle>: 200 with the value once it is
+ready, 202 while it is still being generated.
+
+Handles are the digest of the completion's cache key, so every client
+asking for the same text shares one handle and one upstream call.  With
+more than one worker, CACHE_BACKEND must be shared for handles to
+resolve on any of them; render.yaml uses the file-based cache under
+var/cache for that.
+"""
+
+import re
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from core import background, metrics, tracing
+from core.dedalus_client import cached_dedalus_chat, llm_cache_key
+from core.http_cache import enrichment_response
+
+
+LLM_FIELDS = frozenset({"ai_insight", "ai_blurb", "ai_suggestion", "synthesis"})
+
+_PENDING_PREFIX = "deferred:"
+_HANDLE_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def _as_set(value, name: str) -> set[str]:
+    if isinstance(value, str):
+        return {v.strip() for v in value.split(",") if v.strip()}
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return set(value)
+    raise ValueError(f"{name} must be a list of field names")
+
+
+def parse_defer(body: dict) -> frozenset[str] | None:
+    """
+    The set of LLM fields to defer, from a request body's "defer" and/or
+    "fields" keys.  None if the request specifies neither, so each agent
+    keeps its own default.  Raises ValueError on a malformed value.
+    """
+    defer = body.get("defer")
+    fields = body.get("fields")
+    if defer is None and fields is None:
+        return None
+
+    deferred: set[str] = set()
+    if defer is True or defer == "all":
+        deferred |= LLM_FIELDS
+    elif defer:
+        deferred |= _as_set(defer, "defer")
+    if fields is not None:
+        deferred |= LLM_FIELDS - _as_set(fields, "fields")
+    return frozenset(deferred & LLM_FIELDS)
+
+
+def _schedule(key: str, system_prompt: str, user_message: str, max_tokens: int,
+              task: str | None) -> None:
+    fill = partial(cached_dedalus_chat, max_tokens=max_tokens, task=task)
+    background.submit(key, fill, system_prompt, user_message)
+
+
+def defer_field(result: dict, field: str, system_prompt: str, user_message: str,
+                max_tokens: int = 512, task: str | None = None) -> dict:
+    """
+    Fill result[field] from the LLM cache without waiting on Dedalus.
+
+    On a miss the field is set to None, its handle URL is added to
+    result["deferred"], and the completion is scheduled in the background.
+    """
+    key = llm_cache_key(system_prompt, user_message, max_tokens=max_tokens)
+    with tracing.span("cache.get", cache="deferred") as span:
+        text = cache.get(key)
+        span.set("hit", text is not None)
+    metrics.cache_lookup("deferred", text is not None)
+    result[field] = text
+    if text is None:
+        handle = key.split(":", 1)[1]
+        cache.set(
+            _PENDING_PREFIX + handle,
+            (system_prompt, user_message, max_tokens, task),
+            settings.DEFERRED_HANDLE_TTL,
+        )
+        _schedule(key, system_prompt, user_message, max_tokens, task)
+        result.setdefault("deferred", {})[field] = f"/enrichment/{handle}"
+    return result
+
+
+@require_GET
+def enrichment(request, handle: str):
+    """
+    GET /enrichment/<handle>
+
+    200 { "handle": "...", "status": "ready", "value": "..." }
+    202 { "handle": "...", "status": "pending" } — retry after Retry-After
+    404 if the handle is unknown or has expired.
+    """
+    if not _HANDLE_RE.fullmatch(handle):
+        return JsonResponse({"error": "Invalid handle"}, status=400)
+
+    text = cache.get(f"llm:{handle}")
+    if text is not None:
+        return enrichment_response(request, {"handle": handle, "status": "ready", "value": text})
+
+    pending = cache.get(_PENDING_PREFIX + handle)
+    if pending is None:
+        return JsonResponse({"error": "Unknown or expired handle"}, status=404)
+
+    # Re-schedule in case the earlier attempt failed (fallbacks aren't
+    # cached); background.submit() ignores it if still in flight.
+    system_prompt, user_message, max_tokens, task = pending
+    _schedule(f"llm:{handle}", system_prompt, user_message, max_tokens, task)
+
+    response = JsonResponse({"handle": handle, "status": "pending"}, status=202)
+    response["Retry-After"] = "1"
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,51 @@
+"""
+Era helpers shared by the Linguist and Stylist agents.
+
+LLM-extracted features describe the same period in many ways ("1925",
+"1920's", "1920s", "the 1920s").  normalize_era() folds them into one
+canonical decade key so curated data, caches and the generated-era
+registry all agree.
+"""
+
+import re
+
+
+_DECADE_RE = re.compile(r"^(?:the\s+)?(?:c\.\s*|circa\s+)?(\d{3,4})\s*(?:'?s)?$")
+_CENTURY_RE = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)\s+century$")
+_CANONICAL_RE = re.compile(r"^(\d{3,4})s$")
+
+
+def normalize_era(era: str) -> str:
+    """
+    Map an era string to a canonical key.
+
+    "1925", "1920's", "1920s", "The 1920S" -> "1920s"
+    "1170"                                  -> "1170s"
+    "19th century"                          -> "1800s"
+    anything else                           -> stripped, lower-cased input
+    """
+    raw = (era or "").strip()
+    text = raw.lower().replace("’", "'")
+
+    m = _DECADE_RE.match(text)
+    if m:
+        year = int(m.group(1))
+        return f"{year - year % 10}s"
+
+    m = _CENTURY_RE.match(text)
+    if m:
+        return f"{(int(m.group(1)) - 1) * 100}s"
+
+    return text
+
+
+def is_canonical_era(era_key: str) -> bool:
+    """True for a decade key normalize_era() produced from a year or
+    century ("1920s", "1800s"), False for free text it passed through."""
+    return _CANONICAL_RE.match(era_key or "") is not None
+
+
+def era_start_year(era: str) -> int | None:
+    """First year of a canonical era key ("1920s" -> 1920), or None."""
+    m = _CANONICAL_RE.match(normalize_era(era))
+    return int(m.group(1)) if m else None
@@ -0,0 +1,116 @@
+"""
+Process-wide agent executor with per-agent bulkheads.
+
+Instead of a ThreadPoolExecutor per /orchestrate request, every agent
+call on the synchronous path runs in one of a few long-lived pools —
+one bulkhead per kind of work (archivist, linguist, stylist, synthesis,
+extraction).  Each bulkhead has its own thread limit, so one slow agent
+can only exhaust its own threads, and a bounded queue: once
+max_concurrent calls are running and max_queue more are waiting, new
+work is rejected immediately with BulkheadFull instead of piling up
+behind a stalled upstream.
+
+Sizes come from settings.AGENT_BULKHEADS.  Each submitted call records
+how long it waited in the queue so the conductor can show queue_ms in
+its timeline.  Calls made for a profiled request are profiled in the
+worker thread too (core/profiling.py).
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+
+from core import profiling
+
+
+class BulkheadFull(Exception):
+    """Raised when a bulkhead's queue is full; the caller should fail fast."""
+
+
+class Bulkhead:
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix=f"agent-{name}",
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Run fn(*args) on this bulkhead.  The returned future resolves to
+        fn's result; future.timing["queue_ms"] is set once it has started.
+        Raises BulkheadFull if the queue is already at max_queue.
+        """
+        with self._lock:
+            if self._running + self._queued >= self.max_concurrent + self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull(
+                    f"{self.name} bulkhead full "
+                    f"({self._running} running, {self._queued} queued)"
+                )
+            self._queued += 1
+
+        submitted = time.perf_counter()
+        timing = {"queue_ms": None}
+
+        def _run():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            timing["queue_ms"] = round((started - submitted) * 1000)
+            try:
+                with profiling.thread_profile():
+                    return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        # Carry the caller's context (e.g. its LLM priority class) into the worker.
+        future = self._executor.submit(contextvars.copy_context().run, _run)
+        future.timing = timing
+        return future
+
+    def run(self, fn, *args):
+        """Submit and wait — for callers that only need the bulkhead's limits."""
+        return self.submit(fn, *args).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._queued,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+            }
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+_lock = threading.Lock()
+
+
+def bulkhead(name: str) -> Bulkhead:
+    """The process-wide bulkhead for name, created on first use."""
+    bh = _bulkheads.get(name)
+    if bh is None:
+        with _lock:
+            bh = _bulkheads.get(name)
+            if bh is None:
+                config = settings.AGENT_BULKHEADS[name]
+                bh = _bulkheads[name] = Bulkhead(
+                    name, config["max_concurrent"], config["max_queue"],
+                )
+    return bh
+
+
+def stats() -> dict:
+    return {name: bh.stats() for name, bh in sorted(_bulkheads.items())}
@@ -0,0 +1,212 @@
+"""
+Fused orchestration — every LLM field of /orchestrate in one completion.
+
+The fan-out path makes up to four Dedalus calls per click (archivist
+insight, dialect blurb, style suggestion, then synthesis).  In fused
+mode the Conductor assembles the curated parts locally, asks for all of
+the enrichment in a single structured-output request, and parses the
+JSON back into the usual response shape.
+
+Each field is also written into the per-agent LLM cache under the key
+the fan-out path would use, so the two modes warm each other.
+"""
+
+import json
+import re
+import time
+
+from django.core.cache import cache
+from django.conf import settings
+
+from archivist.views import ARCHIVIST_SYSTEM_PROMPT, _archivist_curated, _insight_prompt
+from core import model_router
+from core.conductor import CONDUCTOR_SYSTEM_PROMPT, _synthesis_prompt
+from core.dedalus_client import (
+    cached_dedalus_chat,
+    get_cached_completion,
+    is_fallback,
+    llm_cache_key,
+)
+from core.eras import normalize_era
+from linguist import era_registry
+from linguist.views import LINGUIST_SYSTEM_PROMPT, _blurb_prompt, _linguist_curated
+from stylist.views import STYLIST_SYSTEM_PROMPT, _stylist_curated, _suggestion_prompt
+
+
+FUSED_SYSTEM_PROMPT = (
+    "You are the ConductorAgent for a Living Literary Map, answering for "
+    "all of your specialist agents at once.  You receive the curated data "
+    "for a map click and a list of REQUESTED fields.  Fill in only those "
+    "fields:\n"
+    "- archivist_insight: 2–3 sentence enriched historical insight about "
+    "the quote and place, for a student or museum visitor.\n"
+    "- dialect_profile: {\"era_label\": str, \"slang\": [{\"term\": str, "
+    "\"meaning\": str}] (3-5 items), \"dialect_notes\": str} for the era.\n"
+    "- dialect_blurb: fun 2-sentence 'Did You Know?' about how one of the "
+    "era's slang terms entered mainstream English.\n"
+    "- style_suggestion: one creative CSS/visual tweak (animation, "
+    "gradient, or texture) in 1–2 sentences for the era's palette.\n"
+    "- synthesis: one vivid, poetic but factual 2-sentence narrative tying "
+    "the location, language and visual atmosphere together.\n"
+    "Return ONLY a JSON object whose keys are the requested fields."
+)
+
+FUSED_MAX_TOKENS = 900
+
+
+def _parse(raw: str) -> dict:
+    match = re.search(r"\{.*\}", raw or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group())
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _store(system_prompt: str, user_msg: str, value) -> None:
+    """Share a fused field with the fan-out path's cache entry."""
+    if isinstance(value, str) and value and not is_fallback(value):
+        cache.set(llm_cache_key(system_prompt, user_msg), value, settings.ENRICHMENT_CACHE_TTL)
+
+
+def fused_orchestrate(landmark_id: str | None, era: str | None, feature_data: dict | None) -> dict:
+    """
+    Build the /orchestrate response with at most one Dedalus call.
+    Raises ValueError for an unknown landmark without feature_data.
+    """
+    t0 = time.perf_counter()
+    archivist = linguist = stylist = None
+    requested: list[str] = []
+    sections: list[str] = []
+    prompts: dict[str, tuple[str, str]] = {}
+
+    # ── Curated / local parts (no LLM) ──────────────────────────────
+    if landmark_id:
+        curated = _archivist_curated(landmark_id, feature_data)
+        archivist = {k: v for k, v in curated.items() if k != "era"}
+        prompts["archivist_insight"] = (ARCHIVIST_SYSTEM_PROMPT, _insight_prompt(curated))
+        archivist["ai_insight"] = get_cached_completion(*prompts["archivist_insight"])
+        sections.append("[Archivist]\n" + prompts["archivist_insight"][1])
+        if archivist["ai_insight"] is None:
+            requested.append("archivist_insight")
+
+    if era:
+        era = normalize_era(era)
+        profile = _linguist_curated(era) or era_registry.get(era)
+        if profile is None:
+            requested.append("dialect_profile")
+            linguist = {"era": era, "era_label": f"{era} Era", "slang": [],
+                        "dialect_notes": f"Linguistic features of the {era}.", "ai_blurb": None}
+            sections.append(f"[Linguist]\nEra: {era} (no curated dialect profile)")
+        else:
+            linguist = {**profile}
+            prompts["dialect_blurb"] = (LINGUIST_SYSTEM_PROMPT, _blurb_prompt(profile))
+            linguist.setdefault("ai_blurb", None)
+            if linguist["ai_blurb"] is None:
+                linguist["ai_blurb"] = get_cached_completion(*prompts["dialect_blurb"])
+            sections.append("[Linguist]\n" + prompts["dialect_blurb"][1])
+        if linguist["ai_blurb"] is None:
+            requested.append("dialect_blurb")
+
+        style = _stylist_curated(era)
+        prompts["style_suggestion"] = (STYLIST_SYSTEM_PROMPT, _suggestion_prompt(style))
+        stylist = {**style, "ai_suggestion": get_cached_completion(*prompts["style_suggestion"])}
+        sections.append("[Stylist]\n" + prompts["style_suggestion"][1])
+        if stylist["ai_suggestion"] is None:
+            requested.append("style_suggestion")
+
+    local_ms = round((time.perf_counter() - t0) * 1000)
+
+    # ── One structured completion for every missing field ───────────
+    results = {k: v for k, v in (("archivist", archivist), ("linguist", linguist),
+                                  ("stylist", stylist)) if v is not None}
+    synthesis = None
+    if results and "dialect_profile" not in requested:
+        prompts["synthesis"] = (CONDUCTOR_SYSTEM_PROMPT, _synthesis_prompt(results))
+        synthesis = get_cached_completion(*prompts["synthesis"])
+    if results and synthesis is None:
+        requested.append("synthesis")
+
+    status, error, llm_ms, llm_calls = "skipped", None, 0, []
+    if requested:
+        user_msg = (
+            "\n\n".join(sections)
+            + f"\n\nREQUESTED fields: {', '.join(requested)}"
+        )
+        t1 = time.perf_counter()
+        with model_router.collect() as llm_calls:
+            raw = cached_dedalus_chat(FUSED_SYSTEM_PROMPT, user_msg,
+                                      max_tokens=FUSED_MAX_TOKENS, task="fused")
+        llm_ms = round((time.perf_counter() - t1) * 1000)
+        data = _parse(raw)
+        status = "success" if data else "error"
+        if not data:
+            error = raw if is_fallback(raw) else "Unparseable fused response"
+
+        profile = data.get("dialect_profile")
+        if isinstance(profile, dict) and profile.get("slang"):
+            linguist.update({
+                "era_label": profile.get("era_label", linguist["era_label"]),
+                "slang": profile["slang"][:5],
+                "dialect_notes": profile.get("dialect_notes", linguist["dialect_notes"]),
+            })
+        if archivist is not None and archivist["ai_insight"] is None:
+            archivist["ai_insight"] = data.get("archivist_insight")
+            _store(*prompts["archivist_insight"], archivist["ai_insight"])
+        if linguist is not None and linguist["ai_blurb"] is None:
+            linguist["ai_blurb"] = data.get("dialect_blurb")
+            if "dialect_blurb" in prompts:
+                _store(*prompts["dialect_blurb"], linguist["ai_blurb"])
+        if stylist is not None and stylist["ai_suggestion"] is None:
+            stylist["ai_suggestion"] = data.get("style_suggestion")
+            _store(*prompts["style_suggestion"], stylist["ai_suggestion"])
+        if synthesis is None:
+            synthesis = data.get("synthesis")
+            if "synthesis" in prompts:
+                _store(*prompts["synthesis"], synthesis)
+
+        if "dialect_profile" in requested and linguist["slang"] and linguist["ai_blurb"]:
+            era_registry.put(era, {k: linguist[k] for k in
+                                   ("era", "era_label", "slang", "dialect_notes", "ai_blurb")})
+
+    # An agent whose LLM field is still empty after the fused call failed
+    # with it, even though its local half succeeded.
+    timeline = []
+    for key, agent, tool, field in (
+        ("archivist", "ArchivistAgent", "get_historical_context", "ai_insight"),
+        ("linguist", "LinguistAgent", "analyze_period_dialect", "ai_blurb"),
+        ("stylist", "StylistAgent", "generate_map_style", "ai_suggestion"),
+    ):
+        if key not in results:
+            continue
+        agent_err = None
+        if requested and results[key].get(field) is None:
+            agent_err = error or f"Fused response had no {field}"
+        timeline.append({
+            "agent": agent,
+            "tool": tool,
+            "status": "error" if agent_err else "success",
+            "elapsed_ms": local_ms,
+            "error": agent_err,
+            "mode": "fused",
+        })
+    timeline.append({
+        "agent": "ConductorAgent",
+        "tool": "fused_completion",
+        "status": status,
+        "elapsed_ms": llm_ms,
+        "error": error,
+        "fields": requested,
+        "llm": llm_calls,
+    })
+
+    return {
+        "archivist": archivist,
+        "linguist": linguist,
+        "stylist": stylist,
+        "synthesis": synthesis,
+        "timeline": timeline,
+        "mode": "fused",
+    }
@@ -0,0 +1,173 @@
+"""
+GeoJSON Wire Format — compact columnar encoding for map payloads.
+
+Clients that send `Accept: application/vnd.odyssey.columnar+json` get
+FeatureCollections re-shaped into columns instead of one verbose dict
+per feature:
+
+    {
+      "type": "ColumnarFeatureCollection",
+      "count": 3,
+      "precision": 5,
+      "coordinates": [dlng0, dlat0, dlng1, dlat1, ...],   # quantised deltas
+      "strings": ["The Joy Luck Club", "1940s", ...],      # interned table
+      "columns": {
+        "book": [0, 0, 0],                                 # -> strings[i]
+        "year": [1949, 1949, 1925],
+        ...
+      },
+      "interned": ["book", "era", "mood"]
+    }
+
+Coordinates are quantised to `precision` decimal places and delta-encoded,
+and low-cardinality string columns (book, era, mood, ...) are stored once
+in a shared string table.  Everyone else keeps getting plain GeoJSON.
+
+Responses are serialised with orjson when it is installed, falling back
+to a compact stdlib encoder.
+"""
+
+import json
+import math
+
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.odyssey.columnar+json"
+DEFAULT_PRECISION = 5
+# A string column is interned when it has at most this share of unique values.
+INTERN_MAX_UNIQUE_RATIO = 0.5
+
+
+def fast_dumps(obj) -> bytes:
+    """Serialise obj to compact UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def point_coordinates(coords) -> list[float] | None:
+    """[lng, lat] as finite floats (LLM-extracted values may be strings),
+    or None if coords is not a usable point."""
+    try:
+        lng, lat = (float(c) for c in coords[:2])
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(lng) and math.isfinite(lat)):
+        return None
+    return [lng, lat]
+
+
+def to_columnar(geojson: dict, precision: int = DEFAULT_PRECISION) -> dict:
+    """Convert a point FeatureCollection into the columnar wire format.
+    Features without usable coordinates are dropped."""
+    scale = 10 ** precision
+
+    features, points = [], []
+    for f in geojson.get("features", []):
+        point = point_coordinates((f.get("geometry") or {}).get("coordinates", [0, 0]))
+        if point is not None:
+            features.append(f)
+            points.append(point)
+
+    coords = []
+    prev_x = prev_y = 0
+    keys: dict[str, None] = {}
+    for f, (lng, lat) in zip(features, points):
+        x, y = round(lng * scale), round(lat * scale)
+        coords += (x - prev_x, y - prev_y)
+        prev_x, prev_y = x, y
+        for k in f.get("properties", {}):
+            keys[k] = None
+
+    columns = {
+        k: [f.get("properties", {}).get(k) for f in features]
+        for k in keys
+    }
+
+    strings: list[str] = []
+    string_ids: dict[str, int] = {}
+    interned = []
+    n = len(features) or 1
+    for k, col in columns.items():
+        if not all(isinstance(v, str) for v in col):
+            continue
+        if len(set(col)) / n > INTERN_MAX_UNIQUE_RATIO:
+            continue
+        ids = []
+        for v in col:
+            idx = string_ids.get(v)
+            if idx is None:
+                idx = string_ids[v] = len(strings)
+                strings.append(v)
+            ids.append(idx)
+        columns[k] = ids
+        interned.append(k)
+
+    return {
+        "type": "ColumnarFeatureCollection",
+        "count": len(features),
+        "precision": precision,
+        "coordinates": coords,
+        "strings": strings,
+        "columns": columns,
+        "interned": interned,
+    }
+
+
+def from_columnar(data: dict) -> dict:
+    """Inverse of to_columnar() — rebuilds a plain FeatureCollection."""
+    scale = 10 ** data["precision"]
+    strings = data["strings"]
+    columns = {
+        k: [strings[i] for i in col] if k in data["interned"] else col
+        for k, col in data["columns"].items()
+    }
+    coords = data["coordinates"]
+
+    features = []
+    x = y = 0
+    for i in range(data["count"]):
+        x += coords[2 * i]
+        y += coords[2 * i + 1]
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x / scale, y / scale]},
+            "properties": {k: col[i] for k, col in columns.items()},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def wants_columnar(request) -> bool:
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("Accept", "")
+
+
+def geojson_response(request, payload: dict, geojson_key: str | None = "geojson",
+                     status: int = 200) -> HttpResponse:
+    """
+    Return payload as JSON, negotiating the columnar format via Accept.
+
+    geojson_key names the FeatureCollection inside payload; pass None when
+    payload itself is the FeatureCollection.
+    """
+    if wants_columnar(request):
+        if geojson_key is None:
+            payload = {**payload, **to_columnar(payload)}
+            payload.pop("features", None)
+        elif isinstance(payload.get(geojson_key), dict):
+            payload = {**payload, geojson_key: to_columnar(payload[geojson_key])}
+        response = HttpResponse(fast_dumps(payload), status=status,
+                                content_type=COLUMNAR_MEDIA_TYPE)
+    elif orjson is not None:
+        response = HttpResponse(fast_dumps(payload), status=status,
+                                content_type="application/json")
+    else:
+        response = JsonResponse(payload, status=status,
+                                json_dumps_params={"separators": (",", ":")})
+    response["Vary"] = "Accept"
+    return response
@@ -0,0 +1,74 @@
+"""
+HTTP caching helpers for deterministic agent data.
+
+The curated STYLE_OVERRIDES, ERA_DIALECTS and KNOWLEDGE_BASE tables only
+change with a deploy, so their GET endpoints answer with a versioned,
+strong ETag and a public Cache-Control.  Browsers and any CDN in front
+of us can then serve repeat lookups (or revalidate with a 304) without
+touching Django.
+
+LLM enrichment (ai_insight, ai_blurb, ai_suggestion) is fetched from
+separate endpoints and cached server-side in Django's cache framework.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponseNotModified, JsonResponse
+
+from core.middleware import etag_matches
+
+
+def data_version(data) -> str:
+    """Short content hash of a curated table — changes only when it does."""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def curated_response(request, version: str, key: str, build_payload):
+    """
+    Return the curated payload for key with a strong, versioned ETag.
+
+    build_payload() is only called when the client's copy is stale, so a
+    revalidation costs one string comparison.
+    """
+    etag = f'"{version}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]}"'
+    cache_control = (
+        f"public, max-age={settings.CURATED_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={settings.CURATED_CACHE_MAX_AGE}"
+    )
+
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(build_payload())
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def enrichment_response(request, payload: dict, fallback: bool = False):
+    """
+    Return LLM enrichment with a content ETag and a short max-age.
+
+    The text is cached server-side, so repeat fetches return the same
+    bytes until the enrichment TTL expires.  A fallback (Dedalus
+    unconfigured, failing or behind an open circuit) is sent with
+    no-store and no ETag, so browsers and CDNs retry it next time.
+    """
+    if fallback:
+        response = JsonResponse(payload)
+        response["Cache-Control"] = "no-store"
+        return response
+
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    etag = f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]}"'
+
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(payload)
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={settings.ENRICHMENT_CACHE_MAX_AGE}"
+    return response
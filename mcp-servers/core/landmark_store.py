@@ -0,0 +1,128 @@
+"""
+Landmark Store — process-wide registry of every landmark on the map.
+
+Holds the curated KNOWLEDGE_BASE landmarks plus the GeoJSON features of
+every book extracted via /upload-book or /extract-from-title.  Each time
+a book is added the store bumps its version and notifies subscribers,
+so derived structures (e.g. the cluster pyramid) are rebuilt on write
+instead of on every read.
+
+State lives in memory and is per-process: each gunicorn worker keeps
+its own copy.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+from archivist.knowledge_base import KNOWLEDGE_BASE
+
+
+logger = logging.getLogger(__name__)
+
+CURATED_BOOK_PREFIX = "curated:"
+
+_lock = threading.RLock()
+_books: dict[str, list[dict]] = {}
+_version = 0
+_fingerprint = ""
+_subscribers = []
+
+
+def _curated_features() -> dict[str, list[dict]]:
+    """Convert KNOWLEDGE_BASE entries into GeoJSON features, grouped by book."""
+    by_book: dict[str, list[dict]] = {}
+    for lid, entry in KNOWLEDGE_BASE.items():
+        coords = entry.get("coordinates")
+        if not coords:
+            continue
+        by_book.setdefault(entry["book"], []).append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": coords},
+            "properties": {
+                "id": lid,
+                "title": entry.get("quote", "")[:60],
+                "book": entry["book"],
+                "era": entry["era"],
+                "year": entry["year"],
+                "quote": entry.get("quote", ""),
+                "historical_context": entry.get("historical_context", ""),
+                "mood": ",".join(entry.get("mood", [])),
+                "relevance": 10,
+            },
+        })
+    for feats in by_book.values():
+        for rank, feat in enumerate(feats, start=1):
+            feat["properties"]["rank"] = rank
+    return by_book
+
+
+def _compute_fingerprint() -> str:
+    """Content hash of the store — identical across workers with the same books."""
+    h = hashlib.sha1()
+    for book in sorted(_books):
+        h.update(book.encode())
+        h.update(json.dumps(_books[book], sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def add_book(book_title: str, geojson: dict) -> int:
+    """
+    Register (or replace) the features extracted for a book.
+    Returns the new store version.
+    """
+    global _version, _fingerprint
+    features = [
+        f for f in geojson.get("features", [])
+        if f.get("geometry", {}).get("coordinates")
+    ]
+    with _lock:
+        _books[book_title] = features
+        _version += 1
+        _fingerprint = _compute_fingerprint()
+        version = _version
+        subscribers = list(_subscribers)
+
+    # Subscribers run in the request that added the book; a failed rebuild
+    # must not fail the upload, whose features are already stored.
+    for fn in subscribers:
+        try:
+            fn(book_title, features)
+        except Exception:
+            logger.exception("Landmark store subscriber %r failed", fn)
+    return version
+
+
+def books() -> dict[str, list[dict]]:
+    """Return a snapshot of {book_title: [features]}."""
+    with _lock:
+        return dict(_books)
+
+
+def all_features() -> list[dict]:
+    """Return every feature in the store, in insertion order."""
+    with _lock:
+        return [f for feats in _books.values() for f in feats]
+
+
+def version() -> int:
+    """Monotonic counter bumped on every add_book()."""
+    return _version
+
+
+def fingerprint() -> str:
+    """Content hash of every book in the store, for cache keys and ETags."""
+    return _fingerprint
+
+
+def subscribe(fn) -> None:
+    """Register fn(book_title, features) to be called after each add_book()."""
+    with _lock:
+        _subscribers.append(fn)
+
+
+# Seed the store with the curated landmarks so they are always mapped.
+for _book, _feats in _curated_features().items():
+    _books[CURATED_BOOK_PREFIX + _book] = _feats
+_fingerprint = _compute_fingerprint()
@@ -0,0 +1,226 @@
+"""
+LLM call scheduler — admission control in front of dedalus_chat().
+
+Every Dedalus call takes a slot from one process-wide scheduler that
+enforces
+
+  * a global concurrency limit (max_concurrency in-flight calls), and
+  * an optional tokens-per-minute budget (token bucket; each call is
+    charged its estimated prompt + max_tokens, corrected by the usage
+    Dedalus reports afterwards),
+
+and shares them between three priority classes with weighted fair
+queuing:
+
+  interactive   marker clicks, /orchestrate, /chat, deferred fields
+  background    prefetch and cache warming
+  bulk          PDF uploads and title extraction
+
+Each class has a FIFO queue and a virtual clock that advances by
+cost / weight whenever one of its calls is admitted; the next slot goes
+to the waiting class with the lowest clock.  A bulk upload can therefore
+still make progress, but it can no longer take every slot while marker
+clicks wait.  With a token budget, a class whose next call doesn't fit
+in the bucket yet is skipped until it does, so the others keep going.
+Calls that wait longer than their class's max_wait_s give
+up and return a fallback.
+
+The class comes from a context variable — `with priority("bulk"):` —
+which core/executor.py and core/background.py carry into their worker
+threads.  GET /llm/scheduler reports queue depth and wait times.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+BULK = "bulk"
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(name: str):
+    """Run the enclosed Dedalus calls (and work submitted from here) at this class."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def estimate_tokens(*texts: str, max_tokens: int = 0) -> int:
+    """Rough token count (~4 characters per token) plus the completion allowance."""
+    return sum(len(t) for t in texts) // 4 + max_tokens
+
+
+class _Ticket:
+    __slots__ = ("cls", "tokens", "enqueued", "admitted")
+
+    def __init__(self, cls: str, tokens: int):
+        self.cls = cls
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.admitted = False
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int, tokens_per_minute: int, classes: dict[str, dict]):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.classes = classes
+
+        self._cond = threading.Condition()
+        self._queues: dict[str, deque[_Ticket]] = {c: deque() for c in classes}
+        self._vtime: dict[str, float] = {c: 0.0 for c in classes}
+        self._virtual_now = 0.0
+        self._running: dict[str, int] = {c: 0 for c in classes}
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._stats = {
+            c: {"admitted": 0, "timed_out": 0, "tokens": 0, "waits_ms": deque(maxlen=500)}
+            for c in classes
+        }
+
+    # ── Token bucket ────────────────────────────────────────────────
+    def _refill(self) -> None:
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60,
+        )
+        self._refilled_at = now
+
+    def _affordable(self, ticket: _Ticket) -> bool:
+        if not self.tokens_per_minute:
+            return True
+        # A call bigger than the whole budget still runs once the bucket is full.
+        return self._tokens >= min(ticket.tokens, self.tokens_per_minute)
+
+    # ── Dispatch (caller holds the lock) ────────────────────────────
+    def _dispatch(self) -> None:
+        self._refill()
+        admitted = False
+        while sum(self._running.values()) < self.max_concurrency:
+            # Lowest virtual clock first; a class whose head call the token
+            # bucket can't cover yet is passed over rather than blocking the
+            # others (a big bulk extraction must not hold up marker clicks).
+            waiting = sorted((c for c, q in self._queues.items() if q), key=lambda c: self._vtime[c])
+            cls = next((c for c in waiting if self._affordable(self._queues[c][0])), None)
+            if cls is None:
+                break
+            ticket = self._queues[cls][0]
+            self._queues[cls].popleft()
+            ticket.admitted = True
+            admitted = True
+            self._running[cls] += 1
+            self._virtual_now = self._vtime[cls]
+            self._vtime[cls] += max(ticket.tokens, 1) / self.classes[cls]["weight"]
+            if self.tokens_per_minute:
+                self._tokens -= ticket.tokens
+            stats = self._stats[cls]
+            stats["admitted"] += 1
+            stats["tokens"] += ticket.tokens
+            stats["waits_ms"].append((time.monotonic() - ticket.enqueued) * 1000)
+        if admitted:
+            self._cond.notify_all()
+
+    def acquire(self, cls: str, tokens: int) -> _Ticket | None:
+        """Block until admitted; None if the class's max_wait_s ran out."""
+        ticket = _Ticket(cls, tokens)
+        deadline = ticket.enqueued + self.classes[cls]["max_wait_s"]
+        with self._cond:
+            if not self._queues[cls] and not self._running[cls]:
+                # A class returning from idle doesn't get credit for the idle time.
+                self._vtime[cls] = max(self._vtime[cls], self._virtual_now)
+            self._queues[cls].append(ticket)
+            self._dispatch()
+            while not ticket.admitted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queues[cls].remove(ticket)
+                    self._stats[cls]["timed_out"] += 1
+                    return None
+                # Wake periodically so the token bucket can refill.
+                self._cond.wait(min(remaining, 0.25))
+                if not ticket.admitted:
+                    self._dispatch()
+        return ticket
+
+    def release(self, ticket: _Ticket, actual_tokens: int | None = None) -> None:
+        with self._cond:
+            self._running[ticket.cls] -= 1
+            if actual_tokens is not None and self.tokens_per_minute:
+                self._tokens -= actual_tokens - ticket.tokens
+            self._dispatch()
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            classes = {}
+            for cls, s in self._stats.items():
+                waits = sorted(s["waits_ms"])
+                n = len(waits)
+                classes[cls] = {
+                    "weight": self.classes[cls]["weight"],
+                    "queued": len(self._queues[cls]),
+                    "running": self._running[cls],
+                    "admitted": s["admitted"],
+                    "timed_out": s["timed_out"],
+                    "tokens": s["tokens"],
+                    "wait_p50_ms": round(waits[n // 2], 1) if n else None,
+                    "wait_p95_ms": round(waits[min(n - 1, int(n * 0.95))], 1) if n else None,
+                    "wait_max_ms": round(waits[-1], 1) if n else None,
+                }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": sum(self._running.values()),
+                "tokens_per_minute": self.tokens_per_minute,
+                "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+                "classes": classes,
+            }
+
+
+_scheduler: LLMScheduler | None = None
+_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _lock:
+            if _scheduler is None:
+                config = settings.LLM_SCHEDULER
+                _scheduler = LLMScheduler(
+                    config["max_concurrency"], config["tokens_per_minute"], config["classes"],
+                )
+    return _scheduler
+
+
+@require_GET
+def scheduler_stats(request):
+    """
+    GET /llm/scheduler
+
+    Global concurrency and token budget, plus per-class queue depth,
+    running calls and wait-time percentiles, and each model tier's
+    rolling latency (core/model_router.py).
+    """
+    from core.model_router import get_router
+
+    return JsonResponse({**get_scheduler().stats(), "models": get_router().stats()})
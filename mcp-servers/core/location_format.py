@@ -0,0 +1,233 @@
+"""
+Location output formats — how the extraction prompts ask Dedalus to
+return locations, and the shared parser that turns the reply into the
+dicts locations_to_geojson() expects.
+
+  json      the original schema: a JSON array of objects with long,
+            repeated key names.
+  compact   one location per line, positional fields separated by "|":
+
+              id|title|era|year|lon|lat|mood|quote|context|relevance
+
+            Keys and JSON punctuation cost nothing, "book" is filled in
+            server-side, and a reply cut off by max_tokens loses at most
+            its last line, which is dropped.
+
+settings.EXTRACTION_FORMAT picks the default; both extraction pipelines
+(core/pdf_processor.py, core/title_extractor.py) accept a per-call fmt.
+
+extract_locations() runs the completion for either pipeline.  When a
+reply is cut off at max_tokens (finish_reason "length"), it asks for
+the rest — resending the same excerpt, since the locations the reply
+never reached can be anywhere in it, and listing the ids already found
+so only those are generated — and merges the results, up to
+EXTRACTION_MAX_CONTINUATIONS times.
+"""
+
+import json
+import logging
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+from core import tracing
+from core.dedalus_client import dedalus_completion
+
+
+logger = logging.getLogger(__name__)
+
+
+FORMATS = ("json", "compact")
+
+COMPACT_FIELDS = (
+    "id", "title", "era", "year", "lon", "lat",
+    "mood", "quote", "historical_context", "relevance",
+)
+
+_COMPACT_OUTPUT = """Return ONE LINE per location with these fields separated by "|", in this order:
+id|title|era|year|lon|lat|mood|quote|context|relevance
+
+Example:
+gatsby-mansion|Gatsby's Mansion — West Egg|1920s|1922|-73.7287|40.8656|opulent,lonely|He stretched out his arms toward the dark water|Why this place matters in the book's context...|10
+
+- id: short unique slug; era: a decade like 1170s or 1920s; year: an integer
+- lon, lat: decimal degrees, 4 decimal places
+- mood: comma,separated,mood,words; relevance: an integer 1-10
+- Never put "|" or a line break inside a field
+
+"""
+
+_JSON_OUTPUT_RE = re.compile(r"Return your response as a JSON array.*?\n\]\n\n", re.DOTALL)
+_JSON_ONLY = "- Return ONLY the JSON array, no other text"
+_COMPACT_ONLY = "- Return ONLY the lines — no header, numbering, JSON or other text"
+
+
+@lru_cache(maxsize=None)
+def prompt_for(json_prompt: str, fmt: str) -> str:
+    """The extraction prompt json_prompt, rewritten to ask for fmt."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown extraction format: {fmt!r}")
+    if fmt == "json":
+        return json_prompt
+    prompt, n = _JSON_OUTPUT_RE.subn(lambda _: _COMPACT_OUTPUT, json_prompt)
+    if n != 1 or _JSON_ONLY not in prompt:
+        raise ValueError("Prompt does not have the expected JSON output section")
+    return prompt.replace(_JSON_ONLY, _COMPACT_ONLY)
+
+
+def _extract_complete_objects(text: str) -> list[dict]:
+    """
+    Extract complete JSON objects from a potentially truncated JSON array.
+    Handles the common case where the AI response is cut off mid-object.
+    """
+    objects = []
+    depth = 0
+    start = None
+    for i, ch in enumerate(text):
+        if ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0 and start is not None:
+                try:
+                    obj = json.loads(text[start:i + 1])
+                    objects.append(obj)
+                except json.JSONDecodeError:
+                    pass
+                start = None
+    return objects
+
+
+def _parse_json(text: str) -> list[dict]:
+    try:
+        locations = json.loads(text)
+    except json.JSONDecodeError:
+        # If the response was truncated, extract complete JSON objects
+        return _extract_complete_objects(text)
+    return locations if isinstance(locations, list) else []
+
+
+def _unquote(text: str) -> str:
+    """Drop one pair of surrounding double quotes, keeping quotes inside."""
+    if len(text) >= 2 and text.startswith('"') and text.endswith('"'):
+        return text[1:-1]
+    return text
+
+
+def _parse_compact_line(line: str) -> dict | None:
+    fields = [f.strip() for f in line.split("|")]
+    if len(fields) != len(COMPACT_FIELDS):
+        return None
+    row = dict(zip(COMPACT_FIELDS, fields))
+    try:
+        loc = {
+            "id": row["id"],
+            "title": row["title"],
+            "era": row["era"],
+            "year": int(row["year"]),
+            "coordinates": [float(row["lon"]), float(row["lat"])],
+            "quote": _unquote(row["quote"]),
+            "historical_context": row["historical_context"],
+            "mood": row["mood"],
+            "relevance": int(row["relevance"]),
+        }
+    except ValueError:
+        return None
+    return loc if loc["id"] and loc["title"] else None
+
+
+def _parse_compact(text: str) -> list[dict]:
+    # Lines that don't have every field (a header, a truncated last line)
+    # are skipped.
+    return [loc for loc in map(_parse_compact_line, text.splitlines()) if loc is not None]
+
+
+def parse_locations(raw: str, fmt: str, book: str | None = None) -> list[dict]:
+    """
+    Parse an extraction reply in format fmt into location dicts.
+    Locations without a "book" get `book`.  Unparseable replies give [].
+    """
+    # Strip markdown code fences if present
+    cleaned = raw.strip()
+    if cleaned.startswith("```"):
+        cleaned = re.sub(r'^```\w*\s*', '', cleaned)
+        cleaned = re.sub(r'\s*```\s*$', '', cleaned)
+
+    locations = _parse_compact(cleaned) if fmt == "compact" else _parse_json(cleaned)
+    locations = [loc for loc in locations if isinstance(loc, dict)]
+    if book:
+        for loc in locations:
+            if not loc.get("book"):
+                loc["book"] = book
+    return locations
+
+
+def _continuation_message(user_message: str, found: list[dict]) -> str:
+    ids = ", ".join(str(loc["id"]) for loc in found if loc.get("id"))
+    return (
+        f"{user_message}\n\n"
+        f"Your previous answer was cut off. Already extracted — do NOT repeat: {ids}\n"
+        "Continue with the remaining locations only, in the same format. "
+        "If there are none, return nothing."
+    )
+
+
+def _merge(found: list[dict], more: list[dict]) -> int:
+    """Append locations from more that aren't already in found; returns how many."""
+    seen = {loc.get("id") for loc in found} | {str(loc.get("title", "")).lower() for loc in found}
+    added = 0
+    for loc in more:
+        if loc.get("id") in seen or str(loc.get("title", "")).lower() in seen:
+            continue
+        seen |= {loc.get("id"), str(loc.get("title", "")).lower()}
+        found.append(loc)
+        added += 1
+    return added
+
+
+def _complete_text(completion: dict, fmt: str) -> str:
+    """
+    The reply text, less its last line if a compact reply was cut off —
+    that line can still have every field, with the last one truncated.
+    """
+    text = completion["text"]
+    if fmt == "compact" and completion["finish_reason"] == "length":
+        text = text[:text.rfind("\n") + 1]
+    return text
+
+
+def extract_locations(system_prompt: str, user_message: str, fmt: str, book: str,
+                      task: str, max_tokens: int = 4096) -> list[dict]:
+    """
+    Ask Dedalus for locations and parse the reply, continuing truncated
+    replies.  Continuation requests resend user_message with the ids
+    already found appended.
+    """
+    with tracing.span("locations.extract", task=task, format=fmt) as span:
+        completion = dedalus_completion(system_prompt, user_message, max_tokens=max_tokens, task=task)
+        with tracing.span("locations.parse", chars=len(completion["text"])):
+            locations = parse_locations(_complete_text(completion, fmt), fmt, book=book)
+
+        rounds = 1
+        for attempt in range(settings.EXTRACTION_MAX_CONTINUATIONS):
+            if completion["finish_reason"] != "length" or not locations:
+                break
+            completion = dedalus_completion(
+                system_prompt,
+                _continuation_message(user_message, locations),
+                max_tokens=max_tokens,
+                task=task,
+            )
+            rounds += 1
+            with tracing.span("locations.parse", chars=len(completion["text"])):
+                more = parse_locations(_complete_text(completion, fmt), fmt, book=book)
+                added = _merge(locations, more)
+            logger.info("Extraction continuation %d for %r added %d locations", attempt + 1, book, added)
+            if not added:
+                break
+        span.set("rounds", rounds)
+        span.set("locations", len(locations))
+    return locations
@@ -0,0 +1,56 @@
+"""
+python manage.py warm_cache [--refresh] [--concurrency N] [--coverage]
+
+Precompute LLM enrichment for every curated landmark and era
+(see core/warmer.py) and print warm coverage.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.warmer import coverage, warm
+
+
+class Command(BaseCommand):
+    help = (
+        "Warm the LLM cache for all curated landmarks and eras. "
+        "Needs a shared CACHE_BACKEND to affect running servers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--refresh", action="store_true",
+            help="Re-generate every entry, not just missing ones.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=None,
+            help="Max concurrent Dedalus calls (default CACHE_WARMER_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--coverage", action="store_true",
+            help="Only report current coverage; make no LLM calls.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        if options["coverage"]:
+            report = {"after": coverage()}
+        else:
+            report = warm(concurrency=options["concurrency"], refresh=options["refresh"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        after = report["after"]
+        if "attempted" in report:
+            self.stdout.write(
+                f"Attempted {report['attempted']}, warmed {report['warmed']}, "
+                f"failed {report['failed']} in {report['elapsed_ms']} ms"
+            )
+        self.stdout.write(f"Coverage: {after['warm']}/{after['total']} ({after['ratio']:.0%})")
+        for kind, counts in sorted(after["by_kind"].items()):
+            self.stdout.write(f"  {kind:<18} {counts['warm']}/{counts['total']}")
+        if report.get("failed"):
+            self.stderr.write(self.style.WARNING("Some entries failed; see log."))
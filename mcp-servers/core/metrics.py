@@ -0,0 +1,284 @@
+"""
+Metrics registry — process-wide counters, gauges and latency histograms.
+
+Everything the timelines, the Dedalus client, the caches and the circuit
+breakers measure lands here, and GET /metrics renders it in the
+Prometheus text format:
+
+  http_requests_total                per endpoint, method and status
+  http_request_duration_seconds      per endpoint
+  http_requests_in_flight
+  agent_duration_seconds             per agent, tool and status (timelines)
+  dedalus_completions_total          per task, model and outcome
+  dedalus_tokens_total               per task, model and kind, from `usage`
+  cache_lookups_total                per cache and result (hit / miss)
+  upstream_requests_total            per upstream and outcome
+  upstream_request_duration_seconds  per upstream
+  bulkhead_*, llm_scheduler_*, circuit_state   read at scrape time
+
+Views pass their timeline to observe_timeline(), which records the agent
+histograms and hands the entries to MetricsMiddleware
+(core/middleware.py) for the response's Server-Timing header.
+
+Values are per process: with several gunicorn workers each one keeps
+its own, and a scrape sees whichever worker answered.
+"""
+
+import bisect
+import contextvars
+import re
+import threading
+
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, labels, value) for every series."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            yield "", dict(zip(self.labelnames, key)), value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for key, (counts, total) in sorted(items):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+_registry: list[_Metric] = []
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ("endpoint", "method", "status"))
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to build each response.", ("endpoint",))
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled right now.")
+AGENT_LATENCY = Histogram(
+    "agent_duration_seconds", "Agent and tool time, from the response timelines.",
+    ("agent", "tool", "status"))
+DEDALUS_COMPLETIONS = Counter(
+    "dedalus_completions_total", "Dedalus completions; outcome is ok or fallback.",
+    ("task", "model", "outcome"))
+DEDALUS_TOKENS = Counter(
+    "dedalus_tokens_total", "Tokens Dedalus reported in each response's usage.",
+    ("task", "model", "kind"))
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by result.", ("cache", "result"))
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "Upstream calls; outcome is ok, error, or rejected by an open circuit.",
+    ("upstream", "outcome"))
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds", "Upstream call latency.", ("upstream",))
+
+
+# ── Recording helpers ───────────────────────────────────────────────
+
+_timings: contextvars.ContextVar[list | None] = contextvars.ContextVar("server_timings", default=None)
+
+
+def observe_timeline(timeline: list[dict]) -> None:
+    """Record timeline entries in agent_duration_seconds and queue them
+    for this response's Server-Timing header."""
+    for entry in timeline:
+        AGENT_LATENCY.observe(
+            (entry.get("elapsed_ms") or 0) / 1000,
+            agent=entry.get("agent", ""), tool=entry.get("tool", ""),
+            status=entry.get("status", ""),
+        )
+    pending = _timings.get()
+    if pending is not None:
+        pending.extend(timeline)
+
+
+def cache_lookup(cache_name: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache_name, result="hit" if hit else "miss")
+
+
+def record_completion(task: str | None, model: str, ok: bool, usage: dict | None) -> None:
+    """Count one Dedalus completion and the tokens from its `usage` field."""
+    task = task or "default"
+    DEDALUS_COMPLETIONS.inc(task=task, model=model, outcome="ok" if ok else "fallback")
+    for kind in ("prompt", "completion"):
+        tokens = (usage or {}).get(f"{kind}_tokens")
+        if tokens:
+            DEDALUS_TOKENS.inc(tokens, task=task, model=model, kind=kind)
+
+
+def record_upstream(upstream: str, outcome: str, latency_ms: float | None = None) -> None:
+    UPSTREAM_REQUESTS.inc(upstream=upstream, outcome=outcome)
+    if latency_ms is not None:
+        UPSTREAM_LATENCY.observe(latency_ms / 1000, upstream=upstream)
+
+
+# ── Server-Timing ───────────────────────────────────────────────────
+
+def start_request() -> contextvars.Token:
+    """Begin collecting Server-Timing entries for the current request."""
+    return _timings.set([])
+
+
+def finish_request(token: contextvars.Token) -> list[dict]:
+    """The entries collected since start_request()."""
+    entries = _timings.get() or []
+    _timings.reset(token)
+    return entries
+
+
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+def server_timing(entries: list[dict], total_ms: float) -> str:
+    """A Server-Timing header value: one metric per timeline entry
+    (named after its tool, described by agent and status) plus the total."""
+    parts = []
+    for entry in entries:
+        name = _TOKEN_UNSAFE.sub("_", entry.get("tool") or entry.get("agent") or "step")
+        desc = entry.get("agent", "")
+        status = entry.get("status")
+        if status and status != "success":
+            desc = f"{desc} ({status})"
+        desc = desc.replace("\\", "").replace('"', "")
+        parts.append(f'{name};desc="{desc}";dur={entry.get("elapsed_ms") or 0}')
+        if entry.get("queue_ms"):
+            parts.append(f'{name}-queue;desc="{desc} queued";dur={entry["queue_ms"]}')
+    parts.append(f"total;dur={round(total_ms, 1)}")
+    return ", ".join(parts)
+
+
+# ── Exposition ──────────────────────────────────────────────────────
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _live_gauges() -> list[tuple[str, str, list[tuple[dict, float]]]]:
+    """Gauges read from the bulkheads, LLM scheduler and circuit breakers."""
+    from core import circuit, executor, llm_scheduler
+
+    bulkheads = executor.stats()
+    scheduler = llm_scheduler.get_scheduler().stats()
+    states = {circuit.CLOSED: 0, circuit.HALF_OPEN: 1, circuit.OPEN: 2}
+    return [
+        ("bulkhead_running", "Calls running in each agent bulkhead.",
+         [({"bulkhead": name}, s["running"]) for name, s in bulkheads.items()]),
+        ("bulkhead_queued", "Calls waiting in each agent bulkhead.",
+         [({"bulkhead": name}, s["queued"]) for name, s in bulkheads.items()]),
+        ("bulkhead_rejected", "Calls each bulkhead has rejected since startup.",
+         [({"bulkhead": name}, s["rejected"]) for name, s in bulkheads.items()]),
+        ("llm_scheduler_running", "Dedalus calls holding a scheduler slot, per class.",
+         [({"class": cls}, s["running"]) for cls, s in scheduler["classes"].items()]),
+        ("llm_scheduler_queued", "Dedalus calls waiting for a scheduler slot, per class.",
+         [({"class": cls}, s["queued"]) for cls, s in scheduler["classes"].items()]),
+        ("circuit_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+         [({"upstream": name}, states[s["state"]]) for name, s in circuit.stats().items()]),
+    ]
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for suffix, labels, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    for name, help, samples in _live_gauges():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+@require_GET
+def metrics(request):
+    """
+    GET /metrics
+
+    Prometheus text exposition of this worker's metrics.
+    """
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,186 @@
+"""
+Project middleware.
+
+MetricsMiddleware — counts and times every request per endpoint for
+GET /metrics (core/metrics.py), tracks how many are in flight, and adds
+a Server-Timing header built from the timeline entries the view passed
+to metrics.observe_timeline(), so browser devtools show the per-agent
+breakdown.
+
+TracingMiddleware — opens the request's root span when TRACING_ENABLED
+is set (core/tracing.py) and returns X-Request-Id / X-Trace-Id.
+
+ProfilingMiddleware — profiles requests asked for with the
+X-Profile-Token header or picked by PROFILE_SAMPLE_RATE
+(core/profiling.py).  Removes itself when neither is configured.
+
+CompressionMiddleware — compresses large responses with brotli when the
+client accepts it (and the `brotli` package is installed), otherwise
+with gzip, honouring the q-values in Accept-Encoding ("br;q=0" refuses
+brotli).  Small bodies are left alone: below COMPRESSION_MIN_BYTES the
+CPU cost outweighs the bytes saved.
+
+Strong ETags get the encoding appended ("abc" -> "abc-br") so each
+representation keeps its own validator; etag_matches() accepts either
+form when views compare If-None-Match.
+"""
+
+import gzip
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from core import metrics, profiling, tracing
+
+try:
+    import brotli
+except ImportError:  # optional — gzip is always available
+    brotli = None
+
+
+_ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def etag_matches(request, etag: str) -> bool:
+    """True if the request's If-None-Match covers etag in any encoding."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        for suffix in _ENCODING_SUFFIXES:
+            if candidate.endswith(suffix + '"'):
+                candidate = candidate[: -len(suffix) - 1] + '"'
+                break
+        if candidate == etag.removeprefix("W/"):
+            return True
+    return False
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    """Accept-Encoding parsed into {coding: q}; "*" covers unlisted codings."""
+    accepted = {}
+    for part in header.split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def _quality(accepted: dict[str, float], coding: str) -> float:
+    return accepted.get(coding, accepted.get("*", 0.0))
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, "COMPRESSION_MIN_BYTES", 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < self.min_bytes
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        br_q = _quality(accepted, "br") if brotli is not None else 0.0
+        gzip_q = _quality(accepted, "gzip")
+
+        # Highest q wins; brotli on a tie.
+        if br_q > 0 and br_q >= gzip_q:
+            body, encoding = brotli.compress(response.content, quality=4), "br"
+        elif gzip_q > 0:
+            body, encoding = gzip.compress(response.content, compresslevel=6), "gzip"
+        else:
+            return response
+
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        if response.has_header("ETag"):
+            etag = response["ETag"]
+            if not etag.startswith("W/"):
+                response["ETag"] = f'{etag[:-1]}-{encoding}"'
+        return response
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        metrics.HTTP_IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec()
+            elapsed = time.perf_counter() - t0
+            entries = metrics.finish_request(token)
+
+        match = request.resolver_match
+        endpoint = (match.url_name or match.route) if match else "unmatched"
+        metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method,
+                                  status=response.status_code)
+        metrics.HTTP_LATENCY.observe(elapsed, endpoint=endpoint)
+
+        response["Server-Timing"] = metrics.server_timing(entries, elapsed * 1000)
+        # Lets cross-origin pages (the Vite dev server) read the timings.
+        response["Timing-Allow-Origin"] = "*"
+        return response
+
+
+class TracingMiddleware:
+    def __init__(self, get_response):
+        if not settings.TRACING_ENABLED:
+            raise MiddlewareNotUsed
+        tracing.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with tracing.server_span(request) as span:
+            response = self.get_response(request)
+            match = request.resolver_match
+            if match:
+                span.set("http.route", match.route)
+            span.set("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.fail(f"HTTP {response.status_code}")
+        response["X-Request-Id"] = span.trace.request_id
+        response["X-Trace-Id"] = span.trace.trace_id
+        return response
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not profiling.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reason = None if request.path.startswith("/profiles") else profiling.trigger(request)
+        if reason is None:
+            return self.get_response(request)
+        return profiling.profile_request(request, reason, self.get_response)
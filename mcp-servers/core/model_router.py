@@ -0,0 +1,121 @@
+"""
+Model routing — pick a Dedalus model tier per task.
+
+Not every call needs the flagship model: two-sentence blurbs and style
+tweaks are fine on a small, fast model, while insights and syntheses
+read better on the large one.  settings.LLM_TIERS defines the tiers
+(model, timeout, and the rolling p90 latency above which the tier counts
+as slow); settings.LLM_ROUTES maps each task to an ordered list of tiers
+and, optionally, its own max_tokens.
+
+dedalus_chat(..., task=...) asks the router for a tier.  The first tier
+in the route whose model's rolling p90 latency is under its slow_ms is
+used; if every tier is slow, the last (fastest) one is.  Observed
+latencies are fed back with record().
+
+Calls made inside `with collect() as calls:` are also appended to
+`calls` as {"task", "tier", "model", "latency_ms", "ok"} — the conductor
+uses this to show per-task model and latency in its timeline.  The list
+is shared with worker threads that run in a copy of the caller's context.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+_calls: contextvars.ContextVar[list | None] = contextvars.ContextVar("llm_calls", default=None)
+
+
+class ModelRouter:
+    def __init__(self, tiers: dict[str, dict], routes: dict[str, dict],
+                 window_s: float = 300.0, min_samples: int = 5):
+        self.tiers = tiers
+        self.routes = routes
+        self.window_s = window_s
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._latency: dict[str, deque[tuple[float, float]]] = {}
+
+    def _prune(self, samples: deque, now: float) -> None:
+        while samples and now - samples[0][0] > self.window_s:
+            samples.popleft()
+
+    def record(self, model: str, latency_ms: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            samples = self._latency.setdefault(model, deque())
+            samples.append((now, latency_ms))
+            self._prune(samples, now)
+
+    def p90(self, model: str) -> float | None:
+        """Rolling p90 latency for model, or None with too few samples."""
+        with self._lock:
+            samples = self._latency.get(model)
+            if not samples:
+                return None
+            self._prune(samples, time.monotonic())
+            if len(samples) < self.min_samples:
+                return None
+            ordered = sorted(ms for _, ms in samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+    def route(self, task: str | None) -> tuple[str, dict, int | None]:
+        """(tier name, tier config, route max_tokens or None) for a task."""
+        route = self.routes.get(task) or self.routes["default"]
+        names = route["tiers"]
+        for name in names[:-1]:
+            latency = self.p90(self.tiers[name]["model"])
+            if latency is None or latency <= self.tiers[name]["slow_ms"]:
+                return name, self.tiers[name], route.get("max_tokens")
+        return names[-1], self.tiers[names[-1]], route.get("max_tokens")
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "model": tier["model"],
+                "p90_ms": None if (p := self.p90(tier["model"])) is None else round(p),
+                "slow_ms": tier["slow_ms"],
+            }
+            for name, tier in self.tiers.items()
+        }
+
+
+_router: ModelRouter | None = None
+_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        with _lock:
+            if _router is None:
+                _router = ModelRouter(settings.LLM_TIERS, settings.LLM_ROUTES)
+    return _router
+
+
+@contextmanager
+def collect():
+    """Collect a record of every Dedalus call made in this block."""
+    calls: list[dict] = []
+    token = _calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _calls.reset(token)
+
+
+def note_call(task: str | None, tier: str, model: str, latency_ms: float, ok: bool) -> None:
+    calls = _calls.get()
+    if calls is not None:
+        calls.append({
+            "task": task,
+            "tier": tier,
+            "model": model,
+            "latency_ms": round(latency_ms),
+            "ok": ok,
+        })
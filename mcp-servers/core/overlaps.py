@@ -0,0 +1,250 @@
+"""
+Overlap Detector — finds places that several books share.
+
+Given the FeatureCollections for N books, landmarks from different books
+that sit within a distance threshold of each other (and whose titles
+look like the same place) are joined into overlap clusters.
+
+The spatial join buckets every point into a 3-D grid on the unit sphere
+whose cell size equals the chord length of the threshold, so each point
+is only compared against the 27 surrounding cells.  That keeps the whole
+comparison near-linear in the number of landmarks, and works the same at
+the poles and across the antimeridian.
+"""
+
+import json
+import math
+import re
+import time
+from difflib import SequenceMatcher
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from core import landmark_store
+from core.geojson_wire import point_coordinates
+
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_THRESHOLD_KM = 1.0
+DEFAULT_MIN_SIMILARITY = 0.6
+# Points this close are the same spot whatever the LLM called them.
+SAME_SPOT_KM = 0.15
+
+_STOPWORDS = {"the", "a", "an", "of", "at", "in", "on", "and"}
+
+
+def _place_name(title: str) -> str:
+    """'The Cotton Club — Jazz Age Nightlife' -> 'cotton club'."""
+    name = re.split(r"\s[—–-]\s", title or "", maxsplit=1)[0].lower()
+    words = re.findall(r"[a-z0-9]+", name)
+    return " ".join(w for w in words if w not in _STOPWORDS)
+
+
+def _title_similarity(a: str, b: str, floor: float = 0.0) -> float:
+    """Fuzzy ratio of two place names; cheap bounds skip pairs below floor."""
+    if not a or not b:
+        return 0.0
+    if a == b or a in b or b in a:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+        return 0.0
+    return matcher.ratio()
+
+
+def _to_xyz(lng: float, lat: float) -> tuple[float, float, float]:
+    lam, phi = math.radians(lng), math.radians(lat)
+    cos_phi = math.cos(phi)
+    return cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_overlaps(
+    books: dict[str, list[dict]],
+    threshold_km: float = DEFAULT_THRESHOLD_KM,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> list[dict]:
+    """
+    Return overlap clusters across books.
+
+    books maps book title -> list of GeoJSON point features.  Two
+    landmarks from different books match if they are within
+    threshold_km and either their place names are at least
+    min_similarity alike or they are within SAME_SPOT_KM.
+    """
+    points = []  # (book, feature, xyz, place_name)
+    for book, features in books.items():
+        for f in features:
+            geometry = f.get("geometry")
+            point = point_coordinates(geometry.get("coordinates")) if isinstance(geometry, dict) else None
+            if point is None:
+                continue
+            if geometry["coordinates"] != point:
+                f = {**f, "geometry": {**geometry, "coordinates": point}}
+            title = (f.get("properties") or {}).get("title", "")
+            points.append((book, f, _to_xyz(*point), _place_name(str(title))))
+
+    # Cell size = chord length for threshold_km on the unit sphere.
+    cell = 2 * math.sin(min(threshold_km / EARTH_RADIUS_KM, math.pi) / 2)
+    if cell <= 0:
+        return []
+    grid: dict[tuple[int, int, int], list[int]] = {}
+    for i, (_b, _f, (x, y, z), _n) in enumerate(points):
+        grid.setdefault((int(x // cell), int(y // cell), int(z // cell)), []).append(i)
+
+    uf = _UnionFind(len(points))
+    best = {}  # (i, j) -> (distance_km, similarity) for matched pairs
+    for (cx, cy, cz), members in grid.items():
+        neighbours = [
+            j
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+            for j in grid.get((cx + dx, cy + dy, cz + dz), ())
+        ]
+        for i in members:
+            book_i, _f, (xi, yi, zi), name_i = points[i]
+            for j in neighbours:
+                if j <= i or points[j][0] == book_i:
+                    continue
+                xj, yj, zj = points[j][2]
+                chord = math.sqrt((xi - xj) ** 2 + (yi - yj) ** 2 + (zi - zj) ** 2)
+                if chord > cell:
+                    continue
+                dist = _chord_to_km(chord)
+                sim = _title_similarity(name_i, points[j][3], min_similarity)
+                if sim >= min_similarity or dist <= SAME_SPOT_KM:
+                    uf.union(i, j)
+                    best[(i, j)] = (dist, sim)
+
+    groups: dict[int, dict[int, None]] = {}
+    stats: dict[int, list[tuple[float, float]]] = {}
+    for (i, j), pair in best.items():
+        root = uf.find(i)
+        members = groups.setdefault(root, {})
+        members[i] = members[j] = None
+        stats.setdefault(root, []).append(pair)
+
+    clusters = []
+    for root, members in groups.items():
+        lngs = [points[k][1]["geometry"]["coordinates"][0] for k in members]
+        lats = [points[k][1]["geometry"]["coordinates"][1] for k in members]
+        pair_stats = stats[root]
+        clusters.append({
+            "center": [round(sum(lngs) / len(lngs), 6), round(sum(lats) / len(lats), 6)],
+            "books": sorted({points[k][0] for k in members}),
+            "landmarks": [
+                {
+                    "book": points[k][0],
+                    "id": points[k][1].get("properties", {}).get("id"),
+                    "title": points[k][1].get("properties", {}).get("title"),
+                    "coordinates": points[k][1]["geometry"]["coordinates"],
+                }
+                for k in members
+            ],
+            "max_distance_km": round(max(d for d, _s in pair_stats), 3),
+            "title_similarity": round(max(s for _d, s in pair_stats), 2),
+        })
+
+    clusters.sort(key=lambda c: (-len(c["books"]), -len(c["landmarks"])))
+    return clusters
+
+
+def _books_from_body(body: dict) -> dict[str, list[dict]]:
+    """
+    Accepts either
+      { "books": [ { "book_title": "...", "geojson": {FeatureCollection} } ] }
+    or
+      { "collections": [ {FeatureCollection}, ... ] }  (book from properties)
+
+    Raises ValueError if the body doesn't have that shape.
+    """
+    def features_of(fc) -> list[dict]:
+        features = fc.get("features", []) if isinstance(fc, dict) else None
+        if not isinstance(features, list) or not all(isinstance(f, dict) for f in features):
+            raise ValueError("Each GeoJSON must be a FeatureCollection of feature objects")
+        return features
+
+    books: dict[str, list[dict]] = {}
+    items, collections = body.get("books", []), body.get("collections", [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("books must be a list of objects")
+    if not isinstance(collections, list):
+        raise ValueError("collections must be a list of FeatureCollections")
+    for item in items:
+        title = str(item.get("book_title") or item.get("title") or f"book-{len(books) + 1}")
+        books.setdefault(title, []).extend(features_of(item.get("geojson", {})))
+    for fc in collections:
+        for f in features_of(fc):
+            book = str((f.get("properties") or {}).get("book", "Unknown"))
+            books.setdefault(book, []).append(f)
+    return books
+
+
+@csrf_exempt
+@require_POST
+def overlaps(request):
+    """
+    POST /overlaps
+    Body: {
+      "books": [ { "book_title": "On the Road", "geojson": {...} }, ... ],
+      "threshold_km": 1.0,          // optional
+      "min_similarity": 0.6         // optional
+    }
+
+    With no books/collections in the body, compares every book currently
+    in the landmark store.  Returns overlap clusters with the books that
+    contribute to each.
+    """
+    t_start = time.perf_counter()
+
+    try:
+        body = json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    if not isinstance(body, dict):
+        return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+    try:
+        books = _books_from_body(body) or landmark_store.books()
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    try:
+        threshold_km = float(body.get("threshold_km", DEFAULT_THRESHOLD_KM))
+        min_similarity = float(body.get("min_similarity", DEFAULT_MIN_SIMILARITY))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "threshold_km and min_similarity must be numbers"}, status=400)
+    if not (math.isfinite(threshold_km) and threshold_km > 0):
+        return JsonResponse({"error": "threshold_km must be a positive number"}, status=400)
+    if not (math.isfinite(min_similarity) and 0 <= min_similarity <= 1):
+        return JsonResponse({"error": "min_similarity must be between 0 and 1"}, status=400)
+
+    clusters = find_overlaps(books, threshold_km, min_similarity)
+    total_ms = round((time.perf_counter() - t_start) * 1000, 2)
+
+    return JsonResponse({
+        "books_compared": len(books),
+        "landmarks_compared": sum(len(v) for v in books.values()),
+        "overlaps": clusters,
+        "total_ms": total_ms,
+    })
@@ -2,16 +2,21 @@
 PDF Processor — extracts text from uploaded PDFs, then uses Dedalus AI
 to identify real-world locations mentioned in the book and return them
 as GeoJSON-compatible features for the map.
+
+PyMuPDF is imported on first use: it is the slowest import in the app
+and most workers never see an upload.
 """
 
-import json
-import re
-import fitz  # PyMuPDF
-from core.dedalus_client import dedalus_chat
+from django.conf import settings
+from core import tracing
+from core.geojson_wire import point_coordinates
+from core.location_format import extract_locations, prompt_for
 
 
 def extract_text_from_pdf(pdf_bytes: bytes, max_pages: int = 100) -> str:
     """Extract plain text from PDF bytes, capped at max_pages."""
+    import fitz  # PyMuPDF
+
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     pages = min(len(doc), max_pages)    # determines number of pages to extract
     chunks = []
@@ -73,66 +78,33 @@ Rules:
 - Return ONLY the JSON array, no other text"""
 
 
-def _extract_complete_objects(text: str) -> list[dict]:
+def extract_locations_from_text(text: str, book_title: str = "Unknown",
+                                fmt: str | None = None) -> list[dict]:
     """
-    Extract complete JSON objects from a potentially truncated JSON array.
+    Use Dedalus AI to extract geographic locations from book text.
+    fmt is the reply format (see core/location_format.py), default
+    settings.EXTRACTION_FORMAT.
     """
-    objects = []
-    depth = 0
-    start = None
-    for i, ch in enumerate(text):
-        if ch == '{':
-            if depth == 0:
-                start = i
-            depth += 1
-        elif ch == '}':
-            depth -= 1
-            if depth == 0 and start is not None:
-                try:
-                    obj = json.loads(text[start:i + 1])
-                    objects.append(obj)
-                except json.JSONDecodeError:
-                    pass
-                start = None
-    return objects
-
-
-def extract_locations_from_text(text: str, book_title: str = "Unknown") -> list[dict]:
-    """Use Dedalus AI to extract geographic locations from book text."""
+    fmt = fmt or settings.EXTRACTION_FORMAT
     truncated = _truncate(text)
 
     user_msg = f"Book title: {book_title}\n\nText excerpt:\n{truncated}"
 
-    raw_response = dedalus_chat(
-        system_prompt=LOCATION_EXTRACTION_PROMPT,
-        user_message=user_msg,
-        max_tokens=4096,
+    return extract_locations(
+        prompt_for(LOCATION_EXTRACTION_PROMPT, fmt),
+        user_msg,
+        fmt,
+        book=book_title,
+        task="pdf_extraction",
     )
 
-    # Parse the JSON from the response
-    try:
-        # Strip markdown code fences if present
-        cleaned = raw_response.strip()
-        if cleaned.startswith("```"):
-            cleaned = re.sub(r'^```\w*\s*', '', cleaned)
-            cleaned = re.sub(r'\s*```\s*$', '', cleaned)
-
-        # First, try to parse the full cleaned text directly
-        try:
-            locations = json.loads(cleaned)
-        except json.JSONDecodeError:
-            # If the response was truncated, extract complete JSON objects
-            locations = _extract_complete_objects(cleaned)
-    except Exception:
-        return []
-
-    return locations
-
 
 def locations_to_geojson(locations: list[dict]) -> dict:
     """Convert extracted locations to a GeoJSON FeatureCollection.
     
     Sorts locations by relevance (highest first) and assigns rank 1-N.
+    Coordinates are converted to floats; locations without numeric
+    coordinates are dropped.
     """
     # Sort by relevance score (highest to lowest)
     sorted_locations = sorted(
@@ -142,12 +114,16 @@ def locations_to_geojson(locations: list[dict]) -> dict:
     )
     
     features = []
-    for rank, loc in enumerate(sorted_locations, start=1):
+    for loc in sorted_locations:
+        coordinates = point_coordinates(loc.get("coordinates", [0, 0]))
+        if coordinates is None:
+            continue
+        rank = len(features) + 1
         feature = {
             "type": "Feature",
             "geometry": {
                 "type": "Point",
-                "coordinates": loc.get("coordinates", [0, 0]),
+                "coordinates": coordinates,
             },
             "properties": {
                 "id": loc.get("id", "unknown"),
@@ -175,7 +151,9 @@ def process_pdf(pdf_bytes: bytes, book_title: str = "Unknown") -> dict:
     Full pipeline: PDF bytes → text extraction → AI location extraction → GeoJSON.
     Returns a dict with the GeoJSON and metadata.
     """
-    text = extract_text_from_pdf(pdf_bytes)
+    with tracing.span("pdf.extract_text", pdf_bytes=len(pdf_bytes)) as span:
+        text = extract_text_from_pdf(pdf_bytes)
+        span.set("chars", len(text))
 
     if not text.strip():
         return {
@@ -183,8 +161,10 @@ def process_pdf(pdf_bytes: bytes, book_title: str = "Unknown") -> dict:
             "geojson": {"type": "FeatureCollection", "features": []},
         }
 
-    locations = extract_locations_from_text(text, book_title)
-    geojson = locations_to_geojson(locations)
+    with tracing.span("pdf.extract_locations"):
+        locations = extract_locations_from_text(text, book_title)
+    with tracing.span("pdf.to_geojson", locations=len(locations)):
+        geojson = locations_to_geojson(locations)
 
     return {
         "book_title": book_title,
@@ -0,0 +1,117 @@
+"""
+Post-extraction prefetch — warm archivist insights for likely clicks.
+
+After /upload-book or /extract-from-title ranks a book's locations,
+users almost always click rank 1–3 next.  Each of those clicks would pay
+a full ArchivistAgent LLM call, so the pipelines queue the top
+PREFETCH_TOP_N insights on the low-priority "prefetch" background pool.
+The prompt is built exactly as /orchestrate builds it from feature_data,
+so the click finds the insight in the LLM cache.
+
+Prefetch is scoped to a client session (X-Session-Id header, or a
+generated id returned in the response).  The session lives in the cache
+for PREFETCH_SESSION_TTL seconds; DELETE /prefetch/<session_id> — sent
+by the frontend when the page goes away — ends it early, and queued work
+for an ended session is dropped before it reaches Dedalus.
+"""
+
+import hashlib
+import re
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from archivist.views import ARCHIVIST_SYSTEM_PROMPT, _archivist_curated, _insight_prompt
+from core import background, llm_scheduler
+from core.dedalus_client import cached_dedalus_chat, llm_cache_key
+
+
+_SESSION_PREFIX = "prefetch:session:"
+_SESSION_RE = re.compile(r"[A-Za-z0-9_-]{8,64}")
+
+
+def feature_id(properties: dict) -> str:
+    """Stable id for an extracted feature (LLM slugs are only unique per book)."""
+    raw = "\x1f".join(str(properties.get(k, "")) for k in ("book", "id", "title"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def feature_data(properties: dict) -> dict:
+    """The feature_data the frontend sends to /orchestrate for this feature."""
+    return {
+        k: properties.get(k)
+        for k in ("book", "quote", "historical_context", "year", "era", "title", "mood")
+    }
+
+
+def session_id_for(request) -> str:
+    """The client's session id, or a fresh one if it sent none (or a bad one)."""
+    session_id = request.headers.get("X-Session-Id") or request.POST.get("session_id", "")
+    if _SESSION_RE.fullmatch(session_id):
+        return session_id
+    return uuid.uuid4().hex
+
+
+def session_alive(session_id: str) -> bool:
+    return cache.get(_SESSION_PREFIX + session_id) is not None
+
+
+def _prefetch_one(session_id: str, system_prompt: str, user_message: str) -> None:
+    if not session_alive(session_id):
+        return
+    with llm_scheduler.priority(llm_scheduler.BACKGROUND):
+        cached_dedalus_chat(system_prompt, user_message, task="archivist_insight")
+
+
+def prefetch_insights(geojson: dict, session_id: str, top_n: int | None = None) -> dict:
+    """
+    Queue archivist insights for the top_n ranked features of a freshly
+    extracted book.  Returns {"session_id", "queued", "warm"} with the
+    feature ids in each state.
+    """
+    top_n = settings.PREFETCH_TOP_N if top_n is None else top_n
+    cache.set(_SESSION_PREFIX + session_id, True, settings.PREFETCH_SESSION_TTL)
+
+    features = sorted(
+        geojson.get("features", []),
+        key=lambda f: f["properties"].get("rank", float("inf")),
+    )[:top_n]
+
+    queued, warm = [], []
+    for feature in features:
+        props = feature["properties"]
+        fid = feature_id(props)
+        curated = _archivist_curated(props.get("id", "unknown"), feature_data(props))
+        user_message = _insight_prompt(curated)
+        key = llm_cache_key(ARCHIVIST_SYSTEM_PROMPT, user_message)
+
+        if cache.get(key) is not None:
+            warm.append(fid)
+            continue
+        background.submit(
+            f"prefetch:{session_id}:{key}", _prefetch_one,
+            session_id, ARCHIVIST_SYSTEM_PROMPT, user_message,
+            pool="prefetch",
+        )
+        queued.append(fid)
+
+    return {"session_id": session_id, "queued": queued, "warm": warm}
+
+
+@csrf_exempt
+@require_http_methods(["DELETE"])
+def cancel_prefetch(request, session_id: str):
+    """
+    DELETE /prefetch/<session_id>
+
+    Ends the session: prefetch work not yet started is dropped.
+    Returns { "session_id": "...", "cancelled": true|false }.
+    """
+    key = _SESSION_PREFIX + session_id
+    cancelled = cache.get(key) is not None
+    cache.delete(key)
+    return JsonResponse({"session_id": session_id, "cancelled": cancelled})
@@ -0,0 +1,300 @@
+"""
+On-demand request profiling — cProfile and tracemalloc for chosen requests.
+
+ProfilingMiddleware (core/middleware.py) profiles a request when it
+carries "X-Profile-Token: <PROFILING_TOKEN>", or at random for a
+PROFILE_SAMPLE_RATE share of all requests.  With neither configured the
+middleware removes itself at startup, so there is no cost at all.
+
+A profiled request runs under cProfile in the request thread and in
+every bulkhead thread it hands work to (core/executor.py calls
+thread_profile() around each call), so /upload-book's PyMuPDF and
+parsing time shows up instead of one long wait on a future.  From
+Python 3.12 cProfile is process-wide — one profiler sees every thread —
+so only one request is profiled at a time (others are served
+unprofiled) and its profile includes whatever else ran meanwhile.
+tracemalloc is process-wide on every version, so requests profiled at
+the same time see each other's allocations.
+
+Each profile is written to PROFILE_DIR as <id>.prof (pstats, for
+`python -m pstats` or snakeviz) and <id>.json (the request, top
+functions by cumulative time and top allocation sites).  The id is the
+request time plus its request id (the trace's, with tracing on), and is
+returned in X-Profile-Id.  Only the newest PROFILE_MAX_FILES profiles
+are kept.
+
+Admin endpoints, which need the same X-Profile-Token header:
+  GET /profiles               list of profiles, newest first
+  GET /profiles/<id>          one profile's summary
+  GET /profiles/<id>/pstats   download the .prof file
+"""
+
+import contextvars
+import cProfile
+import hmac
+import json
+import logging
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse
+from django.views.decorators.http import require_GET
+
+from core import tracing
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = "X-Profile-Token"
+
+_ID_RE = re.compile(r"^[A-Za-z0-9-]{1,80}$")
+
+_active: contextvars.ContextVar["_Session | None"] = contextvars.ContextVar("profile_session", default=None)
+
+# cProfile on sys.monitoring: one active profiler, covering all threads.
+_PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def enabled() -> bool:
+    return bool(settings.PROFILING_TOKEN) or settings.PROFILE_SAMPLE_RATE > 0
+
+
+def _token_ok(request) -> bool:
+    token = settings.PROFILING_TOKEN
+    given = request.headers.get(TOKEN_HEADER, "")
+    return bool(token) and hmac.compare_digest(given.encode(), token.encode())
+
+
+def trigger(request) -> str | None:
+    """Why this request should be profiled ("header" / "sampled"), or None."""
+    if request.headers.get(TOKEN_HEADER) and _token_ok(request):
+        return "header"
+    if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+class _Session:
+    def __init__(self, request, reason: str):
+        request_id = tracing.current_request_id() or request.headers.get("X-Request-Id", "")
+        if not _ID_RE.match(request_id) or len(request_id) > 40:
+            request_id = uuid.uuid4().hex[:16]
+        self.id = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}"
+        self.reason = reason
+        self.request = request
+        self.profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+
+@contextmanager
+def thread_profile():
+    """Profile the enclosed code if it runs on behalf of a profiled request."""
+    session = _active.get()
+    if session is None or _PROCESS_WIDE_PROFILER:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        session.add(profile)
+
+
+def _start_tracemalloc() -> bool:
+    """Start tracing (shared between concurrent profiled requests).
+    Returns False if something else already started it."""
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and tracemalloc.is_tracing():
+            return False
+        if _tracemalloc_users == 0:
+            tracemalloc.start(settings.PROFILE_TRACEMALLOC_FRAMES)
+        _tracemalloc_users += 1
+        return True
+
+
+def _stop_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+def profile_request(request, reason: str, get_response):
+    """Run get_response(request) under the profilers and save the result."""
+    session = _Session(request, reason)
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+: another request is being profiled.
+        logger.info("Profiler busy; serving %s unprofiled", request.path)
+        return get_response(request)
+    session.add(profile)
+
+    owns_tracemalloc = _start_tracemalloc()
+    token = _active.set(session)
+    t0 = time.perf_counter()
+    try:
+        try:
+            response = get_response(request)
+        finally:
+            profile.disable()
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+    finally:
+        _active.reset(token)
+        if owns_tracemalloc:
+            _stop_tracemalloc()
+
+    try:
+        _save(session, response.status_code, elapsed_ms, snapshot, traced)
+    except OSError:
+        logger.exception("Could not write profile %s", session.id)
+    else:
+        response["X-Profile-Id"] = session.id
+    return response
+
+
+def _save(session: _Session, status: int, elapsed_ms: float, snapshot, traced) -> None:
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stats = pstats.Stats(*session.profiles)
+    stats.dump_stats(directory / f"{session.id}.prof")
+
+    top_n = settings.PROFILE_TOP_N
+    functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+    allocations = []
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:top_n]:
+            frame = stat.traceback[0]
+            allocations.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_kib": round(stat.size / 1024, 1),
+                "count": stat.count,
+            })
+
+    summary = {
+        "id": session.id,
+        "method": session.request.method,
+        "path": session.request.path,
+        "status": status,
+        "trigger": session.reason,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "created": time.time(),
+        "top_functions": [
+            {
+                "function": pstats.func_std_string(func),
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000, 2),
+                "cumtime_ms": round(cumtime * 1000, 2),
+            }
+            for func, (_cc, ncalls, tottime, cumtime, _callers) in functions
+        ],
+        "memory": {
+            "traced_kib": round(traced[0] / 1024, 1) if traced else None,
+            "peak_kib": round(traced[1] / 1024, 1) if traced else None,
+            "top_allocations": allocations,
+        },
+    }
+    (directory / f"{session.id}.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    _prune(directory)
+
+
+def _prune(directory: Path) -> None:
+    summaries = sorted(directory.glob("*.json"), reverse=True)
+    for old in summaries[settings.PROFILE_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def _profile_path(profile_id: str, suffix: str) -> Path:
+    if not _ID_RE.match(profile_id):
+        raise Http404("No such profile")
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}{suffix}"
+    if not path.is_file():
+        raise Http404("No such profile")
+    return path
+
+
+def _admin_only(view):
+    def wrapper(request, *args, **kwargs):
+        if not settings.PROFILING_TOKEN:
+            raise Http404("Profiling is not enabled")
+        if not _token_ok(request):
+            return JsonResponse({"error": f"{TOKEN_HEADER} header required"}, status=403)
+        return view(request, *args, **kwargs)
+    wrapper.__doc__ = view.__doc__
+    return wrapper
+
+
+@require_GET
+@_admin_only
+def list_profiles(request):
+    """
+    GET /profiles
+    Header: X-Profile-Token
+
+    Saved profiles, newest first, without their function and allocation lists.
+    """
+    profiles = []
+    for path in sorted(Path(settings.PROFILE_DIR).glob("*.json"), reverse=True):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        profiles.append({
+            key: summary.get(key)
+            for key in ("id", "method", "path", "status", "trigger", "elapsed_ms", "created")
+        })
+    return JsonResponse({"profiles": profiles})
+
+
+@require_GET
+@_admin_only
+def profile_detail(request, profile_id: str):
+    """
+    GET /profiles/<id>
+    Header: X-Profile-Token
+    """
+    path = _profile_path(profile_id, ".json")
+    return JsonResponse(json.loads(path.read_text(encoding="utf-8")))
+
+
+@require_GET
+@_admin_only
+def profile_pstats(request, profile_id: str):
+    """
+    GET /profiles/<id>/pstats
+    Header: X-Profile-Token
+
+    The raw pstats file: `python -m pstats <id>.prof` or `snakeviz <id>.prof`.
+    """
+    path = _profile_path(profile_id, ".prof")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name,
+                        content_type="application/octet-stream")
@@ -16,6 +16,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
 from archivist.knowledge_base import KNOWLEDGE_BASE
+from core import metrics
 from core.dedalus_client import dedalus_chat
 
 
@@ -72,7 +73,7 @@ def vibe_search(request):
     )
 
     t0 = time.perf_counter()
-    raw_response = dedalus_chat(SEARCH_SYSTEM_PROMPT, user_msg, max_tokens=600)
+    raw_response = dedalus_chat(SEARCH_SYSTEM_PROMPT, user_msg, max_tokens=600, task="vibe_search")
     ai_ms = round((time.perf_counter() - t0) * 1000)
 
     # Parse the AI response
@@ -101,6 +102,12 @@ def vibe_search(request):
         # Fallback: return all landmarks
         pass
 
+    metrics.observe_timeline([{
+        "agent": "SemanticSearchAgent",
+        "tool": "vibe_search",
+        "status": "success" if matches else "no_match",
+        "elapsed_ms": ai_ms,
+    }])
     total_ms = round((time.perf_counter() - t_start) * 1000)
 
     return JsonResponse({
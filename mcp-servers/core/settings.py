@@ -23,17 +23,22 @@ INSTALLED_APPS = [
     "librarian",
     "linguist",
     "stylist",
+    "core",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.TracingMiddleware",
+    "core.middleware.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.middleware.common.CommonMiddleware",
 ]
 
 # Wide-open CORS for hackathon dev
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_METHODS = ["DELETE", "GET", "OPTIONS", "PATCH", "POST", "PUT"]
-CORS_ALLOW_HEADERS = ["accept", "content-type", "origin", "authorization", "x-requested-with"]
+CORS_ALLOW_HEADERS = ["accept", "content-type", "origin", "authorization", "x-requested-with", "x-session-id"]
 
 ROOT_URLCONF = "core.urls"
 
@@ -43,5 +48,170 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # ── Dedalus Labs ────────────────────────────────────────────────────────
 DEDALUS_API_KEY = os.environ.get("DEDALUS_API_KEY", "")
-DEDALUS_BASE_URL = "https://api.dedaluslabs.ai"
+# Point at benchmarks/fake_dedalus.py (e.g. http://127.0.0.1:8765) for load tests.
+DEDALUS_BASE_URL = os.environ.get("DEDALUS_BASE_URL", "https://api.dedaluslabs.ai").rstrip("/")
 DEDALUS_MODEL = os.environ.get("DEDALUS_MODEL", "openai/gpt-4o")
+DEDALUS_TIMEOUT = float(os.environ.get("DEDALUS_TIMEOUT", "30"))
+
+# ── Upstream circuit breakers (core/circuit.py) ─────────────────────────
+# Open when, over >= min_calls in the last window_s, failure_ratio of
+# calls fail or slow_ratio take >= slow_call_ms; probe again after open_s.
+CIRCUIT_BREAKERS = {
+    "dedalus": {
+        "window_s": 60, "min_calls": 5, "failure_ratio": 0.5,
+        "slow_call_ms": 15000, "slow_ratio": 0.5, "open_s": 30,
+    },
+    "openlibrary": {
+        "window_s": 60, "min_calls": 5, "failure_ratio": 0.5,
+        "slow_call_ms": 5000, "slow_ratio": 0.5, "open_s": 30,
+    },
+}
+
+# ── LLM scheduler (core/llm_scheduler.py) ──────────────────────────────
+# Global Dedalus concurrency and tokens-per-minute budget (0 = unlimited),
+# shared by priority class with weighted fair queuing.
+LLM_SCHEDULER = {
+    "max_concurrency": int(os.environ.get("LLM_MAX_CONCURRENCY", "8")),
+    "tokens_per_minute": int(os.environ.get("LLM_TOKENS_PER_MINUTE", "0")),
+    "classes": {
+        "interactive": {"weight": 8, "max_wait_s": 10},
+        "background": {"weight": 2, "max_wait_s": 120},
+        "bulk": {"weight": 1, "max_wait_s": 300},
+    },
+}
+
+# ── Model routing (core/model_router.py) ────────────────────────────────
+# Each tier is a model with its own request timeout (seconds); a tier is
+# "slow" while its rolling p90 latency exceeds slow_ms.  Each task lists
+# tiers in order of preference — the first one not slow is used, else the
+# last — and may cap max_tokens.
+LLM_TIERS = {
+    "quality": {
+        "model": DEDALUS_MODEL,
+        "timeout": DEDALUS_TIMEOUT,
+        "slow_ms": int(os.environ.get("LLM_QUALITY_SLOW_MS", "8000")),
+    },
+    "fast": {
+        "model": os.environ.get("DEDALUS_FAST_MODEL", "openai/gpt-4o-mini"),
+        "timeout": float(os.environ.get("DEDALUS_FAST_TIMEOUT", "10")),
+        "slow_ms": int(os.environ.get("LLM_FAST_SLOW_MS", "4000")),
+    },
+}
+LLM_ROUTES = {
+    "archivist_insight": {"tiers": ["quality", "fast"]},
+    "synthesis": {"tiers": ["quality", "fast"]},
+    "fused": {"tiers": ["quality", "fast"]},
+    "dialect_profile": {"tiers": ["quality", "fast"]},
+    "dialect_blurb": {"tiers": ["fast"], "max_tokens": 160},
+    "style_suggestion": {"tiers": ["fast"], "max_tokens": 160},
+    "chat": {"tiers": ["quality", "fast"]},
+    "vibe_search": {"tiers": ["fast"]},
+    "pdf_extraction": {"tiers": ["quality"]},
+    "title_extraction": {"tiers": ["quality"]},
+    "default": {"tiers": ["quality"]},
+}
+
+# ── Open Library (LibrarianAgent) ───────────────────────────────────────
+# Override to point at a stub (see benchmarks/bench_load.py).
+OPEN_LIBRARY_BASE_URL = os.environ.get("OPEN_LIBRARY_BASE_URL", "https://openlibrary.org").rstrip("/")
+# How long successful Open Library searches are kept to serve while it is down.
+LIBRARIAN_CACHE_TTL = int(os.environ.get("LIBRARIAN_CACHE_TTL", str(7 * 24 * 3600)))
+
+# ── Orchestration (core/conductor.py) ───────────────────────────────────
+# "fanout" (one LLM call per agent + synthesis) or "fused" (one call total)
+ORCHESTRATE_MODE = os.environ.get("ORCHESTRATE_MODE", "fanout")
+# Default /orchestrate latency budget in ms (0 = wait for every agent),
+# and the least budget left for which synthesis is still attempted.
+ORCHESTRATE_DEADLINE_MS = int(os.environ.get("ORCHESTRATE_DEADLINE_MS", "0"))
+SYNTHESIS_MIN_BUDGET_MS = int(os.environ.get("SYNTHESIS_MIN_BUDGET_MS", "1500"))
+
+# ── Map tiles ───────────────────────────────────────────────────────────
+TILE_CACHE_DIR = os.environ.get("TILE_CACHE_DIR", str(BASE_DIR / "var" / "tiles"))
+TILE_CACHE_MAX_AGE = int(os.environ.get("TILE_CACHE_MAX_AGE", "300"))
+# Landmark-store versions kept on disk; older tile directories are deleted.
+# Each worker has its own store, so keep at least one per worker.
+TILE_CACHE_VERSIONS = int(os.environ.get("TILE_CACHE_VERSIONS", "4"))
+
+# ── Response compression ────────────────────────────────────────────────
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+
+# ── Caching ─────────────────────────────────────────────────────────────
+# LocMemCache is per-process; point CACHE_BACKEND at a shared backend
+# (e.g. django.core.cache.backends.filebased.FileBasedCache, which
+# render.yaml uses) to share enrichment and deferred-field handles
+# between gunicorn workers.
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get(
+            "CACHE_LOCATION",
+            str(BASE_DIR / "var" / "cache") if CACHE_BACKEND.endswith("FileBasedCache") else "literary-map",
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+}
+ENRICHMENT_CACHE_TTL = int(os.environ.get("ENRICHMENT_CACHE_TTL", str(24 * 3600)))
+ENRICHMENT_CACHE_MAX_AGE = int(os.environ.get("ENRICHMENT_CACHE_MAX_AGE", "3600"))
+CURATED_CACHE_MAX_AGE = int(os.environ.get("CURATED_CACHE_MAX_AGE", "86400"))
+
+# ── LinguistAgent ───────────────────────────────────────────────────────
+ERA_REGISTRY_PATH = os.environ.get("ERA_REGISTRY_PATH", str(BASE_DIR / "var" / "era_registry.json"))
+
+# ── Background enrichment ───────────────────────────────────────────────
+BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", "4"))
+# Most tasks queued or running per background pool; beyond it new work is dropped.
+BACKGROUND_QUEUE_MAX = int(os.environ.get("BACKGROUND_QUEUE_MAX", "200"))
+# How long a deferred-field handle (GET /enrichment/<handle>) stays valid.
+DEFERRED_HANDLE_TTL = int(os.environ.get("DEFERRED_HANDLE_TTL", "600"))
+
+# ── Cache warmer (core/warmer.py, `manage.py warm_cache`) ───────────────
+CACHE_WARMER_ON_STARTUP = os.environ.get("CACHE_WARMER_ON_STARTUP", "False").lower() in ("true", "1", "yes")
+CACHE_WARMER_INTERVAL = int(os.environ.get("CACHE_WARMER_INTERVAL", "3600"))
+CACHE_WARMER_CONCURRENCY = int(os.environ.get("CACHE_WARMER_CONCURRENCY", "2"))
+
+# ── Location extraction (core/location_format.py) ───────────────────────
+# Reply format the PDF and title pipelines ask for: "compact" (one
+# "|"-separated line per location) or "json" (the original object array).
+EXTRACTION_FORMAT = os.environ.get("EXTRACTION_FORMAT", "compact")
+# Follow-up requests for a reply cut off at max_tokens.
+EXTRACTION_MAX_CONTINUATIONS = int(os.environ.get("EXTRACTION_MAX_CONTINUATIONS", "2"))
+
+# ── Post-extraction prefetch (core/prefetch.py) ─────────────────────────
+PREFETCH_TOP_N = int(os.environ.get("PREFETCH_TOP_N", "3"))
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "1"))
+PREFETCH_SESSION_TTL = int(os.environ.get("PREFETCH_SESSION_TTL", "900"))
+
+# ── Request profiling (core/profiling.py) ──────────────────────────────
+# Requests carrying "X-Profile-Token: <PROFILING_TOKEN>" are profiled, and
+# so is a PROFILE_SAMPLE_RATE share (0-1) of all requests.  With neither
+# set the profiling middleware is not installed.  The token also guards
+# GET /profiles.
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", str(BASE_DIR / "var" / "profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "50"))
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "40"))
+PROFILE_TRACEMALLOC_FRAMES = int(os.environ.get("PROFILE_TRACEMALLOC_FRAMES", "1"))
+
+# ── Request tracing (core/tracing.py) ───────────────────────────────────
+# Spans of requests slower than TRACE_MIN_MS are appended as OTLP/JSON
+# lines to TRACE_FILE with the worker's pid added ("spans.<pid>.jsonl"),
+# rotated at TRACE_MAX_BYTES.
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "False").lower() in ("true", "1", "yes")
+TRACE_FILE = os.environ.get("TRACE_FILE", str(BASE_DIR / "var" / "traces" / "spans.jsonl"))
+TRACE_MAX_BYTES = int(os.environ.get("TRACE_MAX_BYTES", str(20 * 1024 * 1024)))
+TRACE_BACKUP_COUNT = int(os.environ.get("TRACE_BACKUP_COUNT", "5"))
+TRACE_MIN_MS = float(os.environ.get("TRACE_MIN_MS", "0"))
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "literary-map-mcp")
+
+# ── Agent bulkheads (core/executor.py) ──────────────────────────────────
+# Per-process thread limit and fail-fast queue depth for each kind of
+# synchronous agent work.
+AGENT_BULKHEADS = {
+    "archivist": {"max_concurrent": 8, "max_queue": 16},
+    "linguist": {"max_concurrent": 8, "max_queue": 16},
+    "stylist": {"max_concurrent": 4, "max_queue": 16},
+    "synthesis": {"max_concurrent": 8, "max_queue": 16},
+    "extraction": {"max_concurrent": 2, "max_queue": 2},
+}
@@ -0,0 +1,39 @@
+"""
+Serving-process start-up — what to load before the first request and
+what to start in each worker.
+
+core/wsgi.py calls preload() when the app is loaded.  It imports the
+URLconf (every view and the curated data behind it) and builds the
+landmark cluster index, work that would otherwise land on each worker's
+first request.  Under `gunicorn --preload` (render.yaml) that happens
+once in the master process, and the workers share it copy-on-write;
+gunicorn.conf.py freezes the garbage collector's view of those objects
+before forking so collections don't dirty the shared pages.
+
+Heavy dependencies that only some requests need — PyMuPDF, httpx — are
+imported on first use instead, so they stay out of this path.
+
+Threads don't survive fork, so background services start per worker:
+gunicorn.conf.py calls start_worker_services() in each one, and
+CoreConfig.ready() does it for `manage.py runserver`.
+"""
+
+from django.conf import settings
+
+
+def preload() -> None:
+    from django.urls import get_resolver
+
+    from core import clustering
+    from linguist import era_registry
+
+    get_resolver().url_patterns
+    clustering.get_index()
+    era_registry.all_entries()
+
+
+def start_worker_services() -> None:
+    if settings.CACHE_WARMER_ON_STARTUP:
+        from core.warmer import start_background_warmer
+
+        start_background_warmer()
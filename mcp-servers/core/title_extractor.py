@@ -8,10 +8,12 @@ associated with a given book.
 """
 
 import json
-import re
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from core.dedalus_client import dedalus_chat
+from core import executor, landmark_store, llm_scheduler, prefetch
+from core.geojson_wire import geojson_response
+from core.location_format import extract_locations, prompt_for
 from core.pdf_processor import locations_to_geojson
 
 
@@ -65,34 +67,14 @@ Rules:
 - Return ONLY the JSON array, no other text"""
 
 
-def _extract_complete_objects(text: str) -> list[dict]:
+def extract_locations_from_title(title: str, author: str = "", year: str = "",
+                                 fmt: str | None = None) -> list[dict]:
     """
-    Extract complete JSON objects from a potentially truncated JSON array.
-    Handles the common case where the AI response is cut off mid-object.
+    Use Dedalus AI to identify geographic locations from a book title.
+    fmt is the reply format (see core/location_format.py), default
+    settings.EXTRACTION_FORMAT.
     """
-    # Find all complete JSON objects {...}
-    objects = []
-    depth = 0
-    start = None
-    for i, ch in enumerate(text):
-        if ch == '{':
-            if depth == 0:
-                start = i
-            depth += 1
-        elif ch == '}':
-            depth -= 1
-            if depth == 0 and start is not None:
-                try:
-                    obj = json.loads(text[start:i + 1])
-                    objects.append(obj)
-                except json.JSONDecodeError:
-                    pass
-                start = None
-    return objects
-
-
-def extract_locations_from_title(title: str, author: str = "", year: str = "") -> list[dict]:
-    """Use Dedalus AI to identify geographic locations from a book title."""
+    fmt = fmt or settings.EXTRACTION_FORMAT
     parts = [f"Book title: {title}"]
     if author:
         parts.append(f"Author: {author}")
@@ -101,39 +83,14 @@ def extract_locations_from_title(title: str, author: str = "", year: str = "") -
 
     user_msg = "\n".join(parts)
 
-    raw_response = dedalus_chat(
-        system_prompt=TITLE_EXTRACTION_PROMPT,
-        user_message=user_msg,
-        max_tokens=4096,
+    return extract_locations(
+        prompt_for(TITLE_EXTRACTION_PROMPT, fmt),
+        user_msg,
+        fmt,
+        book=title,
+        task="title_extraction",
     )
 
-    # Parse the JSON from the response
-    try:
-        # Strip markdown code fences if present
-        cleaned = raw_response.strip()
-        if cleaned.startswith("```"):
-            # Remove opening fence (```json or ```)
-            cleaned = re.sub(r'^```\w*\s*', '', cleaned)
-            # Remove closing fence
-            cleaned = re.sub(r'\s*```\s*$', '', cleaned)
-
-        # First, try to parse the full cleaned text directly
-        try:
-            locations = json.loads(cleaned)
-        except json.JSONDecodeError:
-            # If the response was truncated (common with AI), try to repair it
-            # by finding complete JSON objects within a partial array
-            locations = _extract_complete_objects(cleaned)
-    except Exception:
-        return []
-
-    # Ensure the book field is set correctly
-    for loc in locations:
-        if not loc.get("book"):
-            loc["book"] = title
-
-    return locations
-
 
 @csrf_exempt
 def extract_from_title(request):
@@ -141,6 +98,8 @@ def extract_from_title(request):
     POST /extract-from-title
     Content-Type: application/json
     Body: { "title": "...", "author": "...", "year": "..." }
+    Optional X-Session-Id header scopes the archivist prefetch for the
+    top-ranked locations.
 
     Returns GeoJSON FeatureCollection of locations associated with the book.
     """
@@ -160,14 +119,24 @@ def extract_from_title(request):
     year = str(body.get("year", "")).strip()
 
     try:
-        locations = extract_locations_from_title(title, author, year)
+        with llm_scheduler.priority(llm_scheduler.BULK):
+            locations = executor.bulkhead("extraction").run(
+                extract_locations_from_title, title, author, year
+            )
         geojson = locations_to_geojson(locations)
+    except executor.BulkheadFull as exc:
+        return JsonResponse({"error": f"Too many extractions in progress: {exc}"}, status=503)
     except Exception as exc:
         return JsonResponse({"error": f"Extraction failed: {exc}"}, status=500)
 
-    return JsonResponse({
+    payload = {
         "book_title": title,
         "author": author or None,
         "locations_found": len(locations),
         "geojson": geojson,
-    })
+    }
+    if geojson["features"]:
+        landmark_store.add_book(title, geojson)
+        payload["prefetch"] = prefetch.prefetch_insights(geojson, prefetch.session_id_for(request))
+
+    return geojson_response(request, payload)
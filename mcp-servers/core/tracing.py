@@ -0,0 +1,346 @@
+"""
+Request tracing — nested spans written as OTLP/JSON lines.
+
+TracingMiddleware (core/middleware.py) opens a server span for every
+request; code below it opens child spans with
+
+    with tracing.span("pdf.extract_text", pages=n) as sp:
+        ...
+        sp.set("chars", len(text))
+
+The current span lives in a context variable, so spans opened in a
+bulkhead or background thread (core/executor.py and core/background.py
+run work in a copy of the caller's context) nest under the request that
+started the work.  Instrumented: agents, Dedalus calls (scheduler wait,
+then the HTTP exchange split into connect / send / wait-for-response /
+read-body from httpcore's debug events), Open Library calls, the PDF
+and title pipelines and LLM cache lookups.
+
+When a request finishes its spans are written as one line of OTLP/JSON
+(the shape the OpenTelemetry Collector's otlpjsonfile receiver reads) to
+a per-process copy of TRACE_FILE ("spans.jsonl" -> "spans.<pid>.jsonl"),
+rotated at TRACE_MAX_BYTES; file rotation is not safe across gunicorn
+workers, so each one writes and rotates its own file.  Files left by
+processes that have exited are deleted when a process starts writing,
+so worker restarts don't pile them up.  Only requests slower than
+TRACE_MIN_MS are kept; spans that end after their request has (deferred
+enrichment, prefetch) follow on later lines.  An incoming W3C
+`traceparent` header continues the caller's trace.  Responses carry
+X-Request-Id (the caller's, if it sent a sane one) and X-Trace-Id.
+
+With TRACING_ENABLED off the middleware is not installed and span() is
+a context-variable read.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9-]{1,40}$")
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP SpanKind / StatusCode values.
+KINDS = {"INTERNAL": 1, "SERVER": 2, "CLIENT": 3}
+_STATUS_ERROR = 2
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("current_span", default=None)
+
+_exporter = logging.getLogger("core.tracing.spans")
+_install_lock = threading.Lock()
+_installed = False
+
+
+class _Trace:
+    """The spans of one request, buffered until its server span ends."""
+
+    def __init__(self, trace_id: str, request_id: str):
+        self.trace_id = trace_id
+        self.request_id = request_id
+        self.spans: list[Span] = []
+        self.kept: bool | None = None   # decided when the root span ends
+        self._lock = threading.Lock()
+
+    def finish(self, span: "Span", root: bool) -> None:
+        with self._lock:
+            if self.kept is None:
+                self.spans.append(span)
+                if not root:
+                    return
+                self.kept = (span.end_ns - span.start_ns) / 1e6 >= settings.TRACE_MIN_MS
+                spans, self.spans = self.spans, []
+            elif self.kept:
+                spans = [span]
+            else:
+                return
+        if self.kept:
+            _export(spans)
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "attributes",
+                 "start_ns", "end_ns", "error", "_t0", "_root")
+
+    def __init__(self, trace: _Trace, name: str, kind: str, parent_id: str | None,
+                 attributes: dict, root: bool = False):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = {"thread.name": threading.current_thread().name, **attributes}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self._t0 = time.perf_counter_ns()
+        self._root = root
+
+    def set(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def fail(self, error: BaseException | str) -> None:
+        """Mark the span as failed without raising out of it."""
+        self.error = str(error) or type(error).__name__
+
+    def end(self, error: BaseException | str | None = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._t0)
+        if error is not None:
+            self.fail(error)
+        self.trace.finish(self, self._root)
+
+
+class _NoSpan:
+    """Stands in for a span when nothing is being traced."""
+
+    def set(self, key: str, value) -> None:
+        pass
+
+    def fail(self, error) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+def start_span(name: str, kind: str = "INTERNAL", **attributes) -> Span | None:
+    """A child of the current span, or None outside a traced request.
+    The caller must end() it; it does not become the current span."""
+    parent = _current.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, kind, parent.span_id, attributes)
+
+
+@contextmanager
+def span(name: str, kind: str = "INTERNAL", **attributes):
+    """Run the block in a child span of the current one (a no-op, yielding
+    NO_SPAN, outside a traced request)."""
+    parent = _current.get()
+    if parent is None:
+        yield NO_SPAN
+        return
+    child = Span(parent.trace, name, kind, parent.span_id, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.end(exc)
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+@contextmanager
+def server_span(request):
+    """The root span of one request, continuing an incoming traceparent."""
+    request_id = request.headers.get("X-Request-Id", "")
+    if not _REQUEST_ID_RE.match(request_id):
+        request_id = secrets.token_hex(8)
+    match = _TRACEPARENT_RE.match(request.headers.get("traceparent", ""))
+    trace_id, parent_id = match.groups() if match else (secrets.token_hex(16), None)
+
+    root = Span(_Trace(trace_id, request_id), f"{request.method} {request.path}", "SERVER",
+                parent_id, {"http.request.method": request.method, "url.path": request.path,
+                            "request.id": request_id}, root=True)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.end(exc)
+        raise
+    finally:
+        _current.reset(token)
+        root.end()
+
+
+def current_request_id() -> str | None:
+    current = _current.get()
+    return current.trace.request_id if current is not None else None
+
+
+# ── httpcore events → HTTP phase spans ──────────────────────────────
+
+class _HttpPhases(logging.Handler):
+    """
+    Turns httpcore's debug events ("connect_tcp.started",
+    "receive_response_headers.complete", ...) into child spans of the
+    current span, so an upstream call shows connect, send, waiting for
+    the response (generation, for Dedalus) and reading the body.
+    """
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self._open = threading.local()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        event = record.getMessage().split(" ", 1)[0]
+        phase, _, state = event.rpartition(".")
+        if not phase:
+            return
+        name = f"http.{phase}"
+        open_spans = self._open.__dict__.setdefault("spans", {})
+        if state == "started":
+            child = start_span(name)
+            if child is not None:
+                open_spans[name] = child
+        elif state in ("complete", "failed"):
+            child = open_spans.pop(name, None)
+            if child is not None:
+                child.end("failed" if state == "failed" else None)
+
+
+# ── Export ──────────────────────────────────────────────────────────
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _prune_dead(template: Path) -> None:
+    """Delete "<stem>.<pid><suffix>*" files whose process has exited."""
+    pattern = re.compile(rf"^{re.escape(template.stem)}\.(\d+){re.escape(template.suffix)}(\.\d+)?$")
+    try:
+        candidates = list(template.parent.iterdir())
+    except FileNotFoundError:
+        return
+    for path in candidates:
+        match = pattern.match(path.name)
+        if match and not _pid_alive(int(match.group(1))):
+            path.unlink(missing_ok=True)
+
+
+class _PerProcessFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    A RotatingFileHandler on "<stem>.<pid><suffix>".  The pid is checked
+    on every write: with gunicorn --preload the handler is created in the
+    master, and each forked worker must switch to a file of its own.
+    """
+
+    def __init__(self, path: Path, **kwargs):
+        self._template = path
+        self._pid = os.getpid()
+        super().__init__(self._path_for(self._pid), delay=True, **kwargs)
+        _prune_dead(path)
+
+    def _path_for(self, pid: int) -> Path:
+        return self._template.with_name(f"{self._template.stem}.{pid}{self._template.suffix}")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        pid = os.getpid()
+        if pid != self._pid:
+            self.acquire()
+            try:
+                if pid != self._pid:
+                    if self.stream is not None:
+                        self.stream.close()
+                        self.stream = None
+                    self.baseFilename = os.path.abspath(self._path_for(pid))
+                    self._pid = pid
+                    _prune_dead(self._template)
+            finally:
+                self.release()
+        super().emit(record)
+
+
+def _value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(sp: Span) -> dict:
+    data = {
+        "traceId": sp.trace.trace_id,
+        "spanId": sp.span_id,
+        "name": sp.name,
+        "kind": KINDS[sp.kind],
+        "startTimeUnixNano": str(sp.start_ns),
+        "endTimeUnixNano": str(sp.end_ns),
+        "attributes": [{"key": k, "value": _value(v)} for k, v in sp.attributes.items() if v is not None],
+        "status": {"code": _STATUS_ERROR, "message": sp.error} if sp.error else {},
+    }
+    if sp.parent_id:
+        data["parentSpanId"] = sp.parent_id
+    return data
+
+
+def _export(spans: list[Span]) -> None:
+    line = {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "core.tracing"},
+                "spans": [_otlp_span(sp) for sp in spans],
+            }],
+        }],
+    }
+    _exporter.info(json.dumps(line, separators=(",", ":")))
+
+
+def install() -> None:
+    """Set up the rotating span file and the httpcore phase handler (once)."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        path = Path(settings.TRACE_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = _PerProcessFileHandler(
+            path, maxBytes=settings.TRACE_MAX_BYTES, backupCount=settings.TRACE_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _exporter.addHandler(handler)
+        _exporter.setLevel(logging.INFO)
+        _exporter.propagate = False
+
+        # httpcore only emits its events with DEBUG enabled on its loggers.
+        httpcore_logger = logging.getLogger("httpcore")
+        httpcore_logger.addHandler(_HttpPhases())
+        httpcore_logger.setLevel(logging.DEBUG)
+        _installed = True
@@ -5,6 +5,8 @@ Upload endpoint — accepts a PDF file and returns GeoJSON locations.
 import json
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from core import executor, landmark_store, llm_scheduler, prefetch
+from core.geojson_wire import geojson_response
 from core.pdf_processor import process_pdf
 
 
@@ -16,6 +18,8 @@ def upload_book(request):
     Fields:
       - file: PDF file
       - title: (optional) book title string
+      - session_id: (optional, or X-Session-Id header) scopes the
+        archivist prefetch for the top-ranked locations
 
     Returns GeoJSON FeatureCollection of extracted locations.
     """
@@ -39,8 +43,17 @@ def upload_book(request):
     pdf_bytes = pdf_file.read()
 
     try:
-        result = process_pdf(pdf_bytes, book_title=title)
+        with llm_scheduler.priority(llm_scheduler.BULK):
+            result = executor.bulkhead("extraction").run(process_pdf, pdf_bytes, title)
+    except executor.BulkheadFull as exc:
+        return JsonResponse({"error": f"Too many uploads in progress: {exc}"}, status=503)
     except Exception as exc:
         return JsonResponse({"error": f"Processing failed: {exc}"}, status=500)
 
-    return JsonResponse(result)
+    if result.get("geojson", {}).get("features"):
+        landmark_store.add_book(title, result["geojson"])
+        result["prefetch"] = prefetch.prefetch_insights(
+            result["geojson"], prefetch.session_id_for(request)
+        )
+
+    return geojson_response(request, result)
@@ -9,6 +9,14 @@ from core.searcher import vibe_search
 from core.upload_views import upload_book
 from core.title_extractor import extract_from_title
 from core.chat_views import chat_about_place
+from core.clustering import clusters
+from core.vector_tiles import vector_tile
+from core.overlaps import overlaps
+from core.deferred import enrichment
+from core.prefetch import cancel_prefetch
+from core.llm_scheduler import scheduler_stats
+from core.metrics import metrics
+from core.profiling import list_profiles, profile_detail, profile_pstats
 
 urlpatterns = [
     path("", index, name="index"),
@@ -17,6 +25,16 @@ urlpatterns = [
     path("upload-book", upload_book, name="upload-book"),
     path("extract-from-title", extract_from_title, name="extract-from-title"),
     path("chat", chat_about_place, name="chat-about-place"),
+    path("clusters", clusters, name="clusters"),
+    path("tiles/<int:z>/<int:x>/<int:y>.mvt", vector_tile, name="vector-tile"),
+    path("overlaps", overlaps, name="overlaps"),
+    path("enrichment/<str:handle>", enrichment, name="deferred-enrichment"),
+    path("prefetch/<str:session_id>", cancel_prefetch, name="cancel-prefetch"),
+    path("llm/scheduler", scheduler_stats, name="llm-scheduler"),
+    path("metrics", metrics, name="metrics"),
+    path("profiles", list_profiles, name="profiles"),
+    path("profiles/<str:profile_id>", profile_detail, name="profile-detail"),
+    path("profiles/<str:profile_id>/pstats", profile_pstats, name="profile-pstats"),
     path("tools/archivist/", include("archivist.urls")),
     path("tools/librarian/", include("librarian.urls")),
     path("tools/linguist/", include("linguist.urls")),
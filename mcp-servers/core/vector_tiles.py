@@ -0,0 +1,216 @@
+"""
+Vector Tiles — serves the landmark catalog as Mapbox Vector Tiles.
+
+GET /tiles/{z}/{x}/{y}.mvt returns one protobuf-encoded tile with a
+single "landmarks" point layer.  Tiles are cut from the precomputed
+cluster pyramid, so low zooms carry clusters and a tile never grows
+with the size of the catalog.
+
+Encoding is done locally (no mapbox-vector-tile dependency) and every
+tile is cached on disk under TILE_CACHE_DIR/<store fingerprint>/z/x/y.mvt.
+Every upload changes the fingerprint, so when a new version directory is
+created all but the newest TILE_CACHE_VERSIONS are deleted.  Responses
+carry a strong ETag derived from the same key, so repeat loads are
+answered with 304s without reading or encoding the tile.
+
+On the map, add the tiles as a vector source and point a circle layer
+at `source-layer: "landmarks"` — the StylistAgent's paint_overrides are
+plain circle-* paint properties and apply to it unchanged.
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_GET
+
+from core.clustering import MAX_ZOOM, get_index
+from core.middleware import etag_matches
+
+
+LAYER_NAME = "landmarks"
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+# ── Minimal protobuf writer (just what the MVT spec needs) ──────────
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _len_delimited(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _uint(field: int, n: int) -> bytes:
+    return _key(field, 0) + _varint(n)
+
+
+def _packed(field: int, values: list[int]) -> bytes:
+    return _len_delimited(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    """Encode a tile Value message (string / double / sint / bool)."""
+    if isinstance(value, bool):
+        return _uint(7, int(value))
+    if isinstance(value, int):
+        return _uint(6, _zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _len_delimited(1, str(value).encode("utf-8"))
+
+
+def _flatten_properties(props: dict) -> dict:
+    """MVT values are scalars — flatten top_landmark and drop nested data."""
+    flat = {}
+    for k, v in props.items():
+        if isinstance(v, dict):
+            for sub_k, sub_v in v.items():
+                if sub_v is not None and not isinstance(sub_v, (dict, list)):
+                    flat[f"{k}_{sub_k}"] = sub_v
+        elif v is not None and not isinstance(v, list):
+            flat[k] = v
+    return flat
+
+
+def encode_tile(points: list[tuple[int, int, int, dict]], layer_name: str = LAYER_NAME,
+                extent: int = TILE_EXTENT) -> bytes:
+    """Encode (id, px, py, properties) points as a single-layer MVT."""
+    keys: dict[str, int] = {}
+    values: dict[tuple, int] = {}
+    features = []
+
+    for fid, px, py, props in points:
+        tags = []
+        for k, v in _flatten_properties(props).items():
+            ki = keys.setdefault(k, len(keys))
+            vi = values.setdefault((type(v).__name__, v), len(values))
+            tags += (ki, vi)
+        geometry = [(1 & 0x7) | (1 << 3), _zigzag(px), _zigzag(py)]  # MoveTo(1)
+        features.append(
+            _uint(1, fid)
+            + _packed(2, tags)
+            + _uint(3, 1)                                            # POINT
+            + _packed(4, geometry)
+        )
+
+    layer = (
+        _uint(15, 2)
+        + _len_delimited(1, layer_name.encode("utf-8"))
+        + b"".join(_len_delimited(2, f) for f in features)
+        + b"".join(_len_delimited(3, k.encode("utf-8")) for k in keys)
+        + b"".join(_len_delimited(4, _encode_value(v)) for (_t, v) in values)
+        + _uint(5, extent)
+    )
+    return _len_delimited(3, layer)
+
+
+# ── Disk cache ──────────────────────────────────────────────────────
+
+def _tile_path(version: str, z: int, x: int, y: int) -> Path:
+    return Path(settings.TILE_CACHE_DIR) / version[:16] / str(z) / str(x) / f"{y}.mvt"
+
+
+def _prune_versions(current: Path) -> None:
+    """Delete all but the newest TILE_CACHE_VERSIONS version directories."""
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    others = sorted(
+        (d for d in current.parent.iterdir() if d.is_dir() and d != current),
+        key=mtime, reverse=True,
+    )
+    for old in others[max(settings.TILE_CACHE_VERSIONS - 1, 0):]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _tile_etag(version: str, z: int, x: int, y: int) -> str:
+    return f'"{version[:16]}-{z}-{x}-{y}"'
+
+
+def get_tile_bytes(z: int, x: int, y: int) -> tuple[bytes, str]:
+    """
+    Return (tile_bytes, etag) for tile z/x/y, encoding and caching it on
+    disk on first request for the current landmark-store version.
+    """
+    index = get_index()
+    version = index.fingerprint
+    etag = _tile_etag(version, z, x, y)
+    path = _tile_path(version, z, x, y)
+
+    try:
+        return path.read_bytes(), etag
+    except FileNotFoundError:
+        pass
+
+    data = encode_tile(index.get_tile(z, x, y, TILE_EXTENT, TILE_BUFFER))
+
+    version_dir = path.parents[2]
+    try:
+        version_dir.mkdir(parents=True)
+    except FileExistsError:
+        pass
+    else:
+        _prune_versions(version_dir)
+
+    # Write atomically so concurrent workers never serve a half-written tile.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except FileNotFoundError:
+        # Another worker pruned this version meanwhile; serve it uncached.
+        pass
+    return data, etag
+
+
+@require_GET
+def vector_tile(request, z: int, x: int, y: int):
+    """
+    GET /tiles/{z}/{x}/{y}.mvt
+
+    Returns a Mapbox Vector Tile with one "landmarks" point layer.
+    Honours If-None-Match with a 304.
+    """
+    if z > MAX_ZOOM + 1 or x >= 2 ** z or y >= 2 ** z:
+        return HttpResponse(status=404)
+
+    # The ETag depends only on the store version and z/x/y, so a
+    # revalidation is answered before the tile is read or encoded.
+    etag = _tile_etag(get_index().fingerprint, z, x, y)
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        data, etag = get_tile_bytes(z, x, y)
+        response = HttpResponse(data, content_type=MVT_CONTENT_TYPE)
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={settings.TILE_CACHE_MAX_AGE}"
+    return response
@@ -39,5 +39,10 @@ def index(request):
                 "description": "Generates Mapbox Style overrides for visual era theming",
             },
         ],
+        "map_layers": {
+            "clusters": "/clusters?zoom={z}&bbox={west},{south},{east},{north}",
+            "vector_tiles": "/tiles/{z}/{x}/{y}.mvt",
+            "vector_source_layer": "landmarks",
+        },
         "powered_by": "Dedalus Labs (openai/gpt-4o)",
     })
@@ -0,0 +1,189 @@
+"""
+Cache warmer — precompute LLM enrichment for every curated click.
+
+Every curated combination is known up front: each KNOWLEDGE_BASE
+landmark with its era, plus every era in ERA_DIALECTS / STYLE_OVERRIDES.
+The warmer enumerates the exact completions /orchestrate would request
+for them —
+
+  * archivist insights      (one per landmark)
+  * dialect blurbs          (one per curated dialect era)
+  * style suggestions       (one per curated era)
+  * conductor syntheses     (landmark + era clicks, and era-only clicks)
+
+— and fills any that are missing from the LLM cache, with bounded
+concurrency so it never competes with users for Dedalus capacity.
+
+Run it with `python manage.py warm_cache`, or set CACHE_WARMER_ON_STARTUP
+to keep a daemon thread re-warming every CACHE_WARMER_INTERVAL seconds.
+With the default per-process LocMemCache each worker warms its own
+cache; a shared CACHE_BACKEND lets the management command warm them all.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+from archivist.knowledge_base import KNOWLEDGE_BASE
+from archivist.views import ARCHIVIST_SYSTEM_PROMPT, _archivist_curated, _insight_prompt
+from core import llm_scheduler
+from core.conductor import CONDUCTOR_SYSTEM_PROMPT, _synthesis_prompt
+from core.dedalus_client import cached_dedalus_chat, dedalus_chat, is_fallback, llm_cache_key
+from linguist.views import ERA_DIALECTS, LINGUIST_SYSTEM_PROMPT, _blurb_prompt, _linguist_curated
+from stylist.views import STYLE_OVERRIDES, STYLIST_SYSTEM_PROMPT, _stylist_curated, _suggestion_prompt
+
+
+logger = logging.getLogger(__name__)
+
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+
+
+def warm_targets() -> list[dict]:
+    """Every curated completion as {"kind", "key", "system", "user"}."""
+    targets = []
+
+    def add(kind: str, key: str, system_prompt: str, user_message: str):
+        targets.append({"kind": kind, "key": key, "system": system_prompt, "user": user_message})
+
+    eras = sorted(set(ERA_DIALECTS) | set(STYLE_OVERRIDES))
+    profiles = {era: _linguist_curated(era) for era in eras}
+    styles = {era: _stylist_curated(era) for era in eras}
+
+    for era in eras:
+        if profiles[era] is not None:
+            add("dialect_blurb", era, LINGUIST_SYSTEM_PROMPT, _blurb_prompt(profiles[era]))
+        add("style_suggestion", era, STYLIST_SYSTEM_PROMPT, _suggestion_prompt(styles[era]))
+
+    def synthesis_results(era: str) -> dict:
+        # Same shape the fan-out passes to _synthesis_prompt()
+        results = {"stylist": styles[era]}
+        if profiles[era] is not None:
+            results["linguist"] = profiles[era]
+        return results
+
+    for era in eras:
+        if profiles[era] is not None:
+            add("synthesis", era, CONDUCTOR_SYSTEM_PROMPT, _synthesis_prompt(synthesis_results(era)))
+
+    for landmark_id, entry in KNOWLEDGE_BASE.items():
+        curated = _archivist_curated(landmark_id)
+        add("archivist_insight", landmark_id, ARCHIVIST_SYSTEM_PROMPT, _insight_prompt(curated))
+
+        era = entry["era"]
+        if era in profiles and profiles[era] is not None:
+            results = synthesis_results(era)
+            results["archivist"] = {k: v for k, v in curated.items() if k != "era"}
+            add("synthesis", f"{landmark_id}@{era}", CONDUCTOR_SYSTEM_PROMPT, _synthesis_prompt(results))
+
+    return targets
+
+
+def _is_warm(target: dict) -> bool:
+    return cache.get(llm_cache_key(target["system"], target["user"])) is not None
+
+
+def coverage(targets: list[dict] | None = None) -> dict:
+    """How many curated completions are currently cached, overall and per kind."""
+    targets = warm_targets() if targets is None else targets
+    by_kind: dict[str, dict] = {}
+    warm = 0
+    for target in targets:
+        hit = _is_warm(target)
+        warm += hit
+        kind = by_kind.setdefault(target["kind"], {"total": 0, "warm": 0})
+        kind["total"] += 1
+        kind["warm"] += hit
+    total = len(targets)
+    return {
+        "total": total,
+        "warm": warm,
+        "ratio": round(warm / total, 3) if total else 1.0,
+        "by_kind": by_kind,
+    }
+
+
+def warm(concurrency: int | None = None, refresh: bool = False) -> dict:
+    """
+    Fill missing curated completions (all of them if refresh=True, which
+    also pushes back their expiry).  At most `concurrency` Dedalus calls
+    run at once.  Returns a report with coverage before and after.
+    """
+    t0 = time.perf_counter()
+    targets = warm_targets()
+    before = coverage(targets)
+    todo = targets if refresh else [t for t in targets if not _is_warm(t)]
+    if not settings.DEDALUS_API_KEY:
+        logger.warning("Cache warmer skipped: DEDALUS_API_KEY is not configured")
+        todo = []
+
+    def _fill(target: dict) -> bool:
+        with llm_scheduler.priority(llm_scheduler.BACKGROUND):
+            if refresh:
+                # Regenerate without dropping the current entry first: if
+                # Dedalus is unhealthy the old text keeps being served.
+                text = dedalus_chat(target["system"], target["user"], task=target["kind"])
+                if not is_fallback(text):
+                    cache.set(llm_cache_key(target["system"], target["user"]), text,
+                              settings.ENRICHMENT_CACHE_TTL)
+            else:
+                text = cached_dedalus_chat(target["system"], target["user"], task=target["kind"])
+        if is_fallback(text):
+            logger.warning("Warming %s %s failed: %s", target["kind"], target["key"], text)
+            return False
+        return True
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency or settings.CACHE_WARMER_CONCURRENCY,
+        thread_name_prefix="warm",
+    ) as pool:
+        outcomes = list(pool.map(_fill, todo))
+
+    return {
+        "attempted": len(todo),
+        "warmed": sum(outcomes),
+        "failed": len(outcomes) - sum(outcomes),
+        "before": before,
+        "after": coverage(targets),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000),
+    }
+
+
+def _run_forever(interval: int) -> None:
+    last_refresh = time.monotonic()
+    while True:
+        # Fill gaps every interval; re-generate everything once entries
+        # would otherwise expire before the next run.
+        refresh = time.monotonic() - last_refresh + interval >= settings.ENRICHMENT_CACHE_TTL
+        try:
+            report = warm(refresh=refresh)
+            if refresh:
+                last_refresh = time.monotonic()
+            logger.info(
+                "Cache warmer: %d/%d warm (%d warmed, %d failed)",
+                report["after"]["warm"], report["after"]["total"],
+                report["warmed"], report["failed"],
+            )
+        except Exception:
+            logger.exception("Cache warmer run failed")
+        time.sleep(interval)
+
+
+def start_background_warmer() -> bool:
+    """Start the periodic warmer thread once per process."""
+    global _thread
+    with _thread_lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(
+            target=_run_forever,
+            args=(settings.CACHE_WARMER_INTERVAL,),
+            name="cache-warmer",
+            daemon=True,
+        )
+        _thread.start()
+    return True
@@ -1,6 +1,9 @@
 """
 WSGI config for the Living Literary Map MCP servers.
 Used by Gunicorn on Render for production serving.
+
+Loading it also preloads the views and curated data (core/startup.py),
+so under `gunicorn --preload` the workers share them.
 """
 
 import os
@@ -9,3 +12,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
+
+from core.startup import preload  # noqa: E402
+
+preload()
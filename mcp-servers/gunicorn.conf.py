@@ -0,0 +1,22 @@
+"""
+Gunicorn hooks — read automatically from the working directory.
+
+render.yaml starts gunicorn with --preload: the app, with the views and
+curated data core/startup.py preloads, is loaded once in the master and
+shared copy-on-write with the workers.
+"""
+
+import gc
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the collector's permanent
+    # generation, so collections in the workers never touch (and copy)
+    # the shared pages.
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from core.startup import start_worker_services
+
+    start_worker_services()
@@ -7,17 +7,26 @@ and publication info.
 
 This is the "book discovery" agent — the first step before
 handing off to the Archivist for deep literary analysis.
+
+Open Library calls go through the "openlibrary" circuit breaker.
+Successful searches are kept in the cache, and served (flagged
+"degraded") when the upstream fails or its circuit is open.  httpx is
+imported on first use, keeping it out of worker start-up.
 """
 
+import hashlib
 import json
+import time
 
-import httpx
+from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from core import circuit, metrics, tracing
+
 
-OPEN_LIBRARY_SEARCH_URL = "https://openlibrary.org/search.json"
 OPEN_LIBRARY_COVER_URL = "https://covers.openlibrary.org/b/olid"
 
 
@@ -28,22 +37,45 @@ def _librarian_search(query: str, limit: int = 10) -> dict:
     """
     if not query or not query.strip():
         raise ValueError("Search query must not be empty")
-
-    resp = httpx.get(
-        OPEN_LIBRARY_SEARCH_URL,
-        params={
-            "title": query.strip(),
-            "limit": limit,
-            "fields": (
-                "key,title,author_name,first_publish_year,"
-                "cover_edition_key,edition_count,isbn,subject,"
-                "language,publisher"
-            ),
-        },
-        timeout=10.0,
-    )
-    resp.raise_for_status()
-    data = resp.json()
+    import httpx
+
+    cache_key = "librarian:" + hashlib.sha1(
+        f"{query.strip().lower()}\x1f{limit}".encode("utf-8")
+    ).hexdigest()
+
+    breaker = circuit.breaker("openlibrary")
+    permit = breaker.allow()
+    if permit is None:
+        return _cached_search(cache_key, "Open Library circuit open")
+
+    t0 = time.perf_counter()
+    healthy = False
+    with tracing.span("openlibrary.search", "CLIENT", **{"server.address": settings.OPEN_LIBRARY_BASE_URL}) as span:
+        try:
+            resp = httpx.get(
+                f"{settings.OPEN_LIBRARY_BASE_URL}/search.json",
+                params={
+                    "title": query.strip(),
+                    "limit": limit,
+                    "fields": (
+                        "key,title,author_name,first_publish_year,"
+                        "cover_edition_key,edition_count,isbn,subject,"
+                        "language,publisher"
+                    ),
+                },
+                timeout=10.0,
+            )
+            span.set("http.response.status_code", resp.status_code)
+            healthy = resp.status_code < 500 and resp.status_code != 429
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPStatusError, httpx.RequestError) as exc:
+            if healthy or cache.get(cache_key) is None:
+                raise
+            span.fail(exc)
+            return _cached_search(cache_key, f"Open Library request failed: {exc}")
+        finally:
+            breaker.record(healthy, (time.perf_counter() - t0) * 1000, permit)
 
     books = []
     for doc in data.get("docs", []):
@@ -64,11 +96,24 @@ def _librarian_search(query: str, limit: int = 10) -> dict:
             "publishers": (doc.get("publisher") or [])[:3],
         })
 
-    return {
+    result = {
         "query": query.strip(),
         "num_found": data.get("numFound", 0),
         "books": books,
     }
+    cache.set(cache_key, result, settings.LIBRARIAN_CACHE_TTL)
+    return result
+
+
+def _cached_search(cache_key: str, reason: str) -> dict:
+    """A previously cached search, flagged as degraded — or CircuitOpen."""
+    with tracing.span("cache.get", cache="librarian") as span:
+        result = cache.get(cache_key)
+        span.set("hit", result is not None)
+    metrics.cache_lookup("librarian", result is not None)
+    if result is None:
+        raise circuit.CircuitOpen(reason)
+    return {**result, "degraded": True, "degraded_reason": reason}
 
 
 @csrf_exempt
@@ -89,10 +134,14 @@ def search(request):
 
     limit = body.get("limit", 10)
 
+    import httpx
+
     try:
         result = _librarian_search(query, limit=limit)
     except ValueError as e:
         return JsonResponse({"error": str(e)}, status=400)
+    except circuit.CircuitOpen as e:
+        return JsonResponse({"error": str(e)}, status=503)
     except httpx.HTTPStatusError as e:
         return JsonResponse(
             {"error": f"Open Library API error: {e.response.status_code}"},
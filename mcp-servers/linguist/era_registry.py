@@ -0,0 +1,99 @@
+"""
+LinguistAgent — persistent registry of LLM-generated era profiles.
+
+Eras outside ERA_DIALECTS are generated by Dedalus once, then saved
+here under their normalised key ("1880s") together with their "Did You
+Know?" blurb.  Later requests for that era are served from the registry
+with the same latency as the curated path.
+
+Only canonical decade keys (core.eras.is_canonical_era) are persisted,
+which bounds the file.  Free-text eras ("the gilded age", or anything
+else a client posts) are kept in Django's cache for
+ENRICHMENT_CACHE_TTL instead, so they are not regenerated on every
+request but cannot grow the registry.
+
+The registry is a single JSON file (ERA_REGISTRY_PATH).  Writes are
+atomic and serialised across gunicorn workers with a lock file, and
+readers pick up entries saved by other workers by re-loading the file
+when its mtime changes.
+"""
+
+import copy
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.eras import is_canonical_era
+
+
+_lock = threading.Lock()
+_entries: dict[str, dict] = {}
+_loaded_mtime: float | None = None
+
+
+def _path() -> Path:
+    return Path(settings.ERA_REGISTRY_PATH)
+
+
+def _reload_if_changed() -> None:
+    global _entries, _loaded_mtime
+    try:
+        mtime = _path().stat().st_mtime
+    except FileNotFoundError:
+        return
+    if mtime == _loaded_mtime:
+        return
+    try:
+        with open(_path(), encoding="utf-8") as fh:
+            _entries = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return
+    _loaded_mtime = mtime
+
+
+def _cache_key(era_key: str) -> str:
+    return "era_profile:" + hashlib.sha1(era_key.encode("utf-8")).hexdigest()
+
+
+def get(era_key: str) -> dict | None:
+    """Return a copy of the saved profile for a normalised era key, or None."""
+    if not is_canonical_era(era_key):
+        return cache.get(_cache_key(era_key))
+    with _lock:
+        _reload_if_changed()
+        profile = _entries.get(era_key)
+        return copy.deepcopy(profile) if profile is not None else None
+
+
+def put(era_key: str, profile: dict) -> None:
+    """Save a generated profile under a normalised era key (in the cache,
+    with a TTL, if the key is not a canonical decade)."""
+    global _loaded_mtime
+    if not is_canonical_era(era_key):
+        cache.set(_cache_key(era_key), profile, settings.ENRICHMENT_CACHE_TTL)
+        return
+    path = _path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock, open(path.with_suffix(".lock"), "w") as lock_fh:
+        fcntl.flock(lock_fh, fcntl.LOCK_EX)
+        _reload_if_changed()
+        _entries[era_key] = copy.deepcopy(profile)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(_entries, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+        _loaded_mtime = path.stat().st_mtime
+
+
+def all_entries() -> dict[str, dict]:
+    """Snapshot of every saved profile."""
+    with _lock:
+        _reload_if_changed()
+        return dict(_entries)
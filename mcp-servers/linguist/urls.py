@@ -1,6 +1,7 @@
 from django.urls import path
-from linguist.views import dialect
+from linguist.views import dialect, dialect_enrichment
 
 urlpatterns = [
     path("dialect", dialect, name="linguist-dialect"),
+    path("dialect/enrichment", dialect_enrichment, name="linguist-dialect-enrichment"),
 ]
@@ -9,9 +9,13 @@ import json
 
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_http_methods
 
-from core.dedalus_client import dedalus_chat
+from core.dedalus_client import cached_dedalus_chat, dedalus_chat, is_fallback
+from core.deferred import defer_field, parse_defer
+from core.eras import normalize_era
+from core.http_cache import curated_response, data_version, enrichment_response
+from linguist import era_registry
 
 
 ERA_DIALECTS: dict[str, dict] = {
@@ -71,44 +75,57 @@ LINGUIST_SYSTEM_PROMPT = (
 LINGUIST_DYNAMIC_PROMPT = (
     "You are the LinguistAgent, an expert in American English dialects. "
     "Given a decade/era, identify 3-5 notable slang terms or linguistic "
-    "features from that period.  Return a JSON object with this structure:\n"
+    "features from that period, and write a fun 2-sentence 'Did You Know?' "
+    "blurb about how one of these terms entered mainstream English.  "
+    "Return a JSON object with this structure:\n"
     '{"era_label": "Label for the era", "slang": [{"term": "word", "meaning": "definition"}], '
-    '"dialect_notes": "Brief notes on the dialect"}\n'
+    '"dialect_notes": "Brief notes on the dialect", "ai_blurb": "Did you know..."}\n'
     "Return ONLY valid JSON, no other text."
 )
 
+ERA_DIALECTS_VERSION = data_version(ERA_DIALECTS)
 
-def _linguist_dialect(era: str) -> dict:
-    """
-    Internal function — callable by the Conductor for parallel orchestration.
-    Returns a plain dict. For unknown eras, uses Dedalus to generate dialect info.
-    """
+
+def _linguist_curated(era: str) -> dict | None:
+    """Curated dialect profile for era, or None if the era isn't curated."""
+    era = normalize_era(era)
     entry = ERA_DIALECTS.get(era)
+    if entry is None:
+        return None
+    return {
+        "era": era,
+        "era_label": entry["era_label"],
+        "slang": entry["slang"],
+        "dialect_notes": entry["dialect_notes"],
+    }
 
-    if entry is not None:
-        # Known era — use curated data
-        slang_list = ", ".join(f"'{s['term']}'" for s in entry["slang"])
-        user_msg = (
-            f"Era: {era} — {entry['era_label']}\n"
-            f"Slang terms: {slang_list}\n"
-            f"Notes: {entry['dialect_notes']}\n\n"
-            "Write a 'Did You Know?' blurb."
-        )
-        ai_blurb = dedalus_chat(LINGUIST_SYSTEM_PROMPT, user_msg)
 
-        return {
-            "era": era,
-            "era_label": entry["era_label"],
-            "slang": entry["slang"],
-            "dialect_notes": entry["dialect_notes"],
-            "ai_blurb": ai_blurb,
-        }
+def _blurb_prompt(profile: dict) -> str:
+    slang = profile["slang"]
+    slang_list = ", ".join(f"'{s['term']}'" for s in slang[:5]) if slang else profile["era"]
+    return (
+        f"Era: {profile['era']} — {profile['era_label']}\n"
+        f"Slang terms: {slang_list}\n"
+        f"Notes: {profile['dialect_notes']}\n\n"
+        "Write a 'Did You Know?' blurb."
+    )
 
-    # Unknown era — generate dynamically via Dedalus
+
+def _linguist_blurb(profile: dict) -> str:
+    """'Did You Know?' blurb for a dialect profile, served from cache when possible."""
+    return cached_dedalus_chat(LINGUIST_SYSTEM_PROMPT, _blurb_prompt(profile), task="dialect_blurb")
+
+
+def _linguist_generate(era: str) -> dict:
+    """
+    Generate profile + blurb for an uncurated era in ONE Dedalus call and
+    save it to the era registry.  Failed or unparseable responses fall
+    back to a placeholder profile and are not saved.
+    """
     import json as _json
     import re as _re
 
-    raw = dedalus_chat(LINGUIST_DYNAMIC_PROMPT, f"Era: {era}")
+    raw = dedalus_chat(LINGUIST_DYNAMIC_PROMPT, f"Era: {era}", max_tokens=700, task="dialect_profile")
     try:
         json_match = _re.search(r'\{.*\}', raw, _re.DOTALL)
         if json_match:
@@ -117,36 +134,82 @@ def _linguist_dialect(era: str) -> dict:
             data = _json.loads(raw)
     except _json.JSONDecodeError:
         data = {}
+    if not isinstance(data, dict):
+        data = {}
 
-    era_label = data.get("era_label", f"{era} Era")
-    slang = data.get("slang", [])
-    dialect_notes = data.get("dialect_notes", f"Linguistic features of the {era}.")
-
-    slang_list = ", ".join(f"'{s['term']}'" for s in slang[:5]) if slang else era
-    blurb_msg = (
-        f"Era: {era} — {era_label}\n"
-        f"Slang terms: {slang_list}\n"
-        f"Notes: {dialect_notes}\n\n"
-        "Write a 'Did You Know?' blurb."
-    )
-    ai_blurb = dedalus_chat(LINGUIST_SYSTEM_PROMPT, blurb_msg)
-
-    return {
+    profile = {
         "era": era,
-        "era_label": era_label,
-        "slang": slang[:5],
-        "dialect_notes": dialect_notes,
-        "ai_blurb": ai_blurb,
+        "era_label": data.get("era_label", f"{era} Era"),
+        "slang": data.get("slang", [])[:5],
+        "dialect_notes": data.get("dialect_notes", f"Linguistic features of the {era}."),
+        "ai_blurb": data.get("ai_blurb"),
     }
+    if not data.get("slang"):
+        # Nothing worth saving, but still answer with a blurb as before.
+        if is_fallback(raw):
+            profile["ai_blurb"] = raw
+        elif not profile["ai_blurb"]:
+            profile["ai_blurb"] = _linguist_blurb(profile)
+        return profile
+
+    if not profile["ai_blurb"]:
+        # Model skipped the blurb — fill it in rather than save a gap.
+        profile["ai_blurb"] = _linguist_blurb(profile)
+    if not is_fallback(profile["ai_blurb"]):
+        era_registry.put(era, profile)
+    return profile
+
+
+def _linguist_dialect(era: str, defer: frozenset[str] | None = None,
+                      generate: bool = True) -> dict | None:
+    """
+    Internal function — callable by the Conductor for parallel orchestration.
+    Returns a plain dict.
+
+    Eras are normalised first ("1925", "1920's" -> "1920s").  Uncurated
+    eras are served from the generated-era registry, and only generated
+    via Dedalus the first time they are seen.  A deferred ai_blurb only
+    applies to curated eras — a first-seen era still waits for its
+    profile, which is generated together with the blurb.  With
+    generate=False such an era returns None instead of calling Dedalus.
+    """
+    era = normalize_era(era)
+    profile = _linguist_curated(era)
+    if profile is not None:
+        if defer and "ai_blurb" in defer:
+            return defer_field(profile, "ai_blurb", LINGUIST_SYSTEM_PROMPT, _blurb_prompt(profile),
+                               task="dialect_blurb")
+        return {**profile, "ai_blurb": _linguist_blurb(profile)}
+
+    saved = era_registry.get(era)
+    if saved is not None:
+        return saved
+
+    if not generate:
+        return None
+    return _linguist_generate(era)
 
 
 @csrf_exempt
-@require_POST
+@require_http_methods(["GET", "POST"])
 def dialect(request):
     """
+    GET  /tools/linguist/dialect?era=1920s
+         Curated eras only — cacheable (ETag + Cache-Control).
     POST /tools/linguist/dialect
-    Body: { "era": "1920s" }
+    Body: { "era": "1920s", "defer": ["ai_blurb"] }
+         Any era, plus ai_blurb (or its handle if deferred).
     """
+    if request.method == "GET":
+        era = normalize_era(request.GET.get("era", ""))
+        if not era:
+            return JsonResponse({"error": "era is required"}, status=400)
+        if era not in ERA_DIALECTS:
+            return JsonResponse({"error": f"No curated dialect for era: {era}"}, status=404)
+        return curated_response(
+            request, ERA_DIALECTS_VERSION, era, lambda: _linguist_curated(era),
+        )
+
     try:
         body = json.loads(request.body)
     except json.JSONDecodeError:
@@ -157,8 +220,32 @@ def dialect(request):
         return JsonResponse({"error": "era is required"}, status=400)
 
     try:
-        result = _linguist_dialect(era)
+        defer = parse_defer(body)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    try:
+        result = _linguist_dialect(era, defer=defer)
     except ValueError as e:
         return JsonResponse({"error": str(e)}, status=404)
 
     return JsonResponse(result)
+
+
+@require_GET
+def dialect_enrichment(request):
+    """
+    GET /tools/linguist/dialect/enrichment?era=1920s
+
+    Returns just the LLM field for a curated era: { "era": "...", "ai_blurb": "..." }
+    """
+    era = request.GET.get("era")
+    if not era:
+        return JsonResponse({"error": "era is required"}, status=400)
+
+    profile = _linguist_curated(era)
+    if profile is None:
+        return JsonResponse({"error": f"No curated dialect for era: {era}"}, status=404)
+
+    blurb = _linguist_blurb(profile)
+    return enrichment_response(request, {"era": era, "ai_blurb": blurb}, fallback=is_fallback(blurb))
@@ -0,0 +1,168 @@
+"""
+StylistAgent — local palette engine for eras without a curated style.
+
+Derives accent colour, background, font, label and paint_overrides for
+any decade or century without an LLM call:
+
+  * Accent colours are interpolated by year between anchor eras (the
+    curated STYLE_OVERRIDES plus a few hand-picked ones) in OKLab, so the
+    blend between e.g. 1940s gold and 1960s teal stays perceptually even.
+  * Fonts and vibe labels come from period tables keyed on start year.
+
+Results are memoised per normalised era, so repeat lookups are a dict hit.
+"""
+
+import copy
+from functools import lru_cache
+
+from core.eras import era_start_year, normalize_era
+
+
+# (start year, accent hex).  Curated eras are merged in by build_anchors().
+EXTRA_ANCHORS: list[tuple[int, str]] = [
+    (1100, "#6a4c93"),   # illuminated-manuscript violet
+    (1500, "#b5651d"),   # Renaissance umber
+    (1700, "#c9a227"),   # gilt
+    (1800, "#3f51b5"),   # deep Romantic blue
+    (1890, "#8d6e63"),   # sepia
+    (1970, "#ffb300"),   # amber
+    (1980, "#ff2ec4"),   # neon magenta
+    (1990, "#39ff14"),   # neon green
+    (2010, "#00b8d4"),   # screen cyan
+    (2020, "#7c4dff"),   # ultraviolet
+]
+
+# (first year, font, vibe) — the last row whose year <= era start wins.
+PERIODS: list[tuple[int, str, str]] = [
+    (0, "Cinzel", "Antiquity"),
+    (1000, "UnifrakturMaguntia", "Medieval"),
+    (1450, "EB Garamond", "Renaissance"),
+    (1650, "Libre Baskerville", "Enlightenment"),
+    (1790, "Bodoni Moda", "Romantic"),
+    (1840, "Libre Caslon Text", "Victorian"),
+    (1900, "Cormorant Garamond", "Edwardian"),
+    (1920, "Playfair Display", "Jazz Age"),
+    (1930, "Poiret One", "Art Deco"),
+    (1940, "Courier Prime", "Wartime Noir"),
+    (1950, "Josefin Sans", "Mid-Century"),
+    (1960, "Oswald", "Counterculture"),
+    (1970, "Righteous", "Disco"),
+    (1980, "Orbitron", "Neon"),
+    (1990, "VT323", "Grunge & Dial-Up"),
+    (2000, "Montserrat", "Millennium"),
+    (2010, "Inter", "Digital"),
+]
+
+DEFAULT_ACCENT = "#b388ff"
+DEFAULT_FONT = "Inter"
+
+
+# ── Colour space helpers (sRGB <-> OKLab) ───────────────────────────
+
+def _srgb_to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(c: float) -> float:
+    c = min(max(c, 0.0), 1.0)
+    return 12.92 * c if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+
+
+def hex_to_oklab(hex_color: str) -> tuple[float, float, float]:
+    h = hex_color.lstrip("#")
+    r, g, b = (_srgb_to_linear(int(h[i:i + 2], 16) / 255) for i in (0, 2, 4))
+    l_ = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m_ = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s_ = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * l_ + 0.7936177850 * m_ - 0.0040720468 * s_,
+        1.9779984951 * l_ - 2.4285922050 * m_ + 0.4505937099 * s_,
+        0.0259040371 * l_ + 0.7827717662 * m_ - 0.8086757660 * s_,
+    )
+
+
+def oklab_to_hex(lab: tuple[float, float, float]) -> str:
+    L, a, b = lab
+    l_ = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m_ = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s_ = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    rgb = (
+        4.0767416621 * l_ - 3.3077115913 * m_ + 0.2309699292 * s_,
+        -1.2684380046 * l_ + 2.6097574011 * m_ - 0.3413193965 * s_,
+        -0.0041960863 * l_ - 0.7034186147 * m_ + 1.7076147010 * s_,
+    )
+    return "#" + "".join(f"{round(_linear_to_srgb(c) * 255):02x}" for c in rgb)
+
+
+# ── Engine ──────────────────────────────────────────────────────────
+
+def build_anchors(curated: dict[str, dict]) -> list[tuple[int, tuple[float, float, float]]]:
+    """Merge curated accents with EXTRA_ANCHORS, sorted by year, in OKLab."""
+    by_year = dict(EXTRA_ANCHORS)
+    for era, style in curated.items():
+        year = era_start_year(era)
+        if year is not None:
+            by_year[year] = style["accent_color"]
+    return [(y, hex_to_oklab(c)) for y, c in sorted(by_year.items())]
+
+
+def _interpolate(anchors, year: int) -> str:
+    if year <= anchors[0][0]:
+        return oklab_to_hex(anchors[0][1])
+    for (y0, c0), (y1, c1) in zip(anchors, anchors[1:]):
+        if y0 <= year <= y1:
+            t = (year - y0) / (y1 - y0)
+            return oklab_to_hex(tuple(a + (b - a) * t for a, b in zip(c0, c1)))
+    return oklab_to_hex(anchors[-1][1])
+
+
+def _period(year: int) -> tuple[str, str]:
+    font, vibe = PERIODS[0][1], PERIODS[0][2]
+    for start, f, v in PERIODS:
+        if year >= start:
+            font, vibe = f, v
+    return font, vibe
+
+
+def _background_for(accent: str) -> str:
+    """A very dark, slightly tinted background that keeps the accent readable."""
+    _L, a, b = hex_to_oklab(accent)
+    return oklab_to_hex((0.16, a * 0.25, b * 0.25))
+
+
+class PaletteEngine:
+    def __init__(self, curated: dict[str, dict]):
+        self.anchors = build_anchors(curated)
+        self._cached_style = lru_cache(maxsize=1024)(self._style_for)
+
+    def style_for(self, era: str) -> dict:
+        """The derived style for an era — a copy, so callers may modify it."""
+        return copy.deepcopy(self._cached_style(era))
+
+    def _style_for(self, era: str) -> dict:
+        key = normalize_era(era)
+        year = era_start_year(key)
+
+        if year is None:
+            accent, font, label = DEFAULT_ACCENT, DEFAULT_FONT, f"{era} — Dynamic"
+            background = "#0d0f1a"
+        else:
+            accent = _interpolate(self.anchors, year)
+            font, vibe = _period(year)
+            label = f"{key} — {vibe}"
+            background = _background_for(accent)
+
+        return {
+            "era": key or era,
+            "label": label,
+            "mapbox_style": "mapbox://styles/mapbox/dark-v11",
+            "paint_overrides": {
+                "circle-color": accent,
+                "circle-radius": 11,
+                "circle-stroke-color": "#ffffff",
+                "circle-stroke-width": 2,
+            },
+            "background_color": background,
+            "accent_color": accent,
+            "font_suggestion": font,
+        }
@@ -1,6 +1,7 @@
 from django.urls import path
-from stylist.views import style
+from stylist.views import style, style_enrichment
 
 urlpatterns = [
     path("style", style, name="stylist-style"),
+    path("style/enrichment", style_enrichment, name="stylist-style-enrichment"),
 ]
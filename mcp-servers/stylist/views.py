@@ -2,16 +2,23 @@
 StylistAgent — MCP Tool (Django view)
 
 Generates Mapbox Style JSON overrides to change the map's visual "vibe"
-based on the literary era selected.
+based on the literary era selected.  Eras without a curated style are
+handled by the local palette engine (stylist/palette.py), so styling
+never waits on an LLM.
 """
 
+import copy
 import json
 
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_http_methods
 
-from core.dedalus_client import dedalus_chat
+from core.dedalus_client import cached_dedalus_chat, is_fallback
+from core.deferred import defer_field, parse_defer
+from core.eras import normalize_era
+from core.http_cache import curated_response, data_version, enrichment_response
+from stylist.palette import EXTRA_ANCHORS, PERIODS, PaletteEngine
 
 
 STYLE_OVERRIDES: dict[str, dict] = {
@@ -64,102 +71,81 @@ STYLIST_SYSTEM_PROMPT = (
     "would make the map feel more immersive for that period."
 )
 
+PALETTE = PaletteEngine(STYLE_OVERRIDES)
+STYLE_VERSION = data_version({
+    "curated": STYLE_OVERRIDES,
+    "anchors": EXTRA_ANCHORS,
+    "periods": PERIODS,
+})
 
-def _stylist_style(era: str) -> dict:
+
+def _stylist_curated(era: str) -> dict:
     """
-    Internal function — callable by the Conductor for parallel orchestration.
-    Returns a plain dict. For unknown eras, returns a sensible default style
-    with an AI suggestion.
+    The deterministic style for any era — curated if we have one,
+    otherwise derived locally by the palette engine.  No LLM involved.
     """
-    entry = STYLE_OVERRIDES.get(era)
-
+    key = normalize_era(era)
+    entry = STYLE_OVERRIDES.get(key)
     if entry is not None:
-        # Known era — use curated style
-        user_msg = (
-            f"Era: {era} — {entry['label']}\n"
-            f"Palette: background {entry['background_color']}, accent {entry['accent_color']}\n"
-            f"Font: {entry['font_suggestion']}\n\n"
-            "Suggest one immersive visual tweak."
-        )
-        ai_suggestion = dedalus_chat(STYLIST_SYSTEM_PROMPT, user_msg)
-
-        return {
-            "era": era,
-            **entry,
-            "ai_suggestion": ai_suggestion,
-        }
-
-    # Unknown era — ask Dedalus to generate an era-appropriate palette
-    import re as _re
-
-    palette_prompt = (
-        "You are a visual design expert. For the literary era/decade "
-        f"'{era}', pick a single hex accent color that evokes that time "
-        "period (e.g. amber for the 1970s, neon green for the 1990s, "
-        "deep blue for the 1800s). Also pick a Google Font that feels "
-        "right.\n\n"
-        "Return ONLY a JSON object like:\n"
-        '{"accent_color": "#hex", "font": "Font Name", "label": "Era — Vibe"}\n'
-        "No other text."
-    )
-    raw_palette = dedalus_chat(
-        "You are a concise JSON-only design assistant.", palette_prompt
-    )
+        return {"era": key, **copy.deepcopy(entry)}
+    return PALETTE.style_for(key)
 
-    # Parse the AI response
-    accent = "#b388ff"
-    font = "Inter"
-    label = f"{era} — Dynamic"
-    try:
-        import json as _json
-        match = _re.search(r'\{.*\}', raw_palette, _re.DOTALL)
-        if match:
-            pd = _json.loads(match.group())
-            if pd.get("accent_color", "").startswith("#"):
-                accent = pd["accent_color"]
-            if pd.get("font"):
-                font = pd["font"]
-            if pd.get("label"):
-                label = pd["label"]
-    except Exception:
-        pass  # fall back to defaults
-
-    default_entry = {
-        "label": label,
-        "mapbox_style": "mapbox://styles/mapbox/dark-v11",
-        "paint_overrides": {
-            "circle-color": accent,
-            "circle-radius": 11,
-            "circle-stroke-color": "#ffffff",
-            "circle-stroke-width": 2,
-        },
-        "background_color": "#0d0f1a",
-        "accent_color": accent,
-        "font_suggestion": font,
-    }
-
-    user_msg = (
-        f"Era: {era} — {label}\n"
-        f"Palette: background {default_entry['background_color']}, accent {accent}\n"
-        f"Font: {font}\n\n"
-        "Suggest one immersive visual tweak for this time period."
+
+def _suggestion_prompt(style: dict) -> str:
+    return (
+        f"Era: {style['era']} — {style['label']}\n"
+        f"Palette: background {style['background_color']}, accent {style['accent_color']}\n"
+        f"Font: {style['font_suggestion']}\n\n"
+        "Suggest one immersive visual tweak."
     )
-    ai_suggestion = dedalus_chat(STYLIST_SYSTEM_PROMPT, user_msg)
 
-    return {
-        "era": era,
-        **default_entry,
-        "ai_suggestion": ai_suggestion,
-    }
+
+def _stylist_suggestion(style: dict) -> str:
+    """LLM visual tweak for a style payload, served from cache when possible."""
+    return cached_dedalus_chat(STYLIST_SYSTEM_PROMPT, _suggestion_prompt(style), task="style_suggestion")
+
+
+DEFAULT_DEFER = frozenset({"ai_suggestion"})
+
+
+def _stylist_style(era: str, defer: frozenset[str] | None = None) -> dict:
+    """
+    Internal function — callable by the Conductor for parallel orchestration.
+    Returns a plain dict.
+
+    The style itself is CPU-only.  Unless the caller asks for it (defer
+    without "ai_suggestion"), ai_suggestion is taken from the cache; on a
+    miss it is null with a handle and generated in the background.
+    """
+    style = _stylist_curated(era)
+    if defer is None:
+        defer = DEFAULT_DEFER
+
+    if "ai_suggestion" in defer:
+        return defer_field({**style}, "ai_suggestion", STYLIST_SYSTEM_PROMPT, _suggestion_prompt(style),
+                           task="style_suggestion")
+    return {**style, "ai_suggestion": _stylist_suggestion(style)}
 
 
 @csrf_exempt
-@require_POST
+@require_http_methods(["GET", "POST"])
 def style(request):
     """
+    GET  /tools/stylist/style?era=1940s
+         Style only — cacheable (ETag + Cache-Control).
     POST /tools/stylist/style
-    Body: { "era": "1940s" }
+    Body: { "era": "1940s", "enrich": false }
+         Style plus any cached ai_suggestion (else a handle); "enrich":
+         true, or "fields": ["ai_suggestion"], waits for it.
     """
+    if request.method == "GET":
+        era = normalize_era(request.GET.get("era", ""))
+        if not era:
+            return JsonResponse({"error": "era is required"}, status=400)
+        return curated_response(
+            request, STYLE_VERSION, era, lambda: _stylist_curated(era),
+        )
+
     try:
         body = json.loads(request.body)
     except json.JSONDecodeError:
@@ -170,8 +156,31 @@ def style(request):
         return JsonResponse({"error": "era is required"}, status=400)
 
     try:
-        result = _stylist_style(era)
+        defer = parse_defer(body)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if body.get("enrich"):
+        defer = frozenset()
+
+    try:
+        result = _stylist_style(era, defer=defer)
     except ValueError as e:
         return JsonResponse({"error": str(e)}, status=404)
 
     return JsonResponse(result)
+
+
+@require_GET
+def style_enrichment(request):
+    """
+    GET /tools/stylist/style/enrichment?era=1940s
+
+    Returns just the LLM field: { "era": "...", "ai_suggestion": "..." }
+    """
+    era = normalize_era(request.GET.get("era", ""))
+    if not era:
+        return JsonResponse({"error": "era is required"}, status=400)
+
+    suggestion = _stylist_suggestion(_stylist_curated(era))
+    return enrichment_response(request, {"era": era, "ai_suggestion": suggestion},
+                               fallback=is_fallback(suggestion))